@@ -1,5 +1,7 @@
 from .animal import Animal
 from .animals import Animals
 from .food_handler import AnimalFoodHandler
+from .water_handler import AnimalWaterHandler
 from .direction import Direction
-from .vision import Vision
\ No newline at end of file
+from .vision import Vision
+from .population import Population
\ No newline at end of file
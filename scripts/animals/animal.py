@@ -1,11 +1,17 @@
-import pygame as py
-import random, math
+import math
 
 from .food_handler import AnimalFoodHandler
+from .water_handler import AnimalWaterHandler
 from foods import Foods, Food
+from entity_pool import Handle
 from water import Water
 from .direction import Direction
 from .vision import Vision
+from .population import Population, DIRECTIONS, DIRECTION_INDEXES
+from random_streams import RandomStream, UNSEEDED
+from geometry import Rect
+from world_stats import WorldStats
+from event_log import EventLog, NULL_EVENT_LOG
 
 class Animal:
     def __init__(self, 
@@ -14,7 +20,8 @@ class Animal:
                  x : int,
                  y : int,
                  speed : int = 1,
-                 life : int = 100) -> None:
+                 life : int = 100,
+                 rng : RandomStream = UNSEEDED.stream("animals")) -> None:
         """Class used to create animals
 
         Args:
@@ -24,101 +31,179 @@ class Animal:
             y (int): The y position of the animal
             speed (int, optional): The speed of the animal. Defaults to 1.
             life (int, optional): The life of the animal. Defaults to 100.
+            rng (RandomStream, optional): The stream the direction is drawn from. Defaults to an unseeded stream.
         """
-        self.size = size
         self.color = color
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.life = life
         
-        self.rect = py.Rect(self.x, self.y, self.size, self.size)
+        self.population = Population(1)
+        self.index = self.population.add(x, y, size, speed, life)
         
-        self.direction = self.choose_direction()
-        self.direction_count = 0
+        self.direction = self.choose_direction(rng)
         
         self.food_handler = AnimalFoodHandler()
+        self.water_handler = AnimalWaterHandler()
         self.vision_scale = 6
         self.vision = Vision(self.rect.centerx, self.rect.centery, self.size * self.vision_scale, self.size * self.vision_scale)
         
-        self.targeted_food = None
+        self.handle = None
+        self.direction_timer = None
+        self.hunger_timer = None
+        self.thirst_timer = None
+        self.targeted_food : Handle | None = None
         self.stop_moving = False
         
-        self.age = 0
-        self.death_age = random.randint(50, 100)
-        
     def __str__(self) -> str:
         return f"Animal: x={self.x}, y={self.y}, size={self.size}, color={self.color}, speed={self.speed}, life={self.life}"
-        
-    def update(self, screen : py.surface.Surface, foods : Foods) -> None:
-        """Method used to update the animal
+    
+    @classmethod
+    def view(cls, population : Population, index : int, color : tuple[int, int, int]) -> "Animal":
+        """Create an animal that is only a view on an existing row, without food handler nor vision (e.g. to draw a recorded tick)
 
         Args:
-            screen (py.surface.Surface): The game screen
-            foods (list[Food]): All the foods in the game
+            population (Population): The population holding the row
+            index (int): The index of the row
+            color (tuple[int, int, int]): The RGB color of the animal
+
+        Returns:
+            Animal: The animal
         """
+        animal = cls.__new__(cls)
+        animal.color = color
+        animal.population = population
+        animal.index = index
+        return animal
+    
+    def bind(self, population : Population) -> None:
+        """Move the animal state into another population, the animal then becomes a view on its row
+
+        Args:
+            population (Population): The population to move into
+        """
+        self.index = population.add_from(self.population, self.index)
+        self.population = population
         
-        self.create(screen)
-        self.vision.update(screen)
-        self.check_screen_collision(screen)
+    @property
+    def x(self) -> int:
+        return int(self.population.x[self.index])
+    
+    @x.setter
+    def x(self, value : int) -> None:
+        self.population.x[self.index] = value
         
-        self.vision.update_rect(self.rect)
-        self.food_in_vision = self.vision.check_visible_foods(foods.foods)
+    @property
+    def y(self) -> int:
+        return int(self.population.y[self.index])
+    
+    @y.setter
+    def y(self, value : int) -> None:
+        self.population.y[self.index] = value
         
-        print(self.food_handler.food_storage)
-        if self.targeted_food is not None and self.targeted_food.is_completely_eaten():
+    @property
+    def size(self) -> int:
+        return int(self.population.size[self.index])
+    
+    @property
+    def speed(self) -> int:
+        return int(self.population.speed[self.index])
+    
+    @speed.setter
+    def speed(self, value : int) -> None:
+        self.population.speed[self.index] = value
+        
+    @property
+    def life(self) -> int:
+        return int(self.population.life[self.index])
+    
+    @life.setter
+    def life(self, value : int) -> None:
+        self.population.life[self.index] = value
+        
+    @property
+    def direction(self) -> tuple[int, int]:
+        return DIRECTIONS[self.population.direction[self.index]].value
+    
+    @direction.setter
+    def direction(self, value : tuple[int, int]) -> None:
+        self.population.direction[self.index] = DIRECTION_INDEXES[value]
+        
+    @property
+    def direction_count(self) -> int:
+        return int(self.population.direction_count[self.index])
+    
+    @direction_count.setter
+    def direction_count(self, value : int) -> None:
+        self.population.direction_count[self.index] = value
+        
+    @property
+    def rect(self) -> Rect:
+        """A copy of the animal rect, assign it back to move the animal
+
+        Returns:
+            Rect: The animal rect
+        """
+        return Rect(self.x, self.y, self.size, self.size)
+    
+    @rect.setter
+    def rect(self, rect : Rect) -> None:
+        self.x, self.y = rect.x, rect.y
+        
+    def update_target(self, foods : Foods, rng : RandomStream = UNSEEDED.stream("eating"), stats : WorldStats | None = None,
+                      events : EventLog = NULL_EVENT_LOG) -> Food | None:
+        """Drop the targeted food if it is eaten or if the animal is not hungry anymore, else eat it when colliding
+
+        Args:
+            foods (Foods): All the foods in the game
+            rng (RandomStream, optional): The stream the eaten quantities are drawn from. Defaults to an unseeded stream.
+            stats (WorldStats | None, optional): The statistics the meal is reported to. Defaults to None.
+            events (EventLog, optional): The log the meal and the depletion of the food are written to. Defaults to a log with every category off.
+
+        Returns:
+            Food | None: The food the animal has to move to this tick
+        """
+        food = foods.get(self.targeted_food) if self.targeted_food is not None else None
+        if self.targeted_food is not None and (food is None or food.is_completely_eaten()):
             self.remove_eaten_targeted_food(foods)
             
-        if self.targeted_food is not None:
+        if food is not None and self.targeted_food is not None:
             if self.food_handler.is_hungry():
                 self.stop_moving = True
-                if self.is_colliding_with_food(self.targeted_food):
-                    self.food_handler.eat_food(self.targeted_food)
-                self.move_to_food(self.targeted_food)
+                if self.is_colliding_with_food(food):
+                    foods.mark_changed(food.rect)
+                    storage = self.food_handler.food_storage
+                    eaten = self.food_handler.eat_food(food, rng)
+                    foods.count_eaten(eaten, food)
+                    if stats is not None:
+                        stats.eat(eaten, self.food_handler.food_storage - storage)
+                    if events.on["eat"]:
+                        events.emit("eat", self.handle.slot, self.targeted_food.slot, eaten)
+                    if events.on["food_depleted"] and food.is_completely_eaten():
+                        events.emit("food_depleted", self.targeted_food.slot, food.x, food.y)
+                return food
             else:
                 self.stop_moving = False
                 self.targeted_food = None
-            
-        if len(self.food_in_vision) > 0:
-            if self.targeted_food is None and self.food_handler.is_hungry():
-                self.targeted_food = self.get_closest_food(self.food_in_vision)
-        
-        
-        if not self.stop_moving:
-            self.move()
-            
-        self.food_handler.food_removing_timer()
-        self.life = self.food_handler.remove_life_from_starvation(self.life, 1)
-        
+        return None
+    
     def remove_eaten_targeted_food(self, foods : Foods) -> None:
-        (f"targerted food is completely eaten: {self.targeted_food}")
-        if self.targeted_food in foods.foods:
-            foods.remove_food(self.targeted_food)
+        """Queue the targeted food to be removed and go back to wandering
+
+        Args:
+            foods (Foods): All the foods in the game
+        """
+        foods.despawn_food(self.targeted_food) # type: ignore
         self.targeted_food = None
         self.stop_moving = False
         
-    def check_screen_collision(self, screen : py.surface.Surface) -> None:
-        """Check if the animal is colliding with the screen borders
+    def choose_direction(self, rng : RandomStream) -> tuple[int, int]:
+        """Choose a random direction based on the `Direction` enum
 
         Args:
-            screen (py.surface.Surface): The screen to check the collision
-        """
-        if self.rect.x < 0:
-            self.rect.x = 0
-        elif self.rect.x > screen.get_width() - self.size:
-            self.rect.x = screen.get_width() - self.size
-        elif self.rect.y < 0:
-            self.rect.y = 0
-        elif self.rect.y > screen.get_height() - self.size:
-            self.rect.y = screen.get_height() - self.size
-        
-    def choose_direction(self) -> tuple[int, int]:
-        """Choose a random direction based on the `Direction` enum
+            rng (RandomStream): The stream the direction is drawn from
 
         Returns:
             tuple[int, int]: The direction tuple (x, y)
         """
-        return random.choice(list(Direction)).value
+        return DIRECTIONS[rng.randrange(len(DIRECTIONS))].value
     
     def is_dead(self) -> bool:
         """Check if the animal is dead (life <= 0)
@@ -128,26 +213,6 @@ class Animal:
         """
         return self.life <= 0
         
-    def create(self, screen : py.surface.Surface) -> None:
-        """Create the animal on the screen and his vision
-
-        Args:
-            screen (py.surface.Surface): The screen to create the animal
-        """
-        py.draw.rect(screen, self.color, self.rect)
-        
-    def move(self):
-        """Move the animal based on his direction, every 100 frames the animal will choose a new direction
-        """        
-        self.direction_count += 1
-        
-        if self.direction_count >= 100:
-            self.direction = self.choose_direction()
-            self.direction_count = 0
-            
-        self.rect.x += self.direction[0] * self.speed
-        self.rect.y += self.direction[1] * self.speed
-           
     def is_colliding_with_food(self, food : Food) -> bool:
         """Check if the animal is colliding with a food
 
@@ -159,32 +224,6 @@ class Animal:
         """
         return self.rect.colliderect(food.rect)
         
-    def move_to_food(self, food : Food):
-        """Method to move the animal to the food based on the hypotenuse
-
-        Args:
-            food (Food): The food to move to
-        """
-        
-        dx, dy = food.rect.centerx - self.rect.centerx, food.rect.centery - self.rect.centery
-        dist = math.hypot(dx, dy)
-        try:
-            dx, dy = dx / dist, dy / dist
-        except ZeroDivisionError:
-            dx = dy = 0
-            
-        if round(dx * self.speed) >= 1:
-            self.rect.x += round(dx * self.speed)
-        else:
-            self.rect.x -= 1
-            
-        if round(dy * self.speed) >= 1:
-            self.rect.y += round(dy * self.speed)
-        else:
-            self.rect.y -= 1
-        # self.rect.x += dx * self.speed
-        # self.rect.y += dy * self.speed
-        
     def get_distance_from_food(self, food : Food) -> float:
         """Get the distance from the animal to the food
 
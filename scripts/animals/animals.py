@@ -1,42 +1,487 @@
-import pygame as py
+from typing import Callable
+
+import numpy as np
 
 from .animal import Animal
+from .population import Population, DIRECTION_CHANGE_TICKS
+from .kernels import LocalKernels
+from .sweep_and_prune import SweepAndPrune
 from foods import Foods
+from water import WaterField
+from entity_pool import EntityPool, Handle
+from profiler import Profiler, NULL_PROFILER
+from timing_wheel import TimingWheel
+from random_streams import RandomService, UNSEEDED
+from world_stats import WorldStats
+from event_log import EventLog, NULL_EVENT_LOG
+
+DIRECTION_TIMER = "direction"
+HUNGER_TIMER = "hunger"
+THIRST_TIMER = "thirst"
+PREDATION_RATIO = 1.5
+CROWDING_LIMIT = 4
 
 class Animals:
-    def __init__(self, animals : list[Animal] = []) -> None:
-        """Class used to manage all animals
+    def __init__(self, animals : list[Animal] | None = None, tick : int = 0, rng : RandomService = UNSEEDED, stats : WorldStats | None = None,
+                 events : EventLog = NULL_EVENT_LOG) -> None:
+        """Class used to manage all animals, their state is stored in a shared `Population`.
+        The animals are stored in an `EntityPool` whose dense list follows the population rows (`animals[i].index == i`).
+        Direction changes and hunger (and thirst) decrements are scheduled on a `TimingWheel`, a tick only touches the animals whose events are due.
+        Every spawn, despawn, meal, storage decrement, life loss and drink is reported to `stats`, meals, targets, life losses and deaths are logged to `events`
 
         Args:
-            animals (list[Animal], optional): In case there is already a list of animals somewhere in the game. Defaults to [].
+            animals (list[Animal] | None, optional): In case there is already a list of animals somewhere in the game. Defaults to None.
+            tick (int, optional): The next simulation tick, the timers are scheduled from it. Defaults to 0.
+            rng (RandomService, optional): The service giving the streams of the directions and of the eaten quantities. Defaults to an unseeded service.
+            stats (WorldStats | None, optional): The statistics to keep up to date, None for new ones. Defaults to None.
+            events (EventLog, optional): The log of the events. Defaults to a log with every category off.
         """
-        self.animals = animals
-        
+        self.population = Population()
+        self.pool : EntityPool[Animal] = EntityPool()
+
+        self.timers = TimingWheel(tick)
+        self.thirst_timers = False
+        self.unscheduled = False
+        self.starving : set[Handle] = set()
+        self.dehydrated : set[Handle] = set()
+
+        self.directions = rng.stream("directions")
+        self.eating = rng.stream("eating")
+        self.kernels = LocalKernels()
+        self.broad_phase = SweepAndPrune()
+        self.stats = stats if stats is not None else WorldStats()
+        self.events = events
+
+        for animal in animals or []:
+            self.add_animal(animal)
+
+    @property
+    def animals(self) -> list[Animal]:
+        return self.pool.items
+
     def add_animal(self, animal : Animal) -> None:
         """Add an animal to the list of animals
 
         Args:
             animal (Animal): The animal to add
-        """     
-        self.animals.append(animal)
+        """
+        animal.bind(self.population)
+        self.register(animal)
         
+    def register(self, animal : Animal) -> None:
+        """Add an animal that is already a view on the last row of the population (e.g. restored from a snapshot)
+
+        Args:
+            animal (Animal): The animal to add
+        """
+        animal.handle = self.pool.add(animal)
+        self.schedule_timers(animal)
+        self.stats.spawn(animal.life, animal.food_handler.food_storage, animal.water_handler.water_storage)
+
+    def restore(self, count : int, create : Callable[[int, int], Animal]) -> None:
+        """Add restored animals that are views on the first `count` rows of the population, without creating them:
+        an animal is created by `create(row, position)` when it is first read (see `EntityPool.extend`).
+        Their timers are scheduled by `schedule_restored`, before the next tick, and they are not reported to `stats`,
+        which has to be restored with them
+
+        Args:
+            count (int): The number of animals
+            create (Callable[[int, int], Animal]): Builds the animal of a saved row at a position of the population
+        """
+        self.pool.extend(count, create)
+        self.unscheduled = count > 0
+
+    def schedule_restored(self) -> None:
+        """Schedule the timers of the restored animals in the order of their rows, as `register` would have, this creates every animal
+        """
+        if not self.unscheduled:
+            return
+        self.unscheduled = False
+        for animal in self.animals:
+            self.schedule_timers(animal)
+
+    def schedule_timers(self, animal : Animal) -> None:
+        """Schedule the timers of an animal from its counters, or from the tick of its next direction change if it has one
+
+        Args:
+            animal (Animal): The animal
+        """
+        tick = self.timers.tick
+        population = self.population
+        if population.direction_due[animal.index] < 0:
+            population.schedule_directions(animal.index, tick)
+        animal.direction_timer = self.timers.schedule(int(population.direction_due[animal.index]), (DIRECTION_TIMER, animal.handle))
+
+        food_handler = animal.food_handler
+        animal.hunger_timer = self.timers.schedule(tick + max(0, food_handler.food_removing_cooldown - 1 - food_handler.food_removing_count),
+                                                   (HUNGER_TIMER, animal.handle))
+        if food_handler.food_storage <= 0:
+            self.starving.add(animal.handle)
+
+        animal.thirst_timer = None
+        if self.thirst_timers:
+            self.schedule_thirst(animal)
+
+    def schedule_thirst(self, animal : Animal) -> None:
+        """Schedule the thirst timer of an animal from its counter
+
+        Args:
+            animal (Animal): The animal
+        """
+        water_handler = animal.water_handler
+        animal.thirst_timer = self.timers.schedule(self.timers.tick + max(0, water_handler.water_removing_cooldown - 1 - water_handler.water_removing_count),
+                                                   (THIRST_TIMER, animal.handle))
+        if water_handler.water_storage <= 0:
+            self.dehydrated.add(animal.handle)
+
+    def sync_timers(self) -> None:
+        """Write the state of the timers back in the counters of every animal (e.g. before saving them)
+        """
+        self.schedule_restored()
+        tick = self.timers.tick
+        population = self.population
+        for animal in self.animals:
+            due = int(population.direction_due[animal.index])
+            if due >= 0:
+                population.direction_count[animal.index] = DIRECTION_CHANGE_TICKS - 1 - (due - tick)
+            animal.food_handler.food_removing_count = animal.food_handler.food_removing_cooldown - 1 - (animal.hunger_timer.tick - tick)
+            if animal.thirst_timer is not None:
+                animal.water_handler.water_removing_count = animal.water_handler.water_removing_cooldown - 1 - (animal.thirst_timer.tick - tick)
+
     def remove_animal(self, animal : Animal) -> None:
-        """Remove an animal from the list of animals
+        """Remove an animal from the list of animals now, the last animal takes its place and its row
 
         Args:
             animal (Animal): The animal to remove
         """
-        self.animals.remove(animal)
-        
-    def update(self, screen : py.surface.Surface, foods : Foods) -> None:
-        """Main update method for all animals
+        index = self.pool.remove(animal.handle)
+        if index < 0:
+            return
+        for timer in (animal.direction_timer, animal.hunger_timer, animal.thirst_timer):
+            if timer is not None:
+                self.timers.cancel(timer)
+        self.starving.discard(animal.handle)
+        self.dehydrated.discard(animal.handle)
+        self.stats.despawn(int(self.population.life[index]), animal.food_handler.food_storage, animal.water_handler.water_storage)
+        if self.events.on["death"]:
+            self.events.emit("death", animal.handle.slot, int(self.population.life[index]))
+        self.population.swap_remove(index)
+        # an animal not created yet gets its position when it is created
+        moved = self.pool.created(index) if index < len(self.animals) else None
+        if moved is not None:
+            moved.index = index
+            
+    def despawn_animal(self, handle : Handle) -> None:
+        """Queue an animal to be removed at the end of the tick by `apply_despawns`
 
         Args:
-            screen (py.surface.Surface): The game screen
-            foods (list[Food]): List of all foods in the game
+            handle (Handle): The handle of the animal
         """
-        for animal in self.animals:
-            animal.update(screen, foods)
-            if animal.is_dead():
+        self.pool.despawn(handle)
+        
+    def apply_despawns(self) -> None:
+        """Remove the animals queued by `despawn_animal`
+        """
+        for handle in self.pool.take_despawns():
+            animal = self.pool.get(handle)
+            if animal is not None:
                 self.remove_animal(animal)
-        
\ No newline at end of file
+        
+    def get(self, handle : Handle) -> Animal | None:
+        """Get the animal of a handle
+
+        Args:
+            handle (Handle): The handle of the animal
+
+        Returns:
+            Animal | None: The animal, None if it was removed
+        """
+        return self.pool.get(handle)
+
+    def step(self, foods : Foods, width : int, height : int, profiler : Profiler = NULL_PROFILER, water_field : WaterField | None = None,
+             interactions : bool = False) -> None:
+        """Advance all animals by one simulation tick, without drawing anything.
+        The decisions are taken animal by animal, then the movements are applied to the whole population at once
+        by `kernels`. The dead animals and the eaten foods are only queued, `apply_despawns` removes them at the end of the tick
+
+        Args:
+            foods (Foods): All the foods in the game
+            width (int): The world width
+            height (int): The world height
+            profiler (Profiler, optional): The profiler timing every phase. Defaults to NULL_PROFILER.
+            water_field (WaterField | None, optional): The water layer, the animals get thirsty and drink only when it is given. Defaults to None.
+            interactions (bool, optional): Whether the animals that overlap hunt, compete and crowd each other (see `interact`). Defaults to False.
+        """
+        self.schedule_restored()
+        population = self.population
+        count = population.count
+        if count == 0:
+            self.timers.advance()
+            return
+        if water_field is not None and not self.thirst_timers:
+            self.thirst_timers = True
+            for animal in self.animals:
+                self.schedule_thirst(animal)
+
+        with profiler.phase("animals.clamp"):
+            self.kernels.clamp(population, width, height)
+
+        steering = np.zeros(count, dtype=bool)
+        target_x = np.zeros(count, dtype=np.int64)
+        target_y = np.zeros(count, dtype=np.int64)
+        wandering = np.zeros(count, dtype=bool)
+        seekers : list[Animal] = []
+
+        with profiler.phase("animals.feeding"):
+            for animal in self.animals:
+                animal.vision.update_rect(animal.rect)
+
+                food_to_reach = animal.update_target(foods, self.eating, self.stats, self.events)
+                if food_to_reach is not None:
+                    steering[animal.index] = True
+                    target_x[animal.index], target_y[animal.index] = food_to_reach.rect.center
+
+                if animal.targeted_food is None and animal.food_handler.is_hungry():
+                    seekers.append(animal)
+                wandering[animal.index] = not animal.stop_moving
+
+            for handle in [handle for handle in self.starving if self.pool.get(handle).food_handler.food_storage > 0]: # type: ignore
+                self.starving.discard(handle)
+
+        with profiler.phase("animals.vision"):
+            self.acquire_targets(seekers, foods)
+
+        if water_field is not None:
+            with profiler.phase("animals.drinking"):
+                wandering &= ~self.drink(water_field, steering)
+
+        with profiler.phase("animals.movement"):
+            self.pause_direction_timers(wandering)
+            due = self.timers.advance()
+            self.change_directions([handle for kind, handle in due if kind == DIRECTION_TIMER]) # type: ignore
+            self.kernels.move(population, steering, target_x, target_y, wandering)
+
+        if interactions:
+            with profiler.phase("animals.interactions"):
+                self.interact()
+
+        with profiler.phase("animals.starvation"):
+            self.consume_storages(due, water_field is not None) # type: ignore
+
+            losing_life = [self.pool.index(handle) for handle in self.starving]
+            if water_field is not None:
+                losing_life += [self.pool.index(handle) for handle in self.dehydrated]
+            np.subtract.at(population.life, losing_life, 1)
+            self.stats.starve(len(losing_life))
+            if self.events.on["starve"]:
+                for index in losing_life:
+                    self.events.emit("starve", self.pool.item_slots[index], int(population.life[index]))
+
+            for index in sorted({index for index in losing_life if population.life[index] <= 0}):
+                self.despawn_animal(self.pool.handle(index))
+
+    def interact(self) -> None:
+        """Apply the rules between the animals whose boxes overlap, the pairs are found by the `SweepAndPrune` broad phase.
+        The prey are removed from the pairs before the targets are compared, then the crowds are counted on the remaining pairs
+        """
+        population = self.population
+        count = population.count
+        first, second = self.broad_phase.pairs(population.x[:count], population.y[:count], population.size[:count], population.size[:count])
+        if len(first) == 0:
+            return
+
+        prey = self.hunt(first, second)
+        alive = ~(np.isin(first, prey) | np.isin(second, prey))
+        first, second = first[alive], second[alive]
+        self.compete(first, second)
+        self.disperse(first, second)
+
+    def hunt(self, first : np.ndarray, second : np.ndarray) -> np.ndarray:
+        """A hungry animal at least `PREDATION_RATIO` times bigger than an animal it overlaps eats it, its body fills the food storage of the predator.
+        An animal eats at most one prey per tick and a prey can't hunt, the pairs are taken in the order of the broad phase
+
+        Args:
+            first (np.ndarray): The first row of every pair
+            second (np.ndarray): The second row of every pair
+
+        Returns:
+            np.ndarray: The rows of the prey, they are queued to be removed at the end of the tick
+        """
+        size = self.population.size
+        first_bigger = size[first] >= size[second]
+        predators = np.where(first_bigger, first, second)
+        prey = np.where(first_bigger, second, first)
+        candidates = np.flatnonzero(size[predators] >= PREDATION_RATIO * size[prey])
+
+        hunters : set[int] = set()
+        eaten : set[int] = set()
+        for predator, victim in zip(predators[candidates].tolist(), prey[candidates].tolist()):
+            if predator in hunters or predator in eaten or victim in eaten or victim in hunters:
+                continue
+            animal = self.animals[predator]
+            if not animal.food_handler.is_hungry():
+                continue
+            hunters.add(predator)
+            eaten.add(victim)
+            stored = animal.food_handler.feed(int(size[victim]))
+            self.stats.hunt(stored)
+            if self.events.on["hunt"]:
+                self.events.emit("hunt", animal.handle.slot, self.pool.item_slots[victim], stored)
+            self.despawn_animal(self.pool.handle(victim))
+        return np.array(sorted(eaten), dtype=np.int64)
+
+    def compete(self, first : np.ndarray, second : np.ndarray) -> None:
+        """When two overlapping animals target the same food, the smaller one gives it up and looks for another food.
+        Between animals of the same size, the second one of the pair gives up
+
+        Args:
+            first (np.ndarray): The first row of every pair
+            second (np.ndarray): The second row of every pair
+        """
+        size = self.population.size
+        for a, b in zip(first.tolist(), second.tolist()):
+            animal, other = self.animals[a], self.animals[b]
+            if animal.targeted_food is None or animal.targeted_food != other.targeted_food:
+                continue
+            loser = animal if size[a] < size[b] else other
+            loser.targeted_food = None
+            loser.stop_moving = False
+
+    def disperse(self, first : np.ndarray, second : np.ndarray) -> None:
+        """A wandering animal overlapping at least `CROWDING_LIMIT` others takes a new random direction at once to leave the crowd
+
+        Args:
+            first (np.ndarray): The first row of every pair
+            second (np.ndarray): The second row of every pair
+        """
+        population = self.population
+        neighbours = np.bincount(np.concatenate((first, second)), minlength=population.count)
+        crowded = np.flatnonzero((neighbours >= CROWDING_LIMIT) & (population.direction_due[:population.count] >= 0))
+        for index in crowded.tolist():
+            self.timers.cancel(self.animals[index].direction_timer)
+        self.change_directions([self.pool.handle(index) for index in crowded.tolist()])
+
+    def pause_direction_timers(self, wandering : np.ndarray) -> None:
+        """The direction of an animal only counts the ticks it wanders: stop the timers of the animals that stopped wandering,
+        keeping their count, and restart the timers of the animals that wander again
+
+        Args:
+            wandering (np.ndarray): One boolean per animal, True for the animals wandering this tick
+        """
+        tick = self.timers.tick
+        population = self.population
+        direction_due = population.direction_due[:population.count]
+        timed = direction_due >= 0
+
+        for index in np.flatnonzero(timed & ~wandering).tolist():
+            animal = self.animals[index]
+            population.direction_count[index] = DIRECTION_CHANGE_TICKS - 1 - (direction_due[index] - tick)
+            direction_due[index] = -1
+            self.timers.cancel(animal.direction_timer)
+            animal.direction_timer = None
+
+        for index in np.flatnonzero(~timed & wandering).tolist():
+            self.schedule_direction(self.animals[index])
+
+    def schedule_direction(self, animal : Animal) -> None:
+        """Schedule the next direction change of an animal from its direction count
+
+        Args:
+            animal (Animal): The animal
+        """
+        population = self.population
+        population.schedule_directions(animal.index, self.timers.tick)
+        animal.direction_timer = self.timers.schedule(int(population.direction_due[animal.index]), (DIRECTION_TIMER, animal.handle))
+
+    def change_directions(self, handles : list[Handle]) -> None:
+        """Give a new random direction to the animals whose direction timer is due, in the order of their rows, and schedule the next change
+
+        Args:
+            handles (list[Handle]): The handles of the animals
+        """
+        rows = sorted(index for index in (self.pool.index(handle) for handle in handles) if index >= 0)
+        if not rows:
+            return
+        population = self.population
+        population.redirect(np.array(rows, dtype=np.int64), self.directions)
+        for index in rows:
+            population.direction_count[index] = 0
+            population.direction_due[index] = -1
+            self.schedule_direction(self.animals[index])
+
+    def consume_storages(self, due : list[tuple[str, Handle]], thirst : bool) -> None:
+        """Remove food (and water) from the storage of the animals whose hunger (and thirst) timer is due, and schedule the next removal
+
+        Args:
+            due (list[tuple[str, Handle]]): The events due this tick
+            thirst (bool): Whether the thirst timers are applied
+        """
+        tick = self.timers.tick - 1
+        for kind, handle in due:
+            animal = self.pool.get(handle)
+            if animal is None:
+                continue
+            if kind == HUNGER_TIMER:
+                storage = animal.food_handler.food_storage
+                animal.food_handler.remove_food_from_storage()
+                self.stats.digest(storage - animal.food_handler.food_storage)
+                if animal.food_handler.food_storage <= 0:
+                    self.starving.add(handle)
+                animal.hunger_timer = self.timers.schedule(tick + animal.food_handler.food_removing_cooldown, (HUNGER_TIMER, handle))
+            elif kind == THIRST_TIMER and thirst:
+                storage = animal.water_handler.water_storage
+                animal.water_handler.remove_water_from_storage()
+                self.stats.digest(0, storage - animal.water_handler.water_storage)
+                if animal.water_handler.water_storage <= 0:
+                    self.dehydrated.add(handle)
+                animal.thirst_timer = self.timers.schedule(tick + animal.water_handler.water_removing_cooldown, (THIRST_TIMER, handle))
+
+    def drink(self, water_field : WaterField, busy : np.ndarray) -> np.ndarray:
+        """Move the thirsty animals one step toward the closest water, read from the water field, and make the ones in the water drink
+
+        Args:
+            water_field (WaterField): The water layer
+            busy (np.ndarray): One boolean per animal, True for the animals already moving to a food
+
+        Returns:
+            np.ndarray: One boolean per animal, True for the animals going to the water or drinking
+        """
+        thirsty = np.fromiter((animal.water_handler.is_thirsty() for animal in self.animals), dtype=bool, count=len(self.animals)) & ~busy
+        rows = np.flatnonzero(thirsty)
+        center_x, center_y = self.population.centers(rows)
+        step_x, step_y, distance = water_field.steps(center_x, center_y)
+
+        reachable = np.isfinite(distance)
+        in_water = reachable & (distance == 0)
+        for index, x, y in zip(rows[in_water].tolist(), center_x[in_water].tolist(), center_y[in_water].tolist()):
+            water = water_field.source_at(x, y)
+            if water is not None:
+                animal = self.animals[index]
+                self.stats.drink(animal.water_handler.drink(water))
+                if animal.water_handler.water_storage > 0:
+                    self.dehydrated.discard(animal.handle)
+
+        moving = reachable & ~in_water
+        self.population.step_by(rows[moving], step_x[moving], step_y[moving])
+        thirsty[rows[~reachable]] = False
+        return thirsty
+
+    def acquire_targets(self, seekers : list[Animal], foods : Foods) -> None:
+        """Give every seeker the closest food inside its vision as target, all seekers are handled in one pass
+
+        Args:
+            seekers (list[Animal]): The hungry animals without target
+            foods (Foods): All the foods in the game
+        """
+        if not seekers or len(foods) == 0:
+            return
+
+        rows = np.array([animal.index for animal in seekers], dtype=np.int64)
+        boxes = np.array([(animal.vision.rect.x, animal.vision.rect.y, animal.vision.rect.width, animal.vision.rect.height) for animal in seekers], dtype=np.int64)
+
+        closest = self.kernels.locate(self.population, rows, boxes, foods.locator())
+        for animal, food_index in zip(seekers, closest):
+            if food_index >= 0:
+                animal.targeted_food = foods.handle(food_index)
+                if self.events.on["target"]:
+                    self.events.emit("target", animal.handle.slot, animal.targeted_food.slot)
@@ -1,22 +1,8 @@
-import random
-import pygame as py
-
 from foods import Food
+from random_streams import RandomStream, UNSEEDED
 
 from typing import Callable, Literal, Union
 
-class FoodConsumptionTimer:
-    def __init__(self, cooldown : int, callback : Callable):
-        self.cooldown = cooldown
-        self.callback = callback
-        self.last = py.time.get_ticks()
-        
-    def update(self):
-        now = py.time.get_ticks()
-        if now - self.last >= self.cooldown:
-            self.callback
-            self.last = py.time.get_ticks()    
-            
 class FoodQuantityChecker:
     @staticmethod
     def is_hungry(current_food : int, required_food : int) -> bool:
@@ -104,36 +90,80 @@ class FoodRemover:
     
 class FoodEater:
     @staticmethod
-    def eat_food(current_food : int, food : Food) -> None:
+    def eat_food(current_food : int, food : Food, rng : RandomStream) -> tuple[int, int]:
         """Eat the food given in parameter, will increase the amount of food and remove quantity of food from the food
 
         Args:
-            food (Food): _description_
+            current_food (int): The current amount of food
+            food (Food): The food to eat
+            rng (RandomStream): The stream the eaten quantity is drawn from
+
+        Returns:
+            tuple[int, int]: The new amount of food and the quantity removed from the food
         """
-        quantity_to_eat = random.randint(1, food.quantity)
-        FoodIncreaser.increase(current_food, quantity_to_eat)
+        quantity_to_eat = rng.randint(1, food.quantity)
         food.remove_quantity(quantity_to_eat)
+        return FoodIncreaser.increase(current_food, quantity_to_eat), quantity_to_eat
         
-class StarvingHandler:
-    def remove_life_from_starvation(self, current_food : int, life : int, amount : int) -> int:
-        """Remove life from the animal when he is starving, so it check if the animal is starving before removing life
-        """
-        if FoodQuantityChecker.is_starving(current_food):
-            life -= amount
-        return life
-
 class AnimalFoodHandler:
     def __init__(self, 
                  max_food_storage : int = 100,
-                 food_removing_quantity : int = 1) -> None:
+                 food_removing_quantity : int = 1,
+                 food_removing_cooldown : int = 60,
+                 hunger_threshold : int = 50) -> None:
+        """Class used to handle the food storage of an animal
+
+        Args:
+            max_food_storage (int, optional): The maximum amount of food the animal can store. Defaults to 100.
+            food_removing_quantity (int, optional): The amount of food removed every cooldown. Defaults to 1.
+            food_removing_cooldown (int, optional): The number of ticks between two food removals. Defaults to 60.
+            hunger_threshold (int, optional): The amount of food under which the animal is hungry. Defaults to 50.
+        """
         self.max_food_storage = max_food_storage
         self.food_storage = max_food_storage
         self.food_removing_quantity = food_removing_quantity
-         
-
+        self.food_removing_cooldown = food_removing_cooldown
+        self.food_removing_count = 0
+        self.hunger_threshold = hunger_threshold
         
+    def is_hungry(self) -> bool:
+        """Check if the animal is hungry
 
+        Returns:
+            bool: True if the animal is hungry, False otherwise
+        """
+        return FoodQuantityChecker.is_hungry(self.food_storage, self.hunger_threshold)
     
-    
-    
-    
\ No newline at end of file
+    def eat_food(self, food : Food, rng : RandomStream = UNSEEDED.stream("eating")) -> int:
+        """Eat a part of the food, the food storage can't go over the max food storage
+
+        Args:
+            food (Food): The food to eat
+            rng (RandomStream, optional): The stream the eaten quantity is drawn from. Defaults to an unseeded stream.
+
+        Returns:
+            int: The quantity removed from the food
+        """
+        self.food_storage, eaten = FoodEater.eat_food(self.food_storage, food, rng)
+        if FoodQuantityChecker.is_full(self.food_storage, self.max_food_storage):
+            self.food_storage = FoodIncreaser.reset_food_storage(self.max_food_storage)
+        return eaten
+            
+    def feed(self, amount : int) -> int:
+        """Add food to the storage without going over the max food storage, e.g. the body of a prey
+
+        Args:
+            amount (int): The quantity of food
+
+        Returns:
+            int: The quantity actually stored
+        """
+        storage = self.food_storage
+        self.food_storage = min(FoodIncreaser.increase(storage, amount), self.max_food_storage)
+        return self.food_storage - storage
+            
+    def remove_food_from_storage(self) -> None:
+        """Remove `food_removing_quantity` from the storage and restart the cooldown, called by the hunger timers of `Animals`
+        """
+        self.food_removing_count = 0
+        self.food_storage = max(0, FoodRemover.decrease(self.food_storage, self.food_removing_quantity))
@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+
+from .kernels import LocalKernels
+from .population import Population, DIRECTIONS, DIRECTION_VECTORS
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def jit(function):
+    """Compile a function with Numba, caching the machine code next to the module so only the first run pays for it.
+    Without Numba the function is returned as is and runs as plain Python
+
+    Args:
+        function (Callable): The function to compile
+
+    Returns:
+        Callable: The compiled function, or the function itself
+    """
+    if numba is None:
+        return function
+    return numba.njit(cache=True)(function)
+
+
+@jit
+def clamp_rows(x : np.ndarray, y : np.ndarray, size : np.ndarray, count : int, width : int, height : int) -> None:
+    """Keep the first `count` rows inside the world, like `Population.clamp` only one border is fixed per tick
+
+    Args:
+        x (np.ndarray): The x column
+        y (np.ndarray): The y column
+        size (np.ndarray): The size column
+        count (int): The number of rows
+        width (int): The world width
+        height (int): The world height
+    """
+    for row in range(count):
+        max_x = width - size[row]
+        max_y = height - size[row]
+        if x[row] < 0:
+            x[row] = 0
+        elif x[row] > max_x:
+            x[row] = max_x
+        elif y[row] < 0:
+            y[row] = 0
+        elif y[row] > max_y:
+            y[row] = max_y
+
+
+@jit
+def move_rows(x : np.ndarray, y : np.ndarray, size : np.ndarray, speed : np.ndarray, direction : np.ndarray, vectors : np.ndarray,
+              steering : np.ndarray, target_x : np.ndarray, target_y : np.ndarray, wandering : np.ndarray, count : int) -> None:
+    """Move the first `count` rows in one pass: toward their target with the rounding rules of `Population.steer`,
+    then along their direction like `Population.move_along`
+
+    Args:
+        x (np.ndarray): The x column
+        y (np.ndarray): The y column
+        size (np.ndarray): The size column
+        speed (np.ndarray): The speed column
+        direction (np.ndarray): The direction column
+        vectors (np.ndarray): The (x, y) vector of every direction
+        steering (np.ndarray): One boolean per row, True for the rows going to a food
+        target_x (np.ndarray): The x of the target of every row
+        target_y (np.ndarray): The y of the target of every row
+        wandering (np.ndarray): One boolean per row, True for the wandering rows
+        count (int): The number of rows
+    """
+    for row in range(count):
+        if steering[row]:
+            dx = target_x[row] - (x[row] + size[row] // 2)
+            dy = target_y[row] - (y[row] + size[row] // 2)
+            dist = math.hypot(dx, dy)
+            step_x = int(np.rint(dx / dist * speed[row])) if dist > 0 else 0
+            step_y = int(np.rint(dy / dist * speed[row])) if dist > 0 else 0
+            x[row] += step_x if step_x >= 1 else -1
+            y[row] += step_y if step_y >= 1 else -1
+        if wandering[row]:
+            x[row] += vectors[direction[row], 0] * speed[row]
+            y[row] += vectors[direction[row], 1] * speed[row]
+
+
+class JitKernels(LocalKernels):
+    """The spatial phases of `LocalKernels` with the clamping and the moving written as per-row loops compiled by Numba.
+    The branches of the loops replace the masks and `np.where` chains of the NumPy version, which walk every row several times.
+    Finding foods stays on the `FoodLocator`, it is already sorted and searched by NumPy
+    """
+    def clamp(self, population : Population, width : int, height : int) -> None:
+        """Keep every animal inside the world
+
+        Args:
+            population (Population): The population
+            width (int): The world width
+            height (int): The world height
+        """
+        clamp_rows(population.x, population.y, population.size, population.count, width, height)
+
+    def move(self, population : Population, steering : np.ndarray, target_x : np.ndarray, target_y : np.ndarray, wandering : np.ndarray) -> None:
+        """Move the animals going to a food toward it, then the wandering animals along their direction
+
+        Args:
+            population (Population): The population
+            steering (np.ndarray): One boolean per animal, True for the animals going to a food
+            target_x (np.ndarray): The x of the target of every animal
+            target_y (np.ndarray): The y of the target of every animal
+            wandering (np.ndarray): One boolean per animal, True for the wandering animals
+        """
+        move_rows(population.x, population.y, population.size, population.speed, population.direction, DIRECTION_VECTORS,
+                  steering, target_x, target_y, wandering, population.count)
+
+
+def check_kernels(kernels : LocalKernels, seed : int = 0, count : int = 500, ticks : int = 50) -> bool:
+    """Check that kernels move and clamp a seeded population exactly like `LocalKernels`.
+    The animals start inside and around a small world, with random speeds, directions and targets, so every branch is taken
+
+    Args:
+        kernels (LocalKernels): The kernels to check
+        seed (int, optional): The seed of the population. Defaults to 0.
+        count (int, optional): The number of animals. Defaults to 500.
+        ticks (int, optional): The number of ticks to compare. Defaults to 50.
+
+    Returns:
+        bool: Whether both kernels give the same positions after every tick
+    """
+    rng = np.random.default_rng(seed)
+    width, height = 400, 300
+    populations = [Population(count), Population(count)]
+    for x, y, size, speed, direction in zip(rng.integers(-50, width + 50, count).tolist(), rng.integers(-50, height + 50, count).tolist(),
+                                            rng.integers(15, 31, count).tolist(), rng.integers(1, 4, count).tolist(),
+                                            rng.integers(0, len(DIRECTIONS), count).tolist()):
+        for population in populations:
+            population.add(x, y, size, speed, 100, direction)
+
+    reference = LocalKernels()
+    for _ in range(ticks):
+        steering = rng.random(count) < 0.5
+        wandering = ~steering | (rng.random(count) < 0.1)
+        target_x = rng.integers(0, width, count)
+        target_y = rng.integers(0, height, count)
+        for backend, population in zip((reference, kernels), populations):
+            backend.clamp(population, width, height)
+            backend.move(population, steering, target_x, target_y, wandering)
+        if not all(np.array_equal(getattr(populations[0], column), getattr(populations[1], column)) for column in ("x", "y")):
+            return False
+    return True
@@ -0,0 +1,47 @@
+import numpy as np
+
+from .population import Population
+from foods.food_locator import FoodLocator
+
+
+class LocalKernels:
+    """The spatial phases of a tick (clamping, finding foods and moving), run on the whole population in this process.
+    Another implementation can replace any phase as long as it gives the same results (see `animals.jit_kernels.JitKernels`)
+    """
+    def clamp(self, population : Population, width : int, height : int) -> None:
+        """Keep every animal inside the world
+
+        Args:
+            population (Population): The population
+            width (int): The world width
+            height (int): The world height
+        """
+        population.clamp(slice(0, population.count), width, height)
+
+    def locate(self, population : Population, rows : np.ndarray, boxes : np.ndarray, locator : FoodLocator) -> np.ndarray:
+        """Find the closest food inside the box of every given row
+
+        Args:
+            population (Population): The population
+            rows (np.ndarray): The rows looking for food
+            boxes (np.ndarray): The (left, top, width, height) vision box of every row
+            locator (FoodLocator): The foods that can be found
+
+        Returns:
+            np.ndarray: The index of the closest food of every row in the locator, -1 when no food is visible
+        """
+        center_x, center_y = population.centers(rows)
+        return locator.closest(center_x, center_y, boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+
+    def move(self, population : Population, steering : np.ndarray, target_x : np.ndarray, target_y : np.ndarray, wandering : np.ndarray) -> None:
+        """Move the animals going to a food toward it, then the wandering animals along their direction
+
+        Args:
+            population (Population): The population
+            steering (np.ndarray): One boolean per animal, True for the animals going to a food
+            target_x (np.ndarray): The x of the target of every animal
+            target_y (np.ndarray): The y of the target of every animal
+            wandering (np.ndarray): One boolean per animal, True for the wandering animals
+        """
+        population.steer(np.flatnonzero(steering), target_x[steering], target_y[steering])
+        population.move_along(np.flatnonzero(wandering))
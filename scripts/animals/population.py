@@ -0,0 +1,229 @@
+import numpy as np
+
+from .direction import Direction
+from random_streams import RandomStream
+import geometry
+
+DIRECTIONS = list(Direction)
+DIRECTION_VECTORS = np.array([direction.value for direction in DIRECTIONS], dtype=np.int64)
+DIRECTION_INDEXES = {direction.value: index for index, direction in enumerate(DIRECTIONS)}
+
+DIRECTION_CHANGE_TICKS = 100
+
+
+class Population:
+    COLUMNS = ("x", "y", "size", "speed", "direction", "direction_count", "life", "direction_due")
+    
+    def __init__(self, capacity : int = 16) -> None:
+        """Class used to store the animals as columns of arrays (one row per animal), so the whole population can be updated at once
+
+        Args:
+            capacity (int, optional): The number of rows allocated at start. Defaults to 16.
+        """
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for column in self.COLUMNS:
+            setattr(self, column, np.zeros(self.capacity, dtype=np.int64))
+            
+    def __len__(self) -> int:
+        return self.count
+
+    @classmethod
+    def from_columns(cls, columns : dict[str, np.ndarray], count : int) -> "Population":
+        """Create a population working on existing arrays (e.g. shared with another process), the missing columns are not usable
+
+        Args:
+            columns (dict[str, np.ndarray]): The arrays of the columns
+            count (int): The number of rows in use
+
+        Returns:
+            Population: The population
+        """
+        population = cls.__new__(cls)
+        population.count = count
+        population.capacity = min(len(values) for values in columns.values())
+        for column, values in columns.items():
+            setattr(population, column, values)
+        return population
+
+    def grow(self, capacity : int) -> None:
+        """Grow the arrays so they can hold at least `capacity` rows
+
+        Args:
+            capacity (int): The minimum number of rows
+        """
+        if capacity <= self.capacity:
+            return
+        new_capacity = max(capacity, self.capacity * 2)
+        for column in self.COLUMNS:
+            values = np.zeros(new_capacity, dtype=np.int64)
+            values[:self.count] = getattr(self, column)[:self.count]
+            setattr(self, column, values)
+        self.capacity = new_capacity
+        
+    def add(self,
+            x : int,
+            y : int,
+            size : int,
+            speed : int,
+            life : int,
+            direction : int = 0,
+            direction_count : int = 0,
+            direction_due : int = -1) -> int:
+        """Add a row to the population
+
+        Args:
+            x (int): The x position of the animal
+            y (int): The y position of the animal
+            size (int): The size of the animal
+            speed (int): The speed of the animal
+            life (int): The life of the animal
+            direction (int, optional): The index of the direction in `DIRECTIONS`. Defaults to 0.
+            direction_count (int, optional): The number of ticks since the last direction change. Defaults to 0.
+            direction_due (int, optional): The tick of the next direction change scheduled by `Animals`, -1 when none is. Defaults to -1.
+
+        Returns:
+            int: The index of the new row
+        """
+        self.grow(self.count + 1)
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.size[index] = size
+        self.speed[index] = speed
+        self.life[index] = life
+        self.direction[index] = direction
+        self.direction_count[index] = direction_count
+        self.direction_due[index] = direction_due
+        self.count += 1
+        return index
+    
+    def add_from(self, population : "Population", index : int) -> int:
+        """Copy a row of another population at the end of this one
+
+        Args:
+            population (Population): The population to copy from
+            index (int): The index of the row to copy
+
+        Returns:
+            int: The index of the new row
+        """
+        self.grow(self.count + 1)
+        new_index = self.count
+        for column in self.COLUMNS:
+            getattr(self, column)[new_index] = getattr(population, column)[index]
+        self.count += 1
+        return new_index
+    
+    def swap_remove(self, index : int) -> None:
+        """Remove a row by moving the last row into its place
+
+        Args:
+            index (int): The index of the row to remove
+        """
+        last = self.count - 1
+        if index != last:
+            for column in self.COLUMNS:
+                values = getattr(self, column)
+                values[index] = values[last]
+        self.count -= 1
+    
+    def centers(self, rows : np.ndarray | slice) -> tuple[np.ndarray, np.ndarray]:
+        """Get the centers of the given rows, rounded like `Rect.center`
+
+        Args:
+            rows (np.ndarray | slice): The rows
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The x and y centers
+        """
+        size = self.size[rows]
+        return geometry.centers(self.x[rows], self.y[rows], size, size)
+        
+    def locator(self, cell_size : int = 64) -> geometry.PointGrid:
+        """Bucket the centers of every row by grid cell, to find the animals of an area without looking at every row
+
+        Args:
+            cell_size (int, optional): The width and height of a cell. Defaults to 64.
+
+        Returns:
+            geometry.PointGrid: The grid of the centers, its results are rows
+        """
+        return geometry.PointGrid(*self.centers(slice(0, self.count)), cell_size)
+        
+    def clamp(self, rows : np.ndarray | slice, width : int, height : int) -> None:
+        """Keep the given rows inside the world, only one border is fixed per tick
+
+        Args:
+            rows (np.ndarray | slice): The rows to clamp
+            width (int): The world width
+            height (int): The world height
+        """
+        x, y, size = self.x[rows], self.y[rows], self.size[rows]
+        clamped_x, clamped_y = geometry.clamp(x, y, size, size, width, height)
+        
+        self.y[rows] = np.where(clamped_x == x, clamped_y, y)
+        self.x[rows] = clamped_x
+        
+    def redirect(self, rows : np.ndarray, rng : RandomStream) -> None:
+        """Give a new random direction to the given rows, one random number is drawn per row in the given order
+
+        Args:
+            rows (np.ndarray): The rows to redirect
+            rng (RandomStream): The stream the new directions are drawn from
+        """
+        self.direction[rows] = rng.integers(0, len(DIRECTIONS), len(rows))
+        
+    def schedule_directions(self, rows : np.ndarray | slice | int, tick : int) -> None:
+        """Set the tick of the next direction change of the given rows from their direction count, counted from `tick`
+
+        Args:
+            rows (np.ndarray | slice | int): The rows to schedule
+            tick (int): The tick the rows start wandering again
+        """
+        self.direction_due[rows] = tick + np.maximum(0, DIRECTION_CHANGE_TICKS - 1 - self.direction_count[rows])
+        
+    def move_along(self, rows : np.ndarray | slice) -> None:
+        """Move the given rows by their speed along their direction
+
+        Args:
+            rows (np.ndarray | slice): The rows to move
+        """
+        vectors = DIRECTION_VECTORS[self.direction[rows]]
+        speed = self.speed[rows]
+        self.x[rows] += vectors[:, 0] * speed
+        self.y[rows] += vectors[:, 1] * speed
+        
+    def step_by(self, rows : np.ndarray | slice, step_x : np.ndarray, step_y : np.ndarray) -> None:
+        """Move the given rows by their speed along a step (e.g. read from a `WaterField`)
+
+        Args:
+            rows (np.ndarray | slice): The rows to move
+            step_x (np.ndarray): The x step of every row (-1, 0 or 1)
+            step_y (np.ndarray): The y step of every row (-1, 0 or 1)
+        """
+        speed = self.speed[rows]
+        self.x[rows] += step_x * speed
+        self.y[rows] += step_y * speed
+        
+    def steer(self, rows : np.ndarray | slice, target_x : np.ndarray, target_y : np.ndarray) -> None:
+        """Move the given rows toward their target, one step of their speed along the line to it
+
+        Args:
+            rows (np.ndarray | slice): The rows to move
+            target_x (np.ndarray): The x of the target of every row
+            target_y (np.ndarray): The y of the target of every row
+        """
+        center_x, center_y = self.centers(rows)
+        dx, dy = target_x - center_x, target_y - center_y
+        dist = np.hypot(dx, dy)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dx = np.where(dist > 0, dx / dist, 0)
+            dy = np.where(dist > 0, dy / dist, 0)
+            
+        speed = self.speed[rows]
+        step_x = np.rint(dx * speed).astype(np.int64)
+        step_y = np.rint(dy * speed).astype(np.int64)
+        self.x[rows] += np.where(step_x >= 1, step_x, -1)
+        self.y[rows] += np.where(step_y >= 1, step_y, -1)
@@ -0,0 +1,105 @@
+import numpy as np
+
+from .jit_kernels import jit, NUMBA_AVAILABLE
+
+
+@jit
+def insertion_sort(order : np.ndarray, keys : np.ndarray) -> None:
+    """Sort rows by their key in place, equal keys keep their order. Each row moves back as far as it is out of order,
+    so a list that was sorted on the previous tick is sorted again in about one pass
+
+    Args:
+        order (np.ndarray): The rows, in their previous order
+        keys (np.ndarray): The key of every row
+    """
+    for index in range(1, len(order)):
+        row = order[index]
+        key = keys[row]
+        position = index - 1
+        while position >= 0 and keys[order[position]] > key:
+            order[position + 1] = order[position]
+            position -= 1
+        order[position + 1] = row
+
+
+BAND_STRIDE = 1 << 32
+
+
+def expand(starts : np.ndarray, ends : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Turn ranges of positions into pairs
+
+    Args:
+        starts (np.ndarray): The first position of the range of every position
+        ends (np.ndarray): The end (excluded) of the range of every position
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Every position repeated once per position of its range, and the positions of the ranges
+    """
+    counts = np.maximum(ends - starts, 0)
+    first = np.repeat(np.arange(len(starts)), counts)
+    return first, np.repeat(starts, counts) + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+class SweepAndPrune:
+    def __init__(self) -> None:
+        """Broad phase finding the pairs of overlapping boxes without testing every pair. The boxes are cut into horizontal bands
+        as high as the highest box and sorted by band then by left side, a box is only tested against the boxes of its band
+        starting before its right side, and against the boxes of the next band around it.
+        The order of the rows is kept between calls and sorted again from there, since the animals only move a few pixels per tick.
+        With Numba the order is fixed by an insertion sort, else by the stable sort of NumPy which also runs in about one pass on almost sorted keys
+        """
+        self.order = np.zeros(0, dtype=np.int64)
+
+    def sort(self, keys : np.ndarray) -> np.ndarray:
+        """Update the order of the rows by their key. The rows are the ones of a `Population`:
+        a removed row is replaced by the last one, so the kept order only loses the rows past the end and gains the new rows
+
+        Args:
+            keys (np.ndarray): The key of every row
+
+        Returns:
+            np.ndarray: The rows sorted by their key
+        """
+        count = len(keys)
+        order = self.order
+        if len(order) > count:
+            order = order[order < count]
+        if len(order) < count:
+            order = np.concatenate((order, np.arange(len(order), count, dtype=np.int64)))
+
+        if NUMBA_AVAILABLE:
+            insertion_sort(order, keys)
+        else:
+            order = order[np.argsort(keys[order], kind="stable")]
+        self.order = order
+        return order
+
+    def pairs(self, x : np.ndarray, y : np.ndarray, width : np.ndarray, height : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Find every pair of overlapping boxes, like `Rect.colliderect` boxes only touching by a side do not overlap.
+        The positions have to stay between -2**31 and 2**31
+
+        Args:
+            x (np.ndarray): The left of every box
+            y (np.ndarray): The top of every box
+            width (np.ndarray): The width of every box
+            height (np.ndarray): The height of every box
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The two rows of every pair, each pair is found once
+        """
+        if len(x) < 2:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        keys = y // max(1, int(height.max())) * BAND_STRIDE + x
+        order = self.sort(keys)
+        sorted_keys, widths = keys[order], width[order]
+        positions = np.arange(len(order))
+
+        same_band = expand(positions + 1, np.searchsorted(sorted_keys, sorted_keys + widths, side="left"))
+        next_band = expand(np.searchsorted(sorted_keys, sorted_keys + BAND_STRIDE - int(width.max()) + 1, side="left"),
+                           np.searchsorted(sorted_keys, sorted_keys + BAND_STRIDE + widths, side="left"))
+        first = order[np.concatenate((same_band[0], next_band[0]))]
+        second = order[np.concatenate((same_band[1], next_band[1]))]
+
+        overlapping = ((x[first] < x[second] + width[second]) & (x[second] < x[first] + width[first])
+                       & (y[first] < y[second] + height[second]) & (y[second] < y[first] + height[first]))
+        return first[overlapping], second[overlapping]
@@ -1,7 +1,9 @@
 from typing import Any
-import pygame as py
 
-from foods import Food
+from foods import Food, Foods
+from geometry import Rect
+
+VISION_COLOR = (255, 0, 0)
 
 class Vision:
     def __init__(self, x : int, y : int, width : int, height : int):
@@ -10,19 +12,11 @@ class Vision:
         self.width = width
         self.height = height
         
-        self.rect = py.Rect(self.x, self.y, self.width, self.height)
+        self.rect = Rect(self.x, self.y, self.width, self.height)
         
         self.visible_foods : list[Food] = []
         
-    def update(self, screen : py.surface.Surface) -> None:
-        self.create(screen)
-        self.update_rect(self.rect)
-        self.draw_visible_foods_lines(screen)
-        
-    def create(self, screen : py.surface.Surface) -> py.rect.Rect:
-        return py.draw.rect(screen, (255, 0, 0), self.rect, 1)
-        
-    def update_rect(self, animal_rect : py.rect.Rect) -> None:
+    def update_rect(self, animal_rect : Rect) -> None:
         self.rect.x = animal_rect.centerx - self.width // 2
         self.rect.y = animal_rect.centery - self.height // 2
         
@@ -35,7 +29,14 @@ class Vision:
             if self.is_food_visible(food):
                 visible_foods.append(food)
         return visible_foods
+    
+    def query_visible_foods(self, foods : Foods) -> list[Food] | list[Any]:
+        """Get the visible foods, only the foods in the grid cells overlapping the vision are checked
+
+        Args:
+            foods (Foods): All the foods in the game
 
-    def draw_visible_foods_lines(self, screen : py.surface.Surface) -> None:
-        for food in self.visible_foods:
-            py.draw.line(screen, (255, 255, 255), self.rect.center, food.rect.center, 1)
\ No newline at end of file
+        Returns:
+            list[Food] | list[Any]: The visible foods
+        """
+        return self.check_visible_foods(foods.query(self.rect))
\ No newline at end of file
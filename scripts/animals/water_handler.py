@@ -0,0 +1,55 @@
+from water import Water
+
+
+class AnimalWaterHandler:
+    def __init__(self,
+                 max_water_storage : int = 100,
+                 water_removing_quantity : int = 1,
+                 water_removing_cooldown : int = 60,
+                 thirst_threshold : int = 50,
+                 drinking_quantity : int = 5) -> None:
+        """Class used to handle the water storage of an animal, like `AnimalFoodHandler` does for the food
+
+        Args:
+            max_water_storage (int, optional): The maximum amount of water the animal can store. Defaults to 100.
+            water_removing_quantity (int, optional): The amount of water removed every cooldown. Defaults to 1.
+            water_removing_cooldown (int, optional): The number of ticks between two water removals. Defaults to 60.
+            thirst_threshold (int, optional): The amount of water under which the animal is thirsty. Defaults to 50.
+            drinking_quantity (int, optional): The amount of water drunk per tick spent in the water. Defaults to 5.
+        """
+        self.max_water_storage = max_water_storage
+        self.water_storage = max_water_storage
+        self.water_removing_quantity = water_removing_quantity
+        self.water_removing_cooldown = water_removing_cooldown
+        self.water_removing_count = 0
+        self.thirst_threshold = thirst_threshold
+        self.drinking_quantity = drinking_quantity
+        
+    def is_thirsty(self) -> bool:
+        """Check if the animal is thirsty
+
+        Returns:
+            bool: True if the animal is thirsty, False otherwise
+        """
+        return self.water_storage <= self.thirst_threshold
+    
+    def drink(self, water : Water) -> int:
+        """Drink from the water, the water storage can't go over the max water storage
+
+        Args:
+            water (Water): The water to drink from
+
+        Returns:
+            int: The amount of water drunk
+        """
+        amount = max(0, min(self.drinking_quantity, self.max_water_storage - self.water_storage, water.quantity))
+        if amount > 0:
+            water.decrease_quantity(amount)
+            self.water_storage += amount
+        return amount
+    
+    def remove_water_from_storage(self) -> None:
+        """Remove `water_removing_quantity` from the storage and restart the cooldown, called by the thirst timers of `Animals`
+        """
+        self.water_removing_count = 0
+        self.water_storage = max(0, self.water_storage - self.water_removing_quantity)
@@ -0,0 +1,214 @@
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pygame as py
+
+from main import MAX_WINDOW_SIZE
+from simulation import Simulation, Settings
+
+PRESETS = {
+    "quick": [(10, 100), (100, 1_000), (1_000, 10_000)],
+    "full": [(10, 100), (100, 1_000), (1_000, 10_000), (10_000, 100_000), (100_000, 1_000_000)],
+}
+MODES = ("headless", "offscreen")
+SEED = 1234
+SAMPLE_ANIMALS = 1_000
+
+
+class Scenario:
+    def __init__(self, animals : int, foods : int, mode : str, ticks : int, time_budget : float) -> None:
+        """Class used to describe one seeded benchmark world
+
+        Args:
+            animals (int): The number of animals
+            foods (int): The number of foods
+            mode (str): "headless" to only step the world, "offscreen" to also draw it with the game renderer in a hidden window
+            ticks (int): The maximum number of measured ticks
+            time_budget (float): The number of seconds after which the measure stops, at least 3 ticks are measured
+        """
+        self.animals = animals
+        self.foods = foods
+        self.mode = mode
+        self.ticks = ticks
+        self.time_budget = time_budget
+
+    @property
+    def name(self) -> str:
+        return f"animals={self.animals},foods={self.foods},{self.mode}"
+
+    @property
+    def world_size(self) -> int:
+        """The world grows with the number of foods so the density stays close to the default world
+
+        Returns:
+            int: The width and height of the world
+        """
+        return max(800, int(math.sqrt(self.foods) * 25))
+
+
+def timed(phases : dict[str, list[float]], name : str, function, *args) -> object:
+    """Call a function and add its duration to a phase
+
+    Args:
+        phases (dict[str, list[float]]): The durations of every phase
+        name (str): The name of the phase
+        function (Callable): The function to call
+
+    Returns:
+        object: The value returned by the function
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    phases.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+
+def run_scenario(scenario : Scenario) -> dict:
+    """Build the world of a scenario and measure it, meant to run in its own process so the peak memory is its own.
+    The offscreen scenarios draw every tick in a window of the size `main.py` would open, with the renderer the game picks for the world
+
+    Args:
+        scenario (Scenario): The scenario to run
+
+    Returns:
+        dict: The ticks per second, the milliseconds per tick of every phase and the peak memory
+    """
+    size = scenario.world_size
+    simulation = Simulation(size, size, SEED, Settings(animal_count=scenario.animals, food_count=scenario.foods))
+    game = None
+    if scenario.mode == "offscreen":
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from game import Game, Screen
+        game = Game(Screen(min(size, MAX_WINDOW_SIZE[0]), min(size, MAX_WINDOW_SIZE[1])), simulation=simulation)
+    phases : dict[str, list[float]] = {}
+
+    # hot paths measured on their own on a sample of animals, before the world starts moving
+    sample = simulation.animals.animals[:SAMPLE_ANIMALS]
+    for animal in sample:
+        animal.vision.update_rect(animal.rect)
+    visible = timed(phases, "vision.query_visible_foods", lambda: [animal.vision.query_visible_foods(simulation.foods) for animal in sample])
+    timed(phases, "animal.get_closest_food", lambda: [animal.get_closest_food(foods) for animal, foods in zip(sample, visible) if foods])
+    timed(phases, "animals.acquire_targets", simulation.animals.acquire_targets, list(sample), simulation.foods)
+    for animal in sample:
+        animal.targeted_food = None
+
+    # the "simulation.step" phase of the simulation profiler only keeps the part of `Animals.step` outside its own phases,
+    # the whole of `Animals.step` is kept as the "animals.step" phase
+    simulation.step()
+    simulation.profiler.enable()
+    ticks = 0
+    start = time.perf_counter()
+    while ticks < scenario.ticks and (ticks < 3 or time.perf_counter() - start < scenario.time_budget):
+        timed(phases, "simulation.step", simulation.step)
+        phases.setdefault("animals.step", []).append(sum(duration for name, duration in simulation.profiler.tick_totals.items()
+                                                         if name == "simulation.step" or name.startswith("animals.")))
+        simulation.profiler.end_tick(simulation.tick)
+        if game is not None:
+            timed(phases, "render", game.renderer.render, simulation.water, simulation.animals, simulation.foods)
+        ticks += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": ticks,
+        "ticks_per_second": ticks / elapsed,
+        "phases_ms": {name: 1000 * sum(durations) / len(durations) for name, durations in phases.items()},
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_suite(scenarios : list[Scenario]) -> dict:
+    """Run every scenario, one fresh process per scenario and one scenario at a time
+
+    Args:
+        scenarios (list[Scenario]): The scenarios to run
+
+    Returns:
+        dict: The environment and the result of every scenario
+    """
+    results = {}
+    for scenario in scenarios:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[scenario.name] = executor.submit(run_scenario, scenario).result()
+        result = results[scenario.name]
+        print(f"{scenario.name:<45} {result['ticks_per_second']:>10.1f} ticks/s {result['peak_memory_mb']:>9.1f} MB", flush=True)
+    return {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "pygame": py.version.ver, "machine": platform.machine()},
+        "results": results,
+    }
+
+
+def compare(baseline : dict, current : dict, threshold : float) -> list[str]:
+    """Compare two suite results, a metric getting worse by more than `threshold` is a regression
+
+    Args:
+        baseline (dict): The saved results
+        current (dict): The new results
+        threshold (float): The allowed relative change (0.1 = 10%)
+
+    Returns:
+        list[str]: One line per regression
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<45} not in the baseline")
+            continue
+
+        # (metric, old, new, True when bigger is better)
+        metrics = [("ticks_per_second", reference["ticks_per_second"], result["ticks_per_second"], True),
+                   ("peak_memory_mb", reference["peak_memory_mb"], result["peak_memory_mb"], False)]
+        metrics += [(f"phases_ms.{phase}", reference["phases_ms"][phase], value, False)
+                    for phase, value in result["phases_ms"].items() if phase in reference["phases_ms"]]
+
+        for metric, old, new, bigger_is_better in metrics:
+            change = (new - old) / old if old else 0.0
+            worse = -change if bigger_is_better else change
+            flag = "REGRESSION" if worse > threshold else ""
+            print(f"{name:<45} {metric:<38} {old:>12.3f} -> {new:>12.3f} {change:>+8.1%} {flag}")
+            if flag:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the simulation hot paths")
+    parser.add_argument("--preset", choices=PRESETS, default="quick", help="the world sizes to run")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="headless, offscreen or both")
+    parser.add_argument("--ticks", type=int, default=100, help="maximum number of measured ticks per scenario")
+    parser.add_argument("--time-budget", type=float, default=2.0, help="seconds after which a scenario stops measuring")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", default=None, help="diff the results against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change flagged as a regression")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    scenarios = [Scenario(animals, foods, mode, args.ticks, args.time_budget) for animals, foods in PRESETS[args.preset] for mode in args.modes]
+    current = run_suite(scenarios)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            sys.exit(1)
@@ -0,0 +1,238 @@
+from typing import Callable, Generic, Iterator, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Handle(NamedTuple):
+    """Stable reference to an entity of an `EntityPool`, it becomes stale when the entity is removed,
+    even if its slot is reused by another entity
+    """
+    slot : int
+    generation : int
+
+
+class LazyItems(list):
+    def __init__(self, count : int, create : Callable[[int, int], object]) -> None:
+        """Dense list of an `EntityPool` whose entities are only created when they are first read, by index or by iterating.
+        An entity not created yet is stored as its key, an int, and `create(key, position)` builds it at its current position.
+        `swap_remove` moves the key of an entity not created yet instead of creating it, and `in` only compares the created entities,
+        since an entity not created yet cannot be held anywhere else
+
+        Args:
+            count (int): The number of entities, their keys are 0 to count - 1
+            create (Callable[[int, int], object]): Builds the entity of a key at a position of the list
+        """
+        super().__init__(range(count))
+        self.create = create
+        self.missing = count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        item = list.__getitem__(self, index)
+        if type(item) is int:
+            position = index if index >= 0 else index + len(self)
+            item = self.create(item, position)
+            list.__setitem__(self, position, item)
+            self.missing -= 1
+        return item
+
+    def __iter__(self):
+        if not self.missing:
+            return list.__iter__(self)
+        return self.iterate()
+
+    def iterate(self):
+        """Create the entities while iterating, the list can grow or shrink during the iteration like a list
+        """
+        position = 0
+        while position < len(self):
+            yield self[position]
+            position += 1
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __contains__(self, item : object) -> bool:
+        return any(entity is item or entity == item for entity in list.__iter__(self) if type(entity) is not int)
+
+    def created(self, index : int) -> object | None:
+        """Get the entity at a position without creating it
+
+        Args:
+            index (int): The position of the entity
+
+        Returns:
+            object | None: The entity, None if it is not created yet
+        """
+        item = list.__getitem__(self, index)
+        return None if type(item) is int else item
+
+    def swap_remove(self, index : int) -> None:
+        """Remove an entry by moving the last entry into its place, without creating either of them
+
+        Args:
+            index (int): The position of the entry to remove
+        """
+        if type(list.__getitem__(self, index)) is int:
+            self.missing -= 1
+        last = list.pop(self)
+        if index < len(self):
+            list.__setitem__(self, index, last)
+
+
+class EntityPool(Generic[T]):
+    def __init__(self) -> None:
+        """Class used to store entities in a dense list that can be iterated quickly, while giving them stable handles.
+        Removing an entity moves the last one into its place (O(1)), the slots of removed entities are reused through a free list
+        and their generation is increased so old handles do not resolve to the new entities
+        """
+        self.items : list[T] = []
+        self.item_slots : list[int] = []
+        self.slot_indexes : list[int] = []
+        self.generations : list[int] = []
+        self.free_slots : list[int] = []
+        self.pending : dict[Handle, None] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def add(self, item : T) -> Handle:
+        """Add an entity at the end of the dense list
+
+        Args:
+            item (T): The entity to add
+
+        Returns:
+            Handle: The handle of the entity
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.slot_indexes)
+            self.slot_indexes.append(-1)
+            self.generations.append(0)
+        self.slot_indexes[slot] = len(self.items)
+        self.items.append(item)
+        self.item_slots.append(slot)
+        return Handle(slot, self.generations[slot])
+
+    def extend(self, count : int, create : Callable[[int, int], T]) -> None:
+        """Fill an empty pool with entities that are only created when they are first read (see `LazyItems`),
+        e.g. restored from a snapshot. The entity of key k gets the slot k and its handle is `Handle(k, 0)`
+
+        Args:
+            count (int): The number of entities
+            create (Callable[[int, int], T]): Builds the entity of a key at a position of the dense list
+
+        Raises:
+            ValueError: If the pool is not empty
+        """
+        if self.slot_indexes:
+            raise ValueError("only an empty pool can be extended with entities created on access")
+        self.items = LazyItems(count, create) # type: ignore
+        self.item_slots = list(range(count))
+        self.slot_indexes = list(range(count))
+        self.generations = [0] * count
+
+    def index(self, handle : Handle) -> int:
+        """Get the position of an entity in the dense list
+
+        Args:
+            handle (Handle): The handle of the entity
+
+        Returns:
+            int: The position of the entity, -1 if the handle is stale
+        """
+        slot, generation = handle
+        if slot >= len(self.generations) or self.generations[slot] != generation:
+            return -1
+        return self.slot_indexes[slot]
+
+    def get(self, handle : Handle) -> T | None:
+        """Get the entity of a handle
+
+        Args:
+            handle (Handle): The handle of the entity
+
+        Returns:
+            T | None: The entity, None if the handle is stale
+        """
+        index = self.index(handle)
+        return self.items[index] if index >= 0 else None
+
+    def created(self, index : int) -> T | None:
+        """Get the entity at a position of the dense list if it exists already, without creating it (see `LazyItems`)
+
+        Args:
+            index (int): The position of the entity
+
+        Returns:
+            T | None: The entity, None if it is not created yet
+        """
+        if isinstance(self.items, LazyItems):
+            return self.items.created(index) # type: ignore
+        return self.items[index]
+
+    def handle(self, index : int) -> Handle:
+        """Get the handle of the entity at a position of the dense list
+
+        Args:
+            index (int): The position of the entity
+
+        Returns:
+            Handle: The handle of the entity
+        """
+        slot = self.item_slots[index]
+        return Handle(slot, self.generations[slot])
+
+    def remove(self, handle : Handle) -> int:
+        """Remove an entity now, the last entity of the dense list takes its position
+
+        Args:
+            handle (Handle): The handle of the entity
+
+        Returns:
+            int: The position the entity left, -1 if the handle was stale. If it is still inside the list, the last entity was moved there
+        """
+        index = self.index(handle)
+        if index < 0:
+            return -1
+        slot = handle.slot
+        last = len(self.items) - 1
+        if isinstance(self.items, LazyItems):
+            self.items.swap_remove(index)
+        else:
+            if index != last:
+                self.items[index] = self.items[last]
+            self.items.pop()
+        if index != last:
+            self.item_slots[index] = self.item_slots[last]
+            self.slot_indexes[self.item_slots[index]] = index
+        self.item_slots.pop()
+
+        self.slot_indexes[slot] = -1
+        self.generations[slot] += 1
+        self.free_slots.append(slot)
+        return index
+
+    def despawn(self, handle : Handle) -> None:
+        """Queue an entity to be removed by `take_despawns`, the entity stays in the pool until then
+
+        Args:
+            handle (Handle): The handle of the entity
+        """
+        self.pending[handle] = None
+
+    def take_despawns(self) -> list[Handle]:
+        """Get the queued despawns and clear the queue
+
+        Returns:
+            list[Handle]: The handles, in the order they were queued
+        """
+        handles = list(self.pending)
+        self.pending.clear()
+        return handles
@@ -0,0 +1,194 @@
+import json
+import threading
+
+from collections import deque
+from fractions import Fraction
+
+import numpy as np
+
+FIELDS = {
+    "eat": ("animal", "food", "eaten"),
+    "target": ("animal", "food"),
+    "starve": ("animal", "life"),
+    "death": ("animal", "life"),
+    "food_depleted": ("food", "x", "y"),
+    "hunt": ("predator", "prey", "stored"),
+}
+CATEGORIES = tuple(FIELDS)
+RECORD_WIDTH = 5
+
+
+class EventLog:
+    def __init__(self, capacity : int = 65536, batch : int = 4096, interval : float = 0.5) -> None:
+        """Class used to log what happens to the animals and the foods as structured events, every category is off until `enable` is called.
+        Callers check `on[category]` before calling `emit`, so a category that is off costs one dict lookup.
+        The events are kept in a ring buffer, the oldest are dropped when it is full. Once a file is opened,
+        a background thread writes them by batches of at most `batch` events, every `interval` seconds or as soon as a batch is full.
+        Animals and foods are identified by the slot of their handle, a slot is reused after the death or the removal of its entity
+
+        Args:
+            capacity (int, optional): The number of events kept in memory. Defaults to 65536.
+            batch (int, optional): The number of events that wakes the writer up. Defaults to 4096.
+            interval (float, optional): The longest time between two writes, in seconds. Defaults to 0.5.
+        """
+        self.capacity = capacity
+        self.batch = batch
+        self.interval = interval
+        self.tick = 0
+        self.on = {category: False for category in CATEGORIES}
+        self.rates = {category: Fraction(0) for category in CATEGORIES}
+        self.seen = {category: 0 for category in CATEGORIES}
+        self.buffer : deque[tuple] = deque(maxlen=capacity)
+        self.dropped = 0
+        self.written = 0
+
+        self.file = None
+        self.binary = False
+        self.wake = threading.Event()
+        self.closing = False
+        self.writer : threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def enable(self, category : str, rate : float = 1.0) -> None:
+        """Log a category, keeping a fraction of its events. An event is kept whenever `seen * rate` reaches a new integer,
+        `seen` being the number of events of the category so far, e.g. 2 events out of 5 with a rate of 0.4.
+        It does not draw random numbers so a seeded run stays the same whether it is logged or not
+
+        Args:
+            category (str): The category, one of `CATEGORIES`
+            rate (float, optional): The fraction of the events kept, between 0 (excluded) and 1. Defaults to 1.0.
+
+        Raises:
+            ValueError: If the category is unknown or the rate is not in (0, 1]
+        """
+        if category not in FIELDS:
+            raise ValueError(f"unknown event category {category!r}, expected one of {', '.join(CATEGORIES)}")
+        if not 0 < rate <= 1:
+            raise ValueError(f"the rate of {category!r} must be in (0, 1], got {rate}")
+        self.rates[category] = Fraction(rate).limit_denominator(1 << 20)
+        self.on[category] = True
+        self.seen[category] = 0
+
+    def disable(self, category : str) -> None:
+        """Stop logging a category
+
+        Args:
+            category (str): The category, one of `CATEGORIES`
+        """
+        if category not in FIELDS:
+            raise ValueError(f"unknown event category {category!r}, expected one of {', '.join(CATEGORIES)}")
+        self.rates[category] = Fraction(0)
+        self.on[category] = False
+        self.seen[category] = 0
+
+    def emit(self, category : str, *values : int) -> None:
+        """Store an event of the current tick if it is kept by the sampling of its category
+
+        Args:
+            category (str): The category, one of `CATEGORIES`
+            values (int): The values of the fields of the category, in the order of `FIELDS`
+        """
+        rate = self.rates[category]
+        if not rate:
+            return
+        seen = self.seen[category] = self.seen[category] + 1
+        if seen * rate.numerator // rate.denominator == (seen - 1) * rate.numerator // rate.denominator:
+            return
+        if len(self.buffer) == self.capacity:
+            self.dropped += 1
+        self.buffer.append((self.tick, category, *values))
+        if self.writer is not None and len(self.buffer) >= self.batch:
+            self.wake.set()
+
+    def recent(self, category : str | None = None) -> list[dict[str, int | str]]:
+        """Get the events still in the buffer, from the oldest to the newest
+
+        Args:
+            category (str | None, optional): Only keep the events of this category. Defaults to None.
+
+        Returns:
+            list[dict[str, int | str]]: The events
+        """
+        return [to_dict(record) for record in list(self.buffer) if category is None or record[1] == category]
+
+    def open(self, path : str) -> None:
+        """Write the events to a file from a background thread, as raw little-endian int64 rows of
+        (tick, category index, values...) if the path ends with .bin, else as JSON lines. See `read_events`
+
+        Args:
+            path (str): The path of the file
+        """
+        self.close()
+        self.binary = path.endswith(".bin")
+        self.file = open(path, "wb" if self.binary else "w")
+        self.closing = False
+        self.writer = threading.Thread(target=self.write_loop, name="event-log", daemon=True)
+        self.writer.start()
+
+    def write_loop(self) -> None:
+        """Body of the writer thread, it empties the buffer until the log is closed
+        """
+        while not self.closing:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.write_batch()
+        self.write_batch()
+
+    def write_batch(self) -> None:
+        """Write the events of the buffer to the file, the simulation can keep appending while they are written
+        """
+        while self.buffer:
+            records = [self.buffer.popleft() for _ in range(min(len(self.buffer), self.batch))]
+            if self.binary:
+                rows = [(tick, CATEGORIES.index(category), *values, *(0,) * (RECORD_WIDTH - 2 - len(values)))
+                        for tick, category, *values in records]
+                np.array(rows, dtype="<i8").tofile(self.file)
+            else:
+                self.file.write("".join(json.dumps(to_dict(record)) + "\n" for record in records)) # type: ignore
+            self.written += len(records)
+
+    def close(self) -> None:
+        """Write the events left in the buffer and close the file
+        """
+        if self.writer is not None:
+            self.closing = True
+            self.wake.set()
+            self.writer.join()
+            self.writer = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def to_dict(record : tuple) -> dict[str, int | str]:
+    """Name the values of an event
+
+    Args:
+        record (tuple): The event, (tick, category, values...)
+
+    Returns:
+        dict[str, int | str]: The event with its tick, its category and its named fields
+    """
+    tick, category, *values = record
+    return {"tick": tick, "event": category, **dict(zip(FIELDS[category], values))}
+
+
+def read_events(path : str) -> list[dict[str, int | str]]:
+    """Read the events written by `EventLog.open`, in the binary or the JSON-lines format
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        list[dict[str, int | str]]: The events
+    """
+    if path.endswith(".bin"):
+        rows = np.fromfile(path, dtype="<i8").reshape(-1, RECORD_WIDTH).tolist()
+        return [to_dict((tick, CATEGORIES[code], *values[:len(FIELDS[CATEGORIES[code]])])) for tick, code, *values in rows]
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+NULL_EVENT_LOG = EventLog(capacity=0)
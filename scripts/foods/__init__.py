@@ -1,2 +1,3 @@
 from .food import Food
-from .foods import Foods
\ No newline at end of file
+from .foods import Foods
+from .food_field import FoodField
\ No newline at end of file
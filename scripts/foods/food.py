@@ -1,5 +1,4 @@
-import pygame as py
-
+from geometry import Rect
 
 
 class Food:
@@ -19,8 +18,10 @@ class Food:
         self.y = y
         self.quantity = quantity
 
-        self.rect = py.Rect(self.x, self.y, self.size, self.size)
         self.size_limit = 2
+        self.rect = Rect(self.x, self.y, self.set_size(), self.set_size())
+        
+        self.handle = None
         
     def set_size(self) -> int:
         """Return the size of the food based on its quantity
@@ -32,16 +33,6 @@ class Food:
             return self.size_limit
         return self.size * (self.quantity // 10)
     
-    def create(self, screen : py.surface.Surface) -> None:
-        """Draw the food on the screen
-
-        Args:
-            screen (py.surface.Surface): The screen where the food will be drawn
-        """
-        size = self.set_size()
-        self.rect = py.Rect(self.x, self.y, size, size)
-        py.draw.rect(screen, self.color, self.rect, border_radius=90)
-        
     def remove_quantity(self, amount : int) -> None:
         """Remove quantity to the food
 
@@ -49,6 +40,7 @@ class Food:
             amount (int): The amount of quantity to remove
         """
         self.quantity -= amount
+        self.rect.size = (self.set_size(), self.set_size())
         
     def is_completely_eaten(self) -> bool:
         """Check if the food is completely eaten (quantity <= 0)
@@ -0,0 +1,291 @@
+import numpy as np
+
+from .food import Food
+from .food_locator import FoodLocator
+from entity_pool import Handle
+from random_streams import RandomStream, UNSEEDED
+from geometry import Rect
+
+
+class FoodCell:
+    def __init__(self, field : "FoodField", cell : int) -> None:
+        """View on one cell of a `FoodField` that behaves like a `Food`, so the animals can target and eat it
+
+        Args:
+            field (FoodField): The field holding the cell
+            cell (int): The flat index of the cell (column * rows + row)
+        """
+        self.field = field
+        self.column, self.row = divmod(cell, field.rows)
+        self.size = field.cell_size
+        self.color = field.color
+        self.x = self.column * self.size
+        self.y = self.row * self.size
+        self.rect = Rect(self.x, self.y, self.size, self.size)
+        self.handle = Handle(cell, 0)
+
+    @property
+    def quantity(self) -> int:
+        return int(self.field.quantity[self.column, self.row])
+
+    def remove_quantity(self, amount : int) -> None:
+        """Remove quantity from the cell
+
+        Args:
+            amount (int): The amount of quantity to remove
+        """
+        self.field.consume(self.column, self.row, amount)
+
+    def is_completely_eaten(self) -> bool:
+        return self.quantity <= 0
+
+
+class FoodField:
+    def __init__(self,
+                 width : int,
+                 height : int,
+                 color : tuple[int, int, int],
+                 cell_size : int = 8,
+                 capacity : int = 30,
+                 regrowth : float = 0.02,
+                 diffusion : float = 0.05) -> None:
+        """Class used to store the food as a raster of quantities (one value per cell) instead of one `Food` per item,
+        the cost of a tick only depends on the size of the world. It can be used everywhere `Foods` is used,
+        the cells are handed out as `FoodCell` views and are never removed, an eaten cell grows back from its neighbours.
+        The quantity left is kept in `total` by every change, and counted again by `step` which already goes over every cell.
+        The cells holding food are listed by the same pass, `len`, `foods` and `locator` only read that list
+
+        Args:
+            width (int): The world width
+            height (int): The world height
+            color (tuple[int, int, int]): The RGB color of the food
+            cell_size (int, optional): The width and height of a cell. Defaults to 8.
+            capacity (int, optional): The maximum quantity of a cell. Defaults to 30.
+            regrowth (float, optional): The logistic growth rate of a cell per tick. Defaults to 0.02.
+            diffusion (float, optional): The part of the difference with the neighbours spreading per tick, at most 0.25. Defaults to 0.05.
+        """
+        self.cell_size = cell_size
+        self.columns = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.color = color
+        self.capacity = capacity
+        self.regrowth = regrowth
+        self.diffusion = diffusion
+
+        # indexed (column, row) like `pygame.surfarray`
+        self.quantity = np.zeros((self.columns, self.rows), dtype=np.float32)
+        self.total = 0.0
+        # flat indexes of the cells holding food at the last count, sorted, plus the ones filled since, the emptied ones are left out when it is read
+        self.occupied = np.empty(0, dtype=np.int64)
+        self.emptied = False
+        self.located = np.empty(0, dtype=np.int64)
+
+        self.track_changes = False
+        self.changed_rects : list[Rect] = []
+
+    def __len__(self) -> int:
+        return len(self.occupied_cells())
+
+    @property
+    def foods(self) -> list[FoodCell]:
+        """The cells holding food as `FoodCell` views, slow on big worlds, only meant for tools iterating the foods
+
+        Returns:
+            list[FoodCell]: The cells
+        """
+        return [FoodCell(self, cell) for cell in self.occupied_cells().tolist()]
+
+    def occupied_cells(self) -> np.ndarray:
+        """Get the cells holding food from the list kept by `recount`, the cells emptied since are removed from it first
+
+        Returns:
+            np.ndarray: The flat indexes of the cells (column * rows + row), sorted
+        """
+        if self.emptied:
+            self.occupied = self.occupied[self.quantity.ravel()[self.occupied] >= 1]
+            self.emptied = False
+        return self.occupied
+
+    def cell_of(self, x : int, y : int) -> tuple[int, int]:
+        """Get the cell containing a position, positions outside the world are moved to the closest cell
+
+        Args:
+            x (int): The x position
+            y (int): The y position
+
+        Returns:
+            tuple[int, int]: The column and row of the cell
+        """
+        return min(max(x // self.cell_size, 0), self.columns - 1), min(max(y // self.cell_size, 0), self.rows - 1)
+
+    def deposit(self, x : int, y : int, amount : float) -> None:
+        """Add food in the cell containing a position, without going over the capacity
+
+        Args:
+            x (int): The x position
+            y (int): The y position
+            amount (float): The quantity to add
+        """
+        column, row = self.cell_of(x, y)
+        previous = float(self.quantity[column, row])
+        self.quantity[column, row] = min(self.capacity, previous + amount)
+        self.total += float(self.quantity[column, row]) - previous
+        if previous < 1 <= self.quantity[column, row]:
+            cell = column * self.rows + row
+            position = int(np.searchsorted(self.occupied, cell))
+            if position == len(self.occupied) or self.occupied[position] != cell:
+                self.occupied = np.insert(self.occupied, position, cell)
+
+    def consume(self, column : int, row : int, amount : float) -> None:
+        """Remove food from a cell
+
+        Args:
+            column (int): The column of the cell
+            row (int): The row of the cell
+            amount (float): The quantity to remove
+        """
+        previous = float(self.quantity[column, row])
+        self.quantity[column, row] = max(0.0, previous - amount)
+        self.total += float(self.quantity[column, row]) - previous
+        self.emptied |= bool(self.quantity[column, row] < 1 <= previous)
+
+    def fill(self, quantity : float) -> None:
+        """Set every cell to the same quantity
+
+        Args:
+            quantity (float): The quantity of every cell
+        """
+        self.quantity[:] = min(quantity, self.capacity)
+        self.recount()
+
+    def add_food(self, food : Food) -> None:
+        """Add the quantity of a food to the cell under its center
+
+        Args:
+            food (Food): The food to add
+        """
+        self.deposit(*food.rect.center, food.quantity)
+
+    def scatter_foods(self,
+                      width : int,
+                      height : int,
+                      amount : int,
+                      size : int,
+                      color : tuple[int, int, int],
+                      quantity : int = 30,
+                      rng : RandomStream = UNSEEDED.stream("foods")) -> None:
+        """Add food at random positions, the same positions `Foods.scatter_foods` would use
+
+        Args:
+            width (int): The world width
+            height (int): The world height
+            amount (int): The amount of foods to add
+            size (int): The size of the foods
+            color (tuple[int, int, int]): The color of the foods
+            quantity (int, optional): The quantity of every food. Defaults to 30.
+            rng (RandomStream, optional): The stream the positions are drawn from. Defaults to an unseeded stream.
+        """
+        xs = rng.integers(0, width - 49, amount).tolist()
+        ys = rng.integers(0, height - 49, amount).tolist()
+        for x, y in zip(xs, ys):
+            self.deposit(x + size // 2, y + size // 2, quantity)
+
+    def remove_food(self, food : FoodCell) -> None:
+        """Empty a cell
+
+        Args:
+            food (FoodCell): The cell to empty
+        """
+        self.total -= float(self.quantity[food.column, food.row])
+        self.quantity[food.column, food.row] = 0.0
+        self.emptied = True
+
+    def despawn_food(self, handle : Handle) -> None:
+        """Cells are never removed, an eaten cell only has to grow back
+        """
+
+    def apply_despawns(self) -> None:
+        """Cells are never removed, nothing is queued
+        """
+
+    def count_eaten(self, amount : int, food : FoodCell | None = None) -> None:
+        """The eaten quantities are already removed from the total by `consume`
+        """
+
+    def mark_changed(self, rect : Rect) -> None:
+        """The whole field is redrawn every frame, the changed areas are not kept
+        """
+
+    def step(self) -> None:
+        """Advance the field by one tick: the food spreads to the neighbour cells, then every cell grows back towards the capacity
+        """
+        quantity = self.quantity
+        padded = np.pad(quantity, 1, mode="edge")
+        quantity += self.diffusion * (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:] - 4 * quantity)
+        quantity += self.regrowth * quantity * (1 - quantity / self.capacity)
+        np.clip(quantity, 0, self.capacity, out=quantity)
+        self.recount()
+
+    def recount(self) -> None:
+        """Sum every cell again into `total` and list the cells holding food, e.g. after the quantities were written directly
+        """
+        self.total = float(self.quantity.sum(dtype=np.float64))
+        self.occupied = np.flatnonzero(self.quantity >= 1)
+        self.emptied = False
+
+    def total_quantity(self) -> int:
+        """Get the quantity of food left in the world, without walking the cells
+
+        Returns:
+            int: The sum of the quantities of every cell
+        """
+        return int(self.total)
+
+    def get(self, handle : Handle) -> FoodCell:
+        """Get the cell of a handle
+
+        Args:
+            handle (Handle): The handle of the cell
+
+        Returns:
+            FoodCell: The cell, cells are never removed
+        """
+        return FoodCell(self, handle.slot)
+
+    def handle(self, index : int) -> Handle:
+        """Get the handle of a cell found by the last `locator`
+
+        Args:
+            index (int): The index returned by the locator
+
+        Returns:
+            Handle: The handle of the cell
+        """
+        return Handle(int(self.located[index]), 0)
+
+    def query(self, rect : Rect) -> list[FoodCell]:
+        """Get the cells holding food that overlap the rect
+
+        Args:
+            rect (Rect): The area to look at
+
+        Returns:
+            list[FoodCell]: The cells
+        """
+        first_column, first_row = self.cell_of(rect.left, rect.top)
+        last_column, last_row = self.cell_of(rect.right - 1, rect.bottom - 1)
+        columns, rows = np.nonzero(self.quantity[first_column:last_column + 1, first_row:last_row + 1] >= 1)
+        return [FoodCell(self, (first_column + column) * self.rows + first_row + row) for column, row in zip(columns.tolist(), rows.tolist())]
+
+    def locator(self, cell_size : int = 64) -> FoodLocator:
+        """Build a snapshot of the cells holding food to find the closest cell of many animals at once
+
+        Args:
+            cell_size (int, optional): The cell size of the locator buckets. Defaults to 64.
+
+        Returns:
+            FoodLocator: The locator, its results are turned into handles with `handle`
+        """
+        self.located = self.occupied_cells()
+        half = self.cell_size // 2
+        return FoodLocator(self.located // self.rows * self.cell_size + half, self.located % self.rows * self.cell_size + half, cell_size)
@@ -0,0 +1,75 @@
+import numpy as np
+
+from geometry import PointGrid, contains_points
+
+
+class FoodLocator(PointGrid):
+    """Food centers bucketed by grid cell, to answer the closest food queries of many animals in a single vectorized pass.
+    It is built from the centers, e.g. `FoodLocator(center_x, center_y)`, its results are indexes in the center arrays.
+    `Foods` keeps its locator up to date between the ticks instead of building a new one (see `PointGrid.insert`),
+    the points in `hidden` are left out of the results
+    """
+    hidden = np.empty(0, dtype=np.int64)
+
+    def closest(self, 
+                x : np.ndarray,
+                y : np.ndarray,
+                left : np.ndarray,
+                top : np.ndarray,
+                width : np.ndarray,
+                height : np.ndarray) -> np.ndarray:
+        """Get the closest food whose center is inside the box of every searcher, like `Vision.is_food_visible`
+        and `Animal.get_closest_food` would, ties are won by the first food of the list
+
+        Args:
+            x (np.ndarray): The x of every searcher
+            y (np.ndarray): The y of every searcher
+            left (np.ndarray): The left of the box of every searcher
+            top (np.ndarray): The top of the box of every searcher
+            width (np.ndarray): The width of the box of every searcher
+            height (np.ndarray): The height of the box of every searcher
+
+        Returns:
+            np.ndarray: The index of the closest food of every searcher, -1 when no food is visible
+        """
+        searchers = len(x)
+        closest = np.full(searchers, -1, dtype=np.int64)
+        if searchers == 0 or len(self.order) == 0:
+            return closest
+        
+        first_column, last_column = left // self.cell_size, (left + width - 1) // self.cell_size
+        first_row, last_row = top // self.cell_size, (top + height - 1) // self.cell_size
+        columns = last_column - first_column + 1
+        rows = last_row - first_row + 1
+        
+        # one entry per (searcher, cell) overlapping its box
+        cells_per_searcher = columns * rows
+        searcher_of_cell = np.repeat(np.arange(searchers), cells_per_searcher)
+        offset = np.arange(len(searcher_of_cell)) - np.repeat(np.cumsum(cells_per_searcher) - cells_per_searcher, cells_per_searcher)
+        cell_keys = self.cell_keys(first_column[searcher_of_cell] + offset // rows[searcher_of_cell],
+                                   first_row[searcher_of_cell] + offset % rows[searcher_of_cell])
+        
+        position = np.minimum(np.searchsorted(self.cell_keys_sorted, cell_keys), len(self.cell_keys_sorted) - 1)
+        found = self.cell_keys_sorted[position] == cell_keys
+        searcher_of_cell = searcher_of_cell[found]
+        starts = self.cell_starts[position[found]]
+        counts = self.cell_counts[position[found]]
+        
+        # one entry per (searcher, food) in those cells
+        searcher_of_pair = np.repeat(searcher_of_cell, counts)
+        offset = np.arange(len(searcher_of_pair)) - np.repeat(np.cumsum(counts) - counts, counts)
+        food_of_pair = self.order[np.repeat(starts, counts) + offset]
+        
+        visible = contains_points(left[searcher_of_pair], top[searcher_of_pair], width[searcher_of_pair], height[searcher_of_pair],
+                                  self.x[food_of_pair], self.y[food_of_pair])
+        if len(self.hidden):
+            visible &= ~np.isin(food_of_pair, self.hidden)
+        searcher_of_pair, food_of_pair = searcher_of_pair[visible], food_of_pair[visible]
+        
+        distance = np.hypot(self.x[food_of_pair] - x[searcher_of_pair], self.y[food_of_pair] - y[searcher_of_pair])
+        
+        pair_order = np.lexsort((food_of_pair, distance, searcher_of_pair))
+        searcher_sorted = searcher_of_pair[pair_order]
+        first_pairs = np.flatnonzero(np.r_[True, searcher_sorted[1:] != searcher_sorted[:-1]]) if len(searcher_sorted) else np.empty(0, dtype=np.int64)
+        closest[searcher_sorted[first_pairs]] = food_of_pair[pair_order[first_pairs]]
+        return closest
@@ -1,33 +1,40 @@
 import pygame as py
 
+from typing import Callable
+
 from foods import Foods, Food
 
 class FoodPlacer:
     @staticmethod
-    def place_food(foods : Foods, food_count : int, food_size : int, food_color : tuple) -> None:
+    def place_food(foods : Foods, food_count : int, food_size : int, food_color : tuple,
+                   to_world : Callable[[float, float], tuple[float, float]] | None = None) -> None:
         """Place food on the screen
 
         Args:
             foods (Foods): The foods object
-            screen (py.Surface): The screen
             food_count (int): The number of food to place
             food_size (int): The size of the food
             food_color (tuple): The color of the food
+            to_world (Callable[[float, float], tuple[float, float]] | None, optional): Converts the mouse position to the world, e.g. `Camera.to_world`. Defaults to None.
         """
+        x, y = py.mouse.get_pos()
+        if to_world is not None:
+            x, y = (int(value) for value in to_world(x, y))
         for _ in range(food_count):
-            foods.add_food(Food(food_size, food_color, py.mouse.get_pos()[0], py.mouse.get_pos()[1]))
+            foods.add_food(Food(food_size, food_color, x, y))
             
     @classmethod
-    def is_left_click(cls, event : py.event.Event, foods : Foods, food_count : int, food_size : int, food_color : tuple) -> None:
+    def is_left_click(cls, event : py.event.Event, foods : Foods, food_count : int, food_size : int, food_color : tuple,
+                      to_world : Callable[[float, float], tuple[float, float]] | None = None) -> None:
         """Check if the user is left clicking
 
         Args:
             event (py.event.Event): The event to check
             foods (Foods): The foods object
-            screen (py.Surface): The screen
             food_count (int): The number of food to place
             food_size (int): The size of the food
             food_color (tuple): The color of the food
+            to_world (Callable[[float, float], tuple[float, float]] | None, optional): Converts the mouse position to the world. Defaults to None.
         """
         if event.type == py.MOUSEBUTTONDOWN and event.button == 1:
-            cls.place_food(foods, food_count, food_size, food_color)
\ No newline at end of file
+            cls.place_food(foods, food_count, food_size, food_color, to_world)
\ No newline at end of file
@@ -1,16 +1,62 @@
-import pygame as py
-import random
+from typing import Callable
 
+import numpy as np
 
 from . import Food
+from .food_locator import FoodLocator
+from entity_pool import EntityPool, Handle
+from random_streams import RandomStream, UNSEEDED
+from geometry import Rect
 
 
 class Foods:
-    def __init__(self) -> None:
-        """Class used to handle the foods
+    def __init__(self, cell_size : int = 64) -> None:
+        """Class used to handle the foods, `foods` must only be changed through the methods so the grid and the pool stay up to date.
+        The foods are stored in an `EntityPool`, so the animals target them with stable handles.
+        The quantity left in the world is kept in `total`, eaten quantities have to be reported with `count_eaten`.
+        The centers of the foods are kept in `centers`, one row per food of `foods`, so the locator is built without walking the foods.
+        The locator is built the first time it is used, then every change of the foods updates its buckets.
+        It is the only spatial index of the foods: the animals, the queries of an area and the renderers all read it
+
+        Args:
+            cell_size (int, optional): The cell size of the locator buckets. Defaults to 64.
         """
-        self.foods : list[Food] = []
+        self.pool : EntityPool[Food] = EntityPool()
+        self.cell_size = cell_size
+        self.max_food_size = 0
+        self.total = 0
+        self.centers = np.zeros((64, 2), dtype=np.int64)
+        self.located : FoodLocator | None = None
+        
+        self.track_changes = False
+        self.changed_rects : list[Rect] = []
         
+    def __len__(self) -> int:
+        return len(self.foods)
+    
+    @property
+    def foods(self) -> list[Food]:
+        return self.pool.items
+    
+    def restore(self, count : int, create : Callable[[int, int], Food], center_x : np.ndarray, center_y : np.ndarray, total : int, max_food_size : int) -> None:
+        """Add restored foods without creating them: a food is created by `create(row, position)` when it is first read (see `EntityPool.extend`),
+        the locator is built from the centers when it is first used
+
+        Args:
+            count (int): The number of foods
+            create (Callable[[int, int], Food]): Builds the food of a saved row at a position of `foods`
+            center_x (np.ndarray): The x of the center of every food
+            center_y (np.ndarray): The y of the center of every food
+            total (int): The quantity left in the foods
+            max_food_size (int): The width and height of the biggest food, at least
+        """
+        self.pool.extend(count, create)
+        self.centers = np.zeros((max(64, 2 * count), 2), dtype=np.int64)
+        self.centers[:count, 0] = center_x
+        self.centers[:count, 1] = center_y
+        self.located = None
+        self.total = total
+        self.max_food_size = max(self.max_food_size, max_food_size)
         
     def add_food(self, food : Food) -> None:
         """Add a food to the list of foods
@@ -18,36 +64,192 @@ class Foods:
         Args:
             food (Food): The food to add
         """
-        self.foods.append(food)
+        food.handle = self.pool.add(food)
+        index = len(self.foods) - 1
+        if index == len(self.centers):
+            self.centers = np.concatenate((self.centers, np.zeros_like(self.centers)))
+        self.centers[index] = food.rect.center
+        if self.located is not None:
+            self.located.insert(index, *food.rect.center)
+        self.max_food_size = max(self.max_food_size, food.rect.width, food.rect.height)
+        self.total += max(0, food.quantity)
+        self.mark_changed(food.rect)
         
-    def add_foods(self, screen : py.surface.Surface, amount : int, size : int, color : tuple[int, int, int]) -> None:
-        """Add foods to the list of foods
+    def scatter_foods(self,
+                      width : int,
+                      height : int,
+                      amount : int,
+                      size : int,
+                      color : tuple[int, int, int],
+                      quantity : int = 30,
+                      rng : RandomStream = UNSEEDED.stream("foods")) -> None:
+        """Add foods at random positions in a world of the given size, without needing a screen
 
         Args:
+            width (int): The world width
+            height (int): The world height
             amount (int): The amount of foods to add
             size (int): The size of the foods
             color (tuple[int, int, int]): The color of the foods
+            quantity (int, optional): The quantity of every food. Defaults to 30.
+            rng (RandomStream, optional): The stream the positions are drawn from. Defaults to an unseeded stream.
+        """
+        xs = rng.integers(0, width - 49, amount).tolist()
+        ys = rng.integers(0, height - 49, amount).tolist()
+        for x, y in zip(xs, ys):
+            self.add_food(Food(size, color, x, y, quantity))
+            
+    def step(self) -> None:
+        """Foods do not change on their own, they only shrink when they are eaten
+        """
+            
+    def count_eaten(self, amount : int, food : Food | None = None) -> None:
+        """Remove a quantity eaten from one of the foods from the total, the food shrinks so its center is updated
+
+        Args:
+            amount (int): The eaten quantity
+            food (Food | None, optional): The eaten food. Defaults to None.
         """
-        for _ in range(amount):
-            self.foods.append(Food(size, color, random.randint(0, screen.get_width() - 50), random.randint(0, screen.get_height() - 50)))
+        self.total -= amount
+        if food is not None:
+            index = self.pool.index(food.handle)
+            if index >= 0:
+                if self.located is not None:
+                    self.located.move(index, *self.centers[index].tolist(), *food.rect.center)
+                self.centers[index] = food.rect.center
+            
+    def total_quantity(self) -> int:
+        """Get the quantity of food left in the world, without walking the foods
+
+        Returns:
+            int: The sum of the quantities of every food
+        """
+        return self.total
         
     def remove_food(self, food : Food) -> None:
-        """Remove a food from the list of foods
+        """Remove a food from the list of foods now, the last food of the list takes its place
 
         Args:
             food (Food): The food to remove
         """
-        if food in self.foods:
-            self.foods.remove(food)
+        index = self.pool.remove(food.handle)
+        if index >= 0:
+            last = len(self.foods)
+            if self.located is not None:
+                self.located.remove(index, *self.centers[index].tolist())
+                if index != last:
+                    self.located.renumber(last, *self.centers[last].tolist(), index)
+            self.centers[index] = self.centers[last]
+            self.total -= max(0, food.quantity)
+            self.mark_changed(food.rect)
+            
+    def despawn_food(self, handle : Handle) -> None:
+        """Queue a food to be removed at the end of the tick by `apply_despawns`
+
+        Args:
+            handle (Handle): The handle of the food
+        """
+        self.pool.despawn(handle)
         
-    def update(self, screen : py.surface.Surface) -> None:
-        """The main update function of the foods
+    def apply_despawns(self) -> None:
+        """Remove the foods queued by `despawn_food`
+        """
+        for handle in self.pool.take_despawns():
+            food = self.pool.get(handle)
+            if food is not None:
+                self.remove_food(food)
+            
+    def get(self, handle : Handle) -> Food | None:
+        """Get the food of a handle
 
         Args:
-            screen (py.surface.Surface): The game screen
+            handle (Handle): The handle of the food
+
+        Returns:
+            Food | None: The food, None if it was removed
         """
-        for food in self.foods:
-            food.create(screen)
+        return self.pool.get(handle)
+    
+    def handle(self, index : int) -> Handle:
+        """Get the handle of a food of the list
+
+        Args:
+            index (int): The index of the food in `foods`
+
+        Returns:
+            Handle: The handle of the food
+        """
+        return self.pool.handle(index)
+            
+    def mark_changed(self, rect : Rect) -> None:
+        """Remember an area where a food was added, removed or eaten, so the renderer only redraws it.
+        Nothing is kept unless `track_changes` is True
+
+        Args:
+            rect (Rect): The area of the food before the change
+        """
+        if self.track_changes:
+            self.changed_rects.append(rect.copy())
             
-            # if food.is_completely_eaten():
-            #     self.remove_food(food)
\ No newline at end of file
+    def query(self, rect : Rect) -> list[Food]:
+        """Get the foods whose center is inside the rect, only the locator cells overlapping the rect are looked at
+
+        Args:
+            rect (Rect): The area to look at
+
+        Returns:
+            list[Food]: The foods
+        """
+        return [self.foods[index] for index in self.indexed().within(rect.x, rect.y, rect.width, rect.height).tolist()]
+    
+    def overlapping(self, rect : Rect) -> list[Food]:
+        """Get the foods whose rect overlaps the rect, e.g. the foods to draw again in a part of the screen.
+        The foods are bucketed by their center, so the cells up to the biggest food around the rect are looked at too
+
+        Args:
+            rect (Rect): The area to look at
+
+        Returns:
+            list[Food]: The foods overlapping the area
+        """
+        margin = self.max_food_size
+        candidates = self.indexed().within(rect.x - margin, rect.y - margin, rect.width + 2 * margin, rect.height + 2 * margin)
+        return [food for food in (self.foods[index] for index in candidates.tolist()) if food.rect.colliderect(rect)]
+    
+    def counts(self, rect : Rect) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the number of foods of every non empty locator cell overlapping the rect, e.g. to draw the density of a large area
+
+        Args:
+            rect (Rect): The area to look at
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The column, row and number of foods of every cell, the cells are `cell_size` wide
+        """
+        located = self.indexed()
+        cells = located.cells_in(rect.x, rect.y, rect.width, rect.height)
+        return *located.cell_coordinates(cells), located.cell_counts[cells]
+    
+    def indexed(self) -> FoodLocator:
+        """Get the locator of the current foods, with every food in it. It is only built the first time,
+        then it is kept up to date by the changes of the foods
+
+        Returns:
+            FoodLocator: The locator, its results are indexes in `foods`
+        """
+        centers = self.centers[:len(self.foods)]
+        if self.located is None:
+            self.located = FoodLocator(centers[:, 0], centers[:, 1], self.cell_size)
+        self.located.x, self.located.y = centers[:, 0], centers[:, 1]
+        return self.located
+    
+    def locator(self) -> FoodLocator:
+        """Get the locator of the current foods to find the closest food of many animals at once, the foods waiting to be despawned are left out
+
+        Returns:
+            FoodLocator: The locator, its results are indexes in `foods`
+        """
+        located = self.indexed()
+        despawning = [self.pool.index(handle) for handle in self.pool.pending]
+        located.hidden = np.array([index for index in despawning if index >= 0], dtype=np.int64)
+        return located
+
@@ -1,14 +1,20 @@
-import random
+import time
+
 import pygame as py
 
-from animals import Animals, Animal
-from foods import Foods
-from water import Water
+from simulation import Simulation
+from simulation.simulation import FOOD_COLOR
 
 from foods.food_placer import FoodPlacer
+from profiler import Profiler
+from rendering import LayeredRenderer, ViewportRenderer, Camera, ProfilerOverlay, StatsOverlay
 
-FOOD_COLOR = (7, 97, 34)
 BACKGROUND_COLOR = (13, 181, 63)
+FRAME_RATE = 60
+MAX_SPEED = 0
+SPEED_KEYS = {py.K_1: 1, py.K_2: 10, py.K_3: 100, py.K_4: MAX_SPEED}
+PAN_KEYS = {py.K_LEFT: (-1, 0), py.K_RIGHT: (1, 0), py.K_UP: (0, -1), py.K_DOWN: (0, 1)}
+PAN_SPEED = 600
 
 
 class Screen:
@@ -34,30 +40,49 @@ class Screen:
         self.screen.fill(color)
 
 class Game:
-    def __init__(self, screen : Screen) -> None:
-        """Class use to handle the game
+    def __init__(self, screen : Screen, seed : int | None = None, simulation : Simulation | None = None, animal_shape : str = "square",
+                 ticks_per_frame : int = 1) -> None:
+        """Class use to handle the game. When the world is larger than the screen, a `Camera` shows a part of it:
+        the arrows or a right click drag move it and the mouse wheel zooms. SPACE pauses the simulation.
+        The phases of a frame (events, drawing, waiting) are timed by `frame_profiler`, once per frame, apart from the ticks of the simulation
 
         Args:
             screen (Screen): The game screen
+            seed (int | None, optional): The seed of the world, None for a random world. Defaults to None.
+            simulation (Simulation | None, optional): An existing world to display (e.g. restored from a snapshot), None to create one. Defaults to None.
+            animal_shape (str, optional): "square" or "creature" to draw the animals with `Assets/creature.png`. Defaults to "square".
+            ticks_per_frame (int, optional): The number of simulation ticks per rendered frame, `MAX_SPEED` to simulate for the whole frame. Defaults to 1.
         """
         self.screen = screen
         self.clock = py.time.Clock()
         self.running = True
+        self.paused = False
         
-        self.animals = Animals()
+        self.ticks_per_frame = ticks_per_frame
+        self.accumulator = 0.0
+        self.frame_budget = 1 / FRAME_RATE
+        self.render_time = 0.0
         
-        for _ in range(3):
-            size = random.randint(15, 30)
-            color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-            speed = random.randint(1, 3)
-            life = random.randint(100, 200)
-            x = random.randint(0, self.screen.screen_witdh - size)
-            y = random.randint(0, self.screen.screen_height - size)
-            self.animals.add_animal(Animal(size, color, x, y, speed, life))
+        self.simulation = simulation if simulation is not None else Simulation(self.screen.screen_witdh, self.screen.screen_height, seed)
+        self.animals = self.simulation.animals
+        self.foods = self.simulation.foods
+        self.water = self.simulation.water
         
-        self.foods = Foods()
-        self.foods.add_foods(self.screen.screen, 30, 6, FOOD_COLOR)
-        self.water = Water(100, 100, 100, 100)
+        self.profiler = self.simulation.profiler
+        self.frame_profiler = Profiler()
+        self.always_profile = self.profiler.enabled
+        if self.always_profile:
+            self.frame_profiler.enable()
+        self.frame = 0
+        self.profiler_overlay = ProfilerOverlay()
+        self.stats_overlay = StatsOverlay()
+        self.camera : Camera | None = None
+        if self.simulation.width > self.screen.screen_witdh or self.simulation.height > self.screen.screen_height:
+            self.camera = Camera(self.simulation.width, self.simulation.height, self.screen.screen_witdh, self.screen.screen_height)
+            self.renderer : LayeredRenderer | ViewportRenderer = ViewportRenderer(self.screen.screen, BACKGROUND_COLOR, self.camera, animal_shape)
+        else:
+            self.renderer = LayeredRenderer(self.screen.screen, BACKGROUND_COLOR, animal_shape)
+        self.renderer.prerender(self.animals, self.foods)
         
     def is_quitting(self, event : py.event.Event) -> bool:
         """Check if the user is quitting the game
@@ -69,23 +94,148 @@ class Game:
             bool: Whether the user is quitting the game or not
         """
         return event.type == py.QUIT    
+    
+    def toggle_profiler_overlay(self, event : py.event.Event) -> None:
+        """Show or hide the profiler overlay when F3 is pressed, the profiler runs while the overlay is shown
+        or for the whole game if it was already on when the game started (e.g. with --profile)
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type == py.KEYDOWN and event.key == py.K_F3:
+            self.profiler_overlay.visible = not self.profiler_overlay.visible
+            if self.profiler_overlay.visible:
+                self.profiler.enable()
+                self.frame_profiler.enable()
+            elif not self.always_profile:
+                self.profiler.disable()
+                self.frame_profiler.disable()
+        
+    def toggle_stats_overlay(self, event : py.event.Event) -> None:
+        """Show or hide the statistics sparklines when F4 is pressed
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type == py.KEYDOWN and event.key == py.K_F4:
+            self.stats_overlay.visible = not self.stats_overlay.visible
+        
+    def redraw_when_exposed(self, event : py.event.Event) -> None:
+        """Draw the whole frame again when the window is shown again after being covered or minimized,
+        the renderer only updates the areas that changed otherwise
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type in (py.VIDEOEXPOSE, py.WINDOWEXPOSED):
+            self.renderer.invalidate()
+        
+    def toggle_pause(self, event : py.event.Event) -> None:
+        """Pause or resume the simulation when SPACE is pressed, the world can still be looked at while paused
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type == py.KEYDOWN and event.key == py.K_SPACE:
+            self.paused = not self.paused
+            self.accumulator = 0.0
+        
+    def move_camera(self, event : py.event.Event) -> None:
+        """Zoom with the mouse wheel around the cursor and move the camera while the right button is held
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if self.camera is None:
+            return
+        if event.type == py.MOUSEWHEEL:
+            self.camera.zoom_at(event.y, *py.mouse.get_pos())
+        elif event.type == py.MOUSEMOTION and event.buttons[2]:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+            
+    def pan_camera(self, elapsed : float) -> None:
+        """Move the camera while the arrows are held, at the same screen speed whatever the zoom
+
+        Args:
+            elapsed (float): The time since the last frame, in seconds
+        """
+        if self.camera is None:
+            return
+        pressed = py.key.get_pressed()
+        dx = sum(direction[0] for key, direction in PAN_KEYS.items() if pressed[key])
+        dy = sum(direction[1] for key, direction in PAN_KEYS.items() if pressed[key])
+        if dx or dy:
+            self.camera.pan(dx * PAN_SPEED * elapsed, dy * PAN_SPEED * elapsed)
+        
+    def change_speed(self, event : py.event.Event) -> None:
+        """Change the number of simulation ticks per frame when 1 (1x), 2 (10x), 3 (100x) or 4 (max speed) is pressed
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type == py.KEYDOWN and event.key in SPEED_KEYS:
+            self.ticks_per_frame = SPEED_KEYS[event.key]
+            self.accumulator = 0.0
+            py.display.set_caption(f"Life simulation - {'max speed' if self.ticks_per_frame == MAX_SPEED else f'x{self.ticks_per_frame}'}")
+    
+    def simulate(self, elapsed : float) -> int:
+        """Run the simulation ticks of one frame. The ticks are accumulated from the elapsed time so the speed does not depend on the frame rate,
+        the ticks that do not fit in the frame budget are dropped instead of slowing the next frames down.
+        At max speed, the simulation runs until the frame budget minus the time of the last render is spent
+
+        Args:
+            elapsed (float): The time since the last frame, in seconds
+
+        Returns:
+            int: The number of ticks that were run
+        """
+        deadline = time.perf_counter() + max(self.frame_budget - self.render_time, self.frame_budget / 4)
+        if self.ticks_per_frame == MAX_SPEED:
+            ticks = None
+        else:
+            self.accumulator += elapsed * FRAME_RATE * self.ticks_per_frame
+            ticks = int(self.accumulator)
+            self.accumulator -= ticks
+        
+        done = 0
+        while ticks is None or done < ticks:
+            self.simulation.step()
+            self.profiler.end_tick(self.simulation.tick)
+            done += 1
+            if time.perf_counter() >= deadline:
+                break
+        if ticks is not None and done < ticks:
+            self.accumulator = 0.0
+        return done
         
     def run(self) -> None:
-        """The main game loop.
+        """The main game loop, the events are handled once per frame at every speed.
         """
         while self.running:
-            self.clock.tick(60)
-            self.screen.change_background_color(BACKGROUND_COLOR)
-            
-            self.water.update(self.screen.screen)
+            with self.frame_profiler.phase("frame.wait"):
+                elapsed = self.clock.tick(FRAME_RATE if self.ticks_per_frame != MAX_SPEED else 0) / 1000
             
-            self.animals.update(self.screen.screen, self.foods)
-            self.foods.update(self.screen.screen)
+            with self.frame_profiler.phase("events"):
+                for event in py.event.get():
+                    self.running = self.running and not self.is_quitting(event)
+                    self.toggle_profiler_overlay(event)
+                    self.toggle_stats_overlay(event)
+                    self.change_speed(event)
+                    self.toggle_pause(event)
+                    self.redraw_when_exposed(event)
+                    self.move_camera(event)
+                    FoodPlacer.is_left_click(event, self.foods, 1, 6, FOOD_COLOR, self.camera.to_world if self.camera is not None else None)
+                self.pan_camera(elapsed)
             
-            py.display.flip()
+            if not self.paused:
+                self.simulate(elapsed)
             
-            for event in py.event.get():
-                self.running = not self.is_quitting(event)
-                FoodPlacer.is_left_click(event, self.foods, 1, 6, FOOD_COLOR)
+            start = time.perf_counter()
+            with self.frame_profiler.phase("draw"):
+                self.renderer.render(self.water, self.animals, self.foods,
+                                     [lambda screen: self.profiler_overlay.draw(screen, self.profiler, self.frame_profiler),
+                                      lambda screen: self.stats_overlay.draw(screen, self.simulation.history)])
+            self.render_time = time.perf_counter() - start
+            self.frame_profiler.end_tick(self.frame)
+            self.frame += 1
         py.quit()
-         
\ No newline at end of file
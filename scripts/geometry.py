@@ -0,0 +1,360 @@
+import numpy as np
+
+ROW_OFFSET = 1 << 31
+
+
+class Rect:
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x : int, y : int, width : int, height : int) -> None:
+        """Axis aligned box with integer coordinates, the part of `pygame.Rect` used by the model, so the model never imports pygame.
+        It is a sequence of 4 values (x, y, width, height), pygame accepts it everywhere it expects a rect
+
+        Args:
+            x (int): The left of the box
+            y (int): The top of the box
+            width (int): The width of the box
+            height (int): The height of the box
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __len__(self) -> int:
+        return 4
+
+    def __getitem__(self, index : int) -> int:
+        return (self.x, self.y, self.width, self.height)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __eq__(self, other : object) -> bool:
+        try:
+            return tuple(self) == tuple(other) # type: ignore
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+    @property
+    def left(self) -> int:
+        return self.x
+
+    @property
+    def top(self) -> int:
+        return self.y
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.height
+
+    @property
+    def centerx(self) -> int:
+        return self.x + self.width // 2
+
+    @property
+    def centery(self) -> int:
+        return self.y + self.height // 2
+
+    @property
+    def center(self) -> tuple[int, int]:
+        return self.x + self.width // 2, self.y + self.height // 2
+
+    @property
+    def topleft(self) -> tuple[int, int]:
+        return self.x, self.y
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @size.setter
+    def size(self, size : tuple[int, int]) -> None:
+        self.width, self.height = size
+
+    def copy(self) -> "Rect":
+        return Rect(self.x, self.y, self.width, self.height)
+
+    def collidepoint(self, x : int | tuple[int, int], y : int | None = None) -> bool:
+        """Check if a point is inside the box, the right and bottom borders are outside like with `pygame.Rect`
+
+        Args:
+            x (int | tuple[int, int]): The x of the point, or the point
+            y (int | None, optional): The y of the point when `x` is only its x. Defaults to None.
+
+        Returns:
+            bool: Whether the point is inside or not
+        """
+        if y is None:
+            x, y = x # type: ignore
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height # type: ignore
+
+    def colliderect(self, other : "Rect") -> bool:
+        """Check if two boxes overlap, boxes only touching by a border or without area never overlap like with `pygame.Rect`
+
+        Args:
+            other (Rect): The other box, any sequence of 4 values
+
+        Returns:
+            bool: Whether the boxes overlap or not
+        """
+        x, y, width, height = other
+        return (self.width > 0 and self.height > 0 and width > 0 and height > 0
+                and self.x < x + width and x < self.x + self.width and self.y < y + height and y < self.y + self.height)
+
+
+def centers(x : np.ndarray, y : np.ndarray, width : np.ndarray, height : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Get the centers of many boxes, rounded like `Rect.center`
+
+    Args:
+        x (np.ndarray): The left of every box
+        y (np.ndarray): The top of every box
+        width (np.ndarray): The width of every box
+        height (np.ndarray): The height of every box
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The x and y centers
+    """
+    return x + width // 2, y + height // 2
+
+
+def contains_points(left : np.ndarray, top : np.ndarray, width : np.ndarray, height : np.ndarray, x : np.ndarray, y : np.ndarray) -> np.ndarray:
+    """Check for many boxes if a point is inside, like `Rect.collidepoint`, the arrays are broadcast together
+
+    Args:
+        left (np.ndarray): The left of every box
+        top (np.ndarray): The top of every box
+        width (np.ndarray): The width of every box
+        height (np.ndarray): The height of every box
+        x (np.ndarray): The x of every point
+        y (np.ndarray): The y of every point
+
+    Returns:
+        np.ndarray: One boolean per box and point
+    """
+    return (x >= left) & (x < left + width) & (y >= top) & (y < top + height)
+
+
+def overlaps(x : np.ndarray, y : np.ndarray, width : np.ndarray, height : np.ndarray,
+             other_x : np.ndarray, other_y : np.ndarray, other_width : np.ndarray, other_height : np.ndarray) -> np.ndarray:
+    """Check if many pairs of boxes overlap, like `Rect.colliderect`, the arrays are broadcast together
+
+    Args:
+        x (np.ndarray): The left of every first box
+        y (np.ndarray): The top of every first box
+        width (np.ndarray): The width of every first box
+        height (np.ndarray): The height of every first box
+        other_x (np.ndarray): The left of every second box
+        other_y (np.ndarray): The top of every second box
+        other_width (np.ndarray): The width of every second box
+        other_height (np.ndarray): The height of every second box
+
+    Returns:
+        np.ndarray: One boolean per pair
+    """
+    return ((width > 0) & (height > 0) & (other_width > 0) & (other_height > 0)
+            & (x < other_x + other_width) & (other_x < x + width) & (y < other_y + other_height) & (other_y < y + height))
+
+
+def clamp(x : np.ndarray, y : np.ndarray, width : np.ndarray, height : np.ndarray, area_width : int, area_height : int) -> tuple[np.ndarray, np.ndarray]:
+    """Move many boxes inside the area (0, 0, area_width, area_height). A box wider (or higher) than the area is moved to 0 when it starts before the area,
+    else to `area_width - width`, which is negative, so it sticks out on the left (or top). This keeps the results of the clamp `Population` had before
+
+    Args:
+        x (np.ndarray): The left of every box
+        y (np.ndarray): The top of every box
+        width (np.ndarray): The width of every box
+        height (np.ndarray): The height of every box
+        area_width (int): The width of the area
+        area_height (int): The height of the area
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The new left and top of every box
+    """
+    max_x, max_y = area_width - width, area_height - height
+    return np.where(x < 0, 0, np.where(x > max_x, max_x, x)), np.where(y < 0, 0, np.where(y > max_y, max_y, y))
+
+
+class PointGrid:
+    def __init__(self, x : np.ndarray, y : np.ndarray, cell_size : int = 64, excluded : list[int] | None = None) -> None:
+        """Snapshot of many points bucketed by grid cell, to find the points of an area without looking at every point.
+        The points are sorted by cell once, then every query is a few binary searches.
+        The buckets can be kept up to date with `insert`, `remove`, `renumber` and `move`, without sorting again,
+        the caller then keeps `x` and `y` up to date itself
+
+        Args:
+            x (np.ndarray): The x of every point
+            y (np.ndarray): The y of every point
+            cell_size (int, optional): The width and height of a cell. Defaults to 64.
+            excluded (list[int] | None, optional): The indexes of the points that can not be found. Defaults to None.
+        """
+        self.cell_size = cell_size
+        self.x = np.asarray(x, dtype=np.int64)
+        self.y = np.asarray(y, dtype=np.int64)
+        
+        keys = self.cell_keys(self.x // cell_size, self.y // cell_size)
+        self.order = np.argsort(keys, kind="stable")
+        if excluded:
+            located = np.ones(len(keys), dtype=bool)
+            located[excluded] = False
+            self.order = self.order[located[self.order]]
+        self.cell_keys_sorted, self.cell_starts, self.cell_counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        
+    def cell_key(self, x : int, y : int) -> int:
+        """Get the key of the cell containing a point
+
+        Args:
+            x (int): The x of the point
+            y (int): The y of the point
+
+        Returns:
+            int: The cell key
+        """
+        return self.cell_keys(x // self.cell_size, y // self.cell_size)
+
+    def position_of(self, point : int, x : int, y : int) -> tuple[int, int]:
+        """Find a point in the buckets, only its cell is searched
+
+        Args:
+            point (int): The index of the point
+            x (int): The x the point was bucketed with
+            y (int): The y the point was bucketed with
+
+        Returns:
+            tuple[int, int]: The position of its cell in `cell_keys_sorted` and its position in `order`
+        """
+        cell = int(np.searchsorted(self.cell_keys_sorted, self.cell_key(x, y)))
+        start = int(self.cell_starts[cell])
+        return cell, start + int(np.flatnonzero(self.order[start:start + self.cell_counts[cell]] == point)[0])
+
+    def insert(self, point : int, x : int, y : int) -> None:
+        """Add a point at the end of the bucket of its cell
+
+        Args:
+            point (int): The index of the point
+            x (int): The x of the point
+            y (int): The y of the point
+        """
+        key = self.cell_key(x, y)
+        cell = int(np.searchsorted(self.cell_keys_sorted, key))
+        if cell < len(self.cell_keys_sorted) and self.cell_keys_sorted[cell] == key:
+            position = int(self.cell_starts[cell] + self.cell_counts[cell])
+            self.cell_counts[cell] += 1
+        else:
+            position = int(self.cell_starts[cell]) if cell < len(self.cell_starts) else len(self.order)
+            self.cell_keys_sorted = np.insert(self.cell_keys_sorted, cell, key)
+            self.cell_starts = np.insert(self.cell_starts, cell, position)
+            self.cell_counts = np.insert(self.cell_counts, cell, 1)
+        self.cell_starts[cell + 1:] += 1
+        self.order = np.insert(self.order, position, point)
+
+    def remove(self, point : int, x : int, y : int) -> None:
+        """Take a point out of its bucket, it can't be found anymore
+
+        Args:
+            point (int): The index of the point
+            x (int): The x the point was bucketed with
+            y (int): The y the point was bucketed with
+        """
+        cell, position = self.position_of(point, x, y)
+        self.order = np.delete(self.order, position)
+        self.cell_starts[cell + 1:] -= 1
+        self.cell_counts[cell] -= 1
+        if self.cell_counts[cell] == 0:
+            self.cell_keys_sorted = np.delete(self.cell_keys_sorted, cell)
+            self.cell_starts = np.delete(self.cell_starts, cell)
+            self.cell_counts = np.delete(self.cell_counts, cell)
+
+    def renumber(self, point : int, x : int, y : int, new_point : int) -> None:
+        """Give a new index to a point, e.g. the last point moved in the place of a removed one
+
+        Args:
+            point (int): The index of the point
+            x (int): The x the point was bucketed with
+            y (int): The y the point was bucketed with
+            new_point (int): The new index of the point
+        """
+        self.order[self.position_of(point, x, y)[1]] = new_point
+
+    def move(self, point : int, x : int, y : int, new_x : int, new_y : int) -> None:
+        """Bucket a point again after it moved, nothing changes while it stays in the same cell
+
+        Args:
+            point (int): The index of the point
+            x (int): The x the point was bucketed with
+            y (int): The y the point was bucketed with
+            new_x (int): The new x of the point
+            new_y (int): The new y of the point
+        """
+        if self.cell_key(x, y) != self.cell_key(new_x, new_y):
+            self.remove(point, x, y)
+            self.insert(point, new_x, new_y)
+
+    @staticmethod
+    def cell_keys(columns : np.ndarray, rows : np.ndarray) -> np.ndarray:
+        """Get one unique integer per cell, ordered by column then row. The rows are shifted by 2^31 so the cells of negative rows,
+        e.g. of points left or above the world, keep that order
+
+        Args:
+            columns (np.ndarray): The cell columns
+            rows (np.ndarray): The cell rows
+
+        Returns:
+            np.ndarray: The cell keys
+        """
+        return (columns << 32) + (rows + ROW_OFFSET)
+    
+    def cell_coordinates(self, cells : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the column and the row of non empty cells
+
+        Args:
+            cells (np.ndarray): The positions of the cells, as given by `cells_in`
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The columns and the rows
+        """
+        keys = self.cell_keys_sorted[cells]
+        return keys >> 32, (keys & 0xFFFFFFFF) - ROW_OFFSET
+    
+    def cells_in(self, left : int, top : int, width : int, height : int) -> np.ndarray:
+        """Get the non empty cells overlapping a box, with one binary search per column of the box.
+        The points are bucketed by their own cell, so a box meant to find every box overlapping an area has to be the area grown by the biggest box
+
+        Args:
+            left (int): The left of the box
+            top (int): The top of the box
+            width (int): The width of the box
+            height (int): The height of the box
+
+        Returns:
+            np.ndarray: The positions of the cells in `cell_keys_sorted`, `cell_starts` and `cell_counts`
+        """
+        columns = np.arange(left // self.cell_size, (left + width - 1) // self.cell_size + 1)
+        first_row, last_row = top // self.cell_size, (top + height - 1) // self.cell_size
+        starts = np.searchsorted(self.cell_keys_sorted, self.cell_keys(columns, first_row))
+        counts = np.searchsorted(self.cell_keys_sorted, self.cell_keys(columns, last_row), side="right") - starts
+        return np.repeat(starts, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    def within(self, left : int, top : int, width : int, height : int) -> np.ndarray:
+        """Get the points inside a box, only the cells overlapping the box are looked at
+
+        Args:
+            left (int): The left of the box
+            top (int): The top of the box
+            width (int): The width of the box
+            height (int): The height of the box
+
+        Returns:
+            np.ndarray: The indexes of the points
+        """
+        cells = self.cells_in(left, top, width, height)
+        starts, counts = self.cell_starts[cells], self.cell_counts[cells]
+        indexes = self.order[np.repeat(starts, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+        return indexes[contains_points(left, top, width, height, self.x[indexes], self.y[indexes])]
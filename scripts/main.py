@@ -1,9 +1,353 @@
-import pygame as py
+import argparse
+import json
+import time
 
-from game import Screen, Game
+MAX_WINDOW_SIZE = (1280, 800)
 
-if __name__ == '__main__':
-    screen = Screen(800, 600)
-    game = Game(screen)
+
+def event_rate(value : str) -> tuple[str, float]:
+    """Parse a CATEGORY=RATE argument of --event-rates
+
+    Args:
+        value (str): The argument
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not a known category and a rate in (0, 1]
+
+    Returns:
+        tuple[str, float]: The category and its rate
+    """
+    from event_log import CATEGORIES
+    
+    category, separator, rate = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"{value!r} is not CATEGORY=RATE")
+    if category not in CATEGORIES:
+        raise argparse.ArgumentTypeError(f"unknown event category {category!r}, expected one of {', '.join(CATEGORIES)}")
+    try:
+        fraction = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{rate!r} is not a number")
+    if not 0 < fraction <= 1:
+        raise argparse.ArgumentTypeError(f"the rate of {category!r} must be in (0, 1], got {rate}")
+    return category, fraction
+
+
+def tile_grid(value : str) -> tuple[int, int]:
+    """Parse a COLUMNSxROWS argument of --tiles
+
+    Args:
+        value (str): The argument
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not two positive integers separated by an x
+
+    Returns:
+        tuple[int, int]: The number of tile columns and rows
+    """
+    columns, separator, rows = value.lower().partition("x")
+    if not separator or not columns.isdigit() or not rows.isdigit() or int(columns) < 1 or int(rows) < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not COLUMNSxROWS, e.g. 2x2")
+    return int(columns), int(rows)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Pygame life simulation")
+    parser.add_argument("--headless", action="store_true", help="run the simulation without any window")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks to run in headless mode")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the world")
+    parser.add_argument("--width", type=int, default=800, help="width of the world")
+    parser.add_argument("--height", type=int, default=600, help="height of the world")
+    parser.add_argument("--load-snapshot", metavar="PATH", default=None, help="start from a saved world instead of a new one")
+    parser.add_argument("--save-snapshot", metavar="PATH", default=None, help="save the world at the end of a headless run")
+    parser.add_argument("--animals", type=int, default=3, help="number of animals of a new world")
+    parser.add_argument("--foods", type=int, default=30, help="number of foods of a new world")
+    parser.add_argument("--interactions", action="store_true", help="the overlapping animals of a new world hunt smaller ones, compete for their food and leave the crowds")
+    parser.add_argument("--drinking", action="store_true", help="the animals of a new world get thirsty and walk to the water to drink")
+    parser.add_argument("--food-model", choices=("items", "field"), default="items", help="one object per food, or a raster of quantities that grows back")
+    parser.add_argument("--speed", type=int, default=1, help="simulation ticks per rendered frame in the window, 0 for max speed (keys 1-4 change it)")
+    parser.add_argument("--creature-sprites", action="store_true", help="draw the animals with Assets/creature.png")
+    parser.add_argument("--profile", action="store_true", help="time every phase of every tick (F3 shows the overlay in the window)")
+    parser.add_argument("--profile-trace", metavar="PATH", default=None, help="write the phase durations of every tick to a .csv or JSON-lines file")
+    parser.add_argument("--stats-out", metavar="PATH", default=None, help="write the statistics history (one sample every 10 ticks) to a .csv or JSON-lines file at the end of the run")
+    parser.add_argument("--events", metavar="PATH", default=None, help="log the meals, targets, life losses, deaths and depleted foods to a .bin or JSON-lines file")
+    parser.add_argument("--event-rates", metavar="CATEGORY=RATE", type=event_rate, nargs="+", default=None, help="fraction of the events kept per category, e.g. eat=0.01 death=1, the others are off (every category is fully logged by default)")
+    parser.add_argument("--record", metavar="DIR", default=None, help="record every tick of the run to a folder")
+    parser.add_argument("--kernels", choices=("numpy", "jit"), default="numpy", help="backend of the clamping and moving loops, jit needs numba and falls back to numpy without it")
+    parser.add_argument("--tiles", metavar="COLUMNSxROWS", type=tile_grid, default=None, help="run a headless world of food items over one process per tile, e.g. 2x2 (no drinking, interactions, events, recording, telemetry nor jit kernels)")
+    parser.add_argument("--telemetry-port", type=int, default=None, help="stream the state of the run to TCP clients on this port (see telemetry_client.py)")
+    parser.add_argument("--replay", metavar="DIR", default=None, help="replay a recorded run instead of simulating")
+    parser.add_argument("--sweep", metavar="GRID_JSON", default=None, help="run a headless parameter sweep, the JSON maps Settings parameters to lists of values")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="seeds of every sweep combination")
+    parser.add_argument("--workers", type=int, default=None, help="number of sweep processes, defaults to every core")
+    parser.add_argument("--output", default="sweep.csv", help="CSV file the sweep results are written to")
+    args = parser.parse_args()
+    if args.tiles is not None and args.kernels == "jit":
+        parser.error("--tiles runs the numpy kernels in every tile, it can't be used with --kernels jit")
+    return args
+
+
+def create_simulation(args : argparse.Namespace):
+    """Create a new world, or restore it from a snapshot
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+
+    Returns:
+        Simulation: The world
+    """
+    from simulation import Simulation, Settings
+    from simulation.snapshot import load_snapshot
+    
+    if args.load_snapshot is not None:
+        return load_snapshot(args.load_snapshot)
+    return Simulation(args.width, args.height, args.seed, Settings(animal_count=args.animals, food_count=args.foods, food_model=args.food_model,
+                                                                  interactions=args.interactions, drinking=args.drinking))
+
+
+def setup_profiler(args : argparse.Namespace, simulation) -> None:
+    """Enable the profiler of the simulation if asked
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to profile
+    """
+    if args.profile or args.profile_trace is not None:
+        simulation.profiler.enable()
+    if args.profile_trace is not None:
+        simulation.profiler.open_trace(args.profile_trace)
+
+
+def setup_events(args : argparse.Namespace, simulation) -> None:
+    """Log the events of the simulation to a file if asked
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to log
+    """
+    from event_log import CATEGORIES
+    
+    if args.events is None:
+        return
+    rates = {category: 1.0 for category in CATEGORIES}
+    if args.event_rates is not None:
+        rates = dict(args.event_rates)
+    for category, rate in rates.items():
+        simulation.events.enable(category, rate)
+    simulation.events.open(args.events)
+
+
+def attach_recorder(args : argparse.Namespace, simulation):
+    """Record the simulation if asked
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to record
+
+    Returns:
+        Recorder | None: The recorder, it has to be closed at the end of the run
+    """
+    from simulation.recorder import Recorder
+    
+    if args.record is None:
+        return None
+    recorder = Recorder(args.record)
+    simulation.observers.append(recorder)
+    return recorder
+
+
+def attach_telemetry(args : argparse.Namespace, simulation):
+    """Start the telemetry server if asked
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to stream
+
+    Returns:
+        TelemetryServer | None: The server, it has to be closed at the end of the run
+    """
+    from simulation.telemetry import TelemetryServer
+    
+    if args.telemetry_port is None:
+        return None
+    server = TelemetryServer(port=args.telemetry_port)
+    try:
+        server.start()
+    except OSError as error:
+        raise SystemExit(f"telemetry: can't listen on port {args.telemetry_port}: {error}")
+    simulation.observers.append(server)
+    print(f"telemetry on {server.host}:{server.port}")
+    return server
+
+
+def setup_kernels(args : argparse.Namespace, simulation) -> None:
+    """Use the Numba kernels if asked and available, once they are checked to move a seeded population like the NumPy ones
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to run
+    """
+    from animals.jit_kernels import JitKernels, NUMBA_AVAILABLE, check_kernels
+    
+    if args.kernels != "jit":
+        return
+    if not NUMBA_AVAILABLE:
+        print("numba is not installed, using the numpy kernels")
+        return
+    kernels = JitKernels()
+    if not check_kernels(kernels):
+        print("the jit kernels do not match the numpy kernels, using the numpy kernels")
+        return
+    simulation.animals.kernels = kernels
+
+
+def setup_tiles(args : argparse.Namespace, simulation):
+    """Split the world over a grid of worker processes if asked
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+        simulation (Simulation): The world to split
+
+    Returns:
+        TiledEngine | None: The engine advancing the world, it has to be closed at the end of the run
+    """
+    from simulation.parallel import TiledEngine
+    
+    if args.tiles is None:
+        return None
+    try:
+        return TiledEngine(simulation, *args.tiles)
+    except ValueError as error:
+        raise SystemExit(f"tiles: {error}")
+
+
+def run_headless(args : argparse.Namespace) -> None:
+    """Run the simulation without any window and print a summary
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+    """
+    from simulation.snapshot import save_snapshot
+    
+    simulation = create_simulation(args)
+    recorder = telemetry = tiles = None
+    # the tiles check the observers and the events, so they are built last, but an invalid configuration still closes what was opened
+    try:
+        recorder = attach_recorder(args, simulation)
+        telemetry = attach_telemetry(args, simulation)
+        setup_kernels(args, simulation)
+        setup_profiler(args, simulation)
+        setup_events(args, simulation)
+        tiles = setup_tiles(args, simulation)
+        first_tick = simulation.tick
+        start = time.perf_counter()
+        if tiles is not None:
+            tiles.run(args.ticks)
+        else:
+            simulation.run(args.ticks)
+        elapsed = time.perf_counter() - start
+    finally:
+        if tiles is not None:
+            tiles.close()
+        simulation.events.close()
+        if recorder is not None:
+            recorder.close()
+        if telemetry is not None:
+            telemetry.close()
+    
+    print(f"ticks={simulation.tick} elapsed={elapsed:.3f}s ticks/s={(simulation.tick - first_tick) / max(elapsed, 1e-9):.0f}")
+    print(f"animals={len(simulation.animals.animals)} foods={len(simulation.foods)}")
+    
+    if args.save_snapshot is not None:
+        save_snapshot(simulation, args.save_snapshot)
+    if args.stats_out is not None:
+        simulation.history.export(args.stats_out)
+        
+    if simulation.profiler.enabled:
+        print(f"{'phase (ms)':<24}{'p50':>8}{'p95':>8}{'p99':>8}")
+        for name, values in sorted(simulation.profiler.percentiles().items()):
+            print(f"{name:<24}" + "".join(f"{value:>8.3f}" for value in values))
+    simulation.profiler.close_trace()
+
+
+def run_sweep(args : argparse.Namespace) -> None:
+    """Run a parameter sweep over a pool of processes
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+    """
+    from simulation.sweep import Sweep
+    
+    with open(args.sweep) as file:
+        grid = json.load(file)
+    
+    sweep = Sweep(grid, args.seeds, args.ticks, args.width, args.height, workers=args.workers)
+    sweep.run(args.output)
+    print(f"results written to {args.output}")
+
+
+def run_window(args : argparse.Namespace) -> None:
+    """Run the simulation in a pygame window
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+    """
+    import pygame as py
+    
+    from game import Screen, Game
+    
+    simulation = create_simulation(args)
+    recorder = attach_recorder(args, simulation)
+    telemetry = attach_telemetry(args, simulation)
+    setup_kernels(args, simulation)
+    setup_profiler(args, simulation)
+    setup_events(args, simulation)
+    screen = Screen(min(simulation.width, MAX_WINDOW_SIZE[0]), min(simulation.height, MAX_WINDOW_SIZE[1]))
+    game = Game(screen, simulation=simulation, animal_shape="creature" if args.creature_sprites else "square",
+                ticks_per_frame=args.speed)
     py.init()
-    game.run()
\ No newline at end of file
+    game.run()
+    simulation.profiler.close_trace()
+    simulation.events.close()
+    if args.stats_out is not None:
+        simulation.history.export(args.stats_out)
+    if recorder is not None:
+        recorder.close()
+    if telemetry is not None:
+        telemetry.close()
+
+
+def run_replay(args : argparse.Namespace) -> None:
+    """Replay a recorded run in a pygame window
+
+    Args:
+        args (argparse.Namespace): The parsed arguments
+    """
+    import pygame as py
+    
+    from game import Screen
+    from replay import ReplayViewer
+    from simulation.recorder import TrajectoryReader
+    
+    reader = TrajectoryReader(args.replay)
+    screen = Screen(min(reader.width, MAX_WINDOW_SIZE[0]), min(reader.height, MAX_WINDOW_SIZE[1]))
+    viewer = ReplayViewer(screen, reader)
+    py.init()
+    viewer.run()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.sweep is not None:
+        run_sweep(args)
+    elif args.replay is not None:
+        run_replay(args)
+    elif args.headless:
+        run_headless(args)
+    else:
+        run_window(args)
@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+
+from collections import deque
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class Phase:
+    def __init__(self, profiler : "Profiler", name : str) -> None:
+        """Context manager adding the time spent inside it to a phase of the current tick.
+        The time of the phases opened inside it is taken out of it, so the phases of a tick never overlap and add up to the timed part of the tick
+
+        Args:
+            profiler (Profiler): The profiler the time is added to
+            name (str): The name of the phase
+        """
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.profiler.open_phases.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exception) -> None:
+        elapsed = time.perf_counter() - self.start
+        totals = self.profiler.tick_totals
+        totals[self.name] = totals.get(self.name, 0.0) + elapsed
+        open_phases = self.profiler.open_phases
+        open_phases.pop()
+        if open_phases:
+            parent = open_phases[-1].name
+            totals[parent] = totals.get(parent, 0.0) - elapsed
+
+
+class NullPhase:
+    """Context manager doing nothing, used for every phase while the profiler is off
+    """
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exception) -> None:
+        pass
+
+
+NULL_PHASE = NullPhase()
+
+
+class Profiler:
+    def __init__(self, window : int = 600) -> None:
+        """Class used to time the phases of every tick and keep the last durations of every phase.
+        While it is off, `phase` only returns a shared context manager doing nothing
+
+        Args:
+            window (int, optional): The number of ticks the percentiles are computed on. Defaults to 600.
+        """
+        self.enabled = False
+        self.window = window
+        self.phases : dict[str, Phase] = {}
+        self.open_phases : list[Phase] = []
+        self.tick_totals : dict[str, float] = {}
+        self.history : dict[str, deque[float]] = {}
+
+        self.trace_file = None
+        self.trace_writer = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.tick_totals.clear()
+
+    def toggle(self) -> None:
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def phase(self, name : str) -> Phase | NullPhase:
+        """Get the context manager timing a phase
+
+        Args:
+            name (str): The name of the phase, e.g. "animals.movement"
+
+        Returns:
+            Phase | NullPhase: The context manager
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def end_tick(self, tick : int) -> None:
+        """Store the durations of the tick that just ended in the history and the trace
+
+        Args:
+            tick (int): The number of the tick
+        """
+        if not self.enabled:
+            return
+        for name, duration in self.tick_totals.items():
+            history = self.history.get(name)
+            if history is None:
+                history = self.history[name] = deque(maxlen=self.window)
+            history.append(duration)
+        if self.trace_file is not None:
+            self.write_trace(tick)
+        self.tick_totals.clear()
+
+    def percentiles(self) -> dict[str, tuple[float, ...]]:
+        """Get the p50, p95 and p99 of every phase on the last ticks, in milliseconds
+
+        Returns:
+            dict[str, tuple[float, ...]]: The percentiles of every phase
+        """
+        return {name: tuple(np.percentile(np.fromiter(history, dtype=np.float64), PERCENTILES) * 1000)
+                for name, history in self.history.items() if history}
+
+    def open_trace(self, path : str) -> None:
+        """Write the durations of every tick to a file, as CSV rows (tick, phase, ms) if the path ends with .csv, else as JSON lines
+
+        Args:
+            path (str): The path of the trace
+        """
+        self.close_trace()
+        self.trace_file = open(path, "w", newline="")
+        if path.endswith(".csv"):
+            self.trace_writer = csv.writer(self.trace_file)
+            self.trace_writer.writerow(("tick", "phase", "ms"))
+
+    def write_trace(self, tick : int) -> None:
+        """Write the durations of the current tick to the trace
+
+        Args:
+            tick (int): The number of the tick
+        """
+        if self.trace_writer is not None:
+            self.trace_writer.writerows((tick, name, round(duration * 1000, 4)) for name, duration in self.tick_totals.items())
+        else:
+            self.trace_file.write(json.dumps({"tick": tick, **{name: round(duration * 1000, 4) for name, duration in self.tick_totals.items()}}) + "\n") # type: ignore
+
+    def close_trace(self) -> None:
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+            self.trace_writer = None
+
+
+NULL_PROFILER = Profiler()
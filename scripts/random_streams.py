@@ -0,0 +1,144 @@
+import zlib
+
+import numpy as np
+
+
+class RandomStream:
+    def __init__(self, seed_sequence : np.random.SeedSequence, block_size : int = 4096) -> None:
+        """Class used to draw the random numbers of one subsystem, they are generated by blocks with NumPy
+        and handed out from the current block, one value or a whole array at a time
+
+        Args:
+            seed_sequence (np.random.SeedSequence): The seed of the stream
+            block_size (int, optional): The number of values generated at once. Defaults to 4096.
+        """
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.block_size = block_size
+        self.block = np.empty(0, dtype=np.float64)
+        self.position = 0
+
+    def uniform(self, count : int) -> np.ndarray:
+        """Get random floats in [0, 1)
+
+        Args:
+            count (int): The number of values
+
+        Returns:
+            np.ndarray: The values
+        """
+        available = len(self.block) - self.position
+        if count > available:
+            self.block = np.concatenate((self.block[self.position:], self.generator.random(max(self.block_size, count - available))))
+            self.position = 0
+        values = self.block[self.position:self.position + count]
+        self.position += count
+        return values
+
+    def integers(self, low : int | np.ndarray, high : int | np.ndarray, count : int) -> np.ndarray:
+        """Get random integers in [low, high), the bounds can also be one array value per integer
+
+        Args:
+            low (int | np.ndarray): The lowest value
+            high (int | np.ndarray): The highest value, excluded
+            count (int): The number of values
+
+        Returns:
+            np.ndarray: The values
+        """
+        span = high - low
+        return low + np.minimum((self.uniform(count) * span).astype(np.int64), span - 1)
+
+    def randint(self, low : int, high : int) -> int:
+        """Get a random integer in [low, high], like `random.randint`
+
+        Args:
+            low (int): The lowest value
+            high (int): The highest value, included
+
+        Returns:
+            int: The value
+        """
+        return int(self.integers(low, high + 1, 1)[0])
+
+    def randrange(self, stop : int) -> int:
+        """Get a random integer in [0, stop), like `random.randrange`
+
+        Args:
+            stop (int): The highest value, excluded
+
+        Returns:
+            int: The value
+        """
+        return int(self.integers(0, stop, 1)[0])
+
+    def get_state(self) -> tuple[dict, np.ndarray]:
+        """Get the state of the stream, to restore it with `set_state`
+
+        Returns:
+            tuple[dict, np.ndarray]: The state of the generator and the values left in the current block
+        """
+        return self.generator.bit_generator.state, self.block[self.position:].copy()
+
+    def set_state(self, generator_state : dict, block : np.ndarray) -> None:
+        """Restore a state given by `get_state`
+
+        Args:
+            generator_state (dict): The state of the generator
+            block (np.ndarray): The values left in the current block
+        """
+        self.generator.bit_generator.state = generator_state
+        self.block = np.array(block, dtype=np.float64)
+        self.position = 0
+
+
+class RandomService:
+    def __init__(self, seed : int | None = None, block_size : int = 4096) -> None:
+        """Class used to hand out one independent `RandomStream` per subsystem.
+        A stream only depends on the seed and on its name, so the same seed gives the same numbers whatever the order
+        the streams are created in and in whatever process they are created (e.g. the workers of a sweep).
+        NumPy only takes non-negative seeds, a negative seed is used as its 64-bit two's complement (-1 is 2**64 - 1)
+
+        Args:
+            seed (int | None, optional): The seed of every stream, None for a random one. Defaults to None.
+            block_size (int, optional): The number of values every stream generates at once. Defaults to 4096.
+        """
+        if seed is not None and seed < 0:
+            seed &= 2**64 - 1
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        self.block_size = block_size
+        self.streams : dict[str, RandomStream] = {}
+
+    def stream(self, name : str) -> RandomStream:
+        """Get the stream of a subsystem, it is created on its first use
+
+        Args:
+            name (str): The name of the subsystem
+
+        Returns:
+            RandomStream: The stream
+        """
+        if name not in self.streams:
+            seed_sequence = np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(name.encode()),))
+            self.streams[name] = RandomStream(seed_sequence, self.block_size)
+        return self.streams[name]
+
+    def get_state(self) -> dict[str, tuple[dict, np.ndarray]]:
+        """Get the state of every stream created so far
+
+        Returns:
+            dict[str, tuple[dict, np.ndarray]]: The state of every stream by name
+        """
+        return {name: stream.get_state() for name, stream in self.streams.items()}
+
+    def set_state(self, state : dict[str, tuple[dict, np.ndarray]]) -> None:
+        """Restore the states given by `get_state`
+
+        Args:
+            state (dict[str, tuple[dict, np.ndarray]]): The state of every stream by name
+        """
+        for name, (generator_state, block) in state.items():
+            self.stream(name).set_state(generator_state, block)
+
+
+UNSEEDED = RandomService()
@@ -0,0 +1,4 @@
+from .renderer import LayeredRenderer
+from .viewport_renderer import ViewportRenderer
+from .camera import Camera
+from .overlays import ProfilerOverlay, StatsOverlay
\ No newline at end of file
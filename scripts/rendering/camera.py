@@ -0,0 +1,104 @@
+import numpy as np
+
+from geometry import Rect
+
+ZOOM_STEP = 1.25
+MAX_ZOOM = 8.0
+
+
+class Camera:
+    def __init__(self, world_width : int, world_height : int, view_width : int, view_height : int, zoom : float = 1.0) -> None:
+        """Class used to know which part of the world is shown on the screen and how big it is drawn.
+        `x` and `y` are the world position of the top left corner of the screen, `zoom` the number of pixels per world unit
+
+        Args:
+            world_width (int): The world width
+            world_height (int): The world height
+            view_width (int): The screen width
+            view_height (int): The screen height
+            zoom (float, optional): The starting zoom. Defaults to 1.0.
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.min_zoom = min(1.0, view_width / world_width, view_height / world_height)
+        self.zoom = min(max(zoom, self.min_zoom), MAX_ZOOM)
+        self.x = 0.0
+        self.y = 0.0
+        self.clamp()
+
+    def viewport(self) -> Rect:
+        """Get the area of the world shown on the screen
+
+        Returns:
+            Rect: The area, in world units
+        """
+        return Rect(int(self.x), int(self.y), int(np.ceil(self.view_width / self.zoom)) + 1, int(np.ceil(self.view_height / self.zoom)) + 1)
+
+    def clamp(self) -> None:
+        """Keep the screen inside the world, a world smaller than the screen is centered
+        """
+        for position, world, view in (("x", self.world_width, self.view_width / self.zoom), ("y", self.world_height, self.view_height / self.zoom)):
+            value = (world - view) / 2 if view >= world else min(max(getattr(self, position), 0.0), world - view)
+            setattr(self, position, value)
+
+    def pan(self, dx : float, dy : float) -> None:
+        """Move the screen over the world
+
+        Args:
+            dx (float): The horizontal move, in screen pixels
+            dy (float): The vertical move, in screen pixels
+        """
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, steps : float, screen_x : int, screen_y : int) -> None:
+        """Zoom in (positive steps) or out (negative steps) keeping the world point under a screen position in place
+
+        Args:
+            steps (float): The number of `ZOOM_STEP` to zoom by
+            screen_x (int): The x of the fixed point on the screen
+            screen_y (int): The y of the fixed point on the screen
+        """
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        self.zoom = min(max(self.zoom * ZOOM_STEP ** steps, self.min_zoom), MAX_ZOOM)
+        self.x = world_x - screen_x / self.zoom
+        self.y = world_y - screen_y / self.zoom
+        self.clamp()
+
+    def to_world(self, screen_x : float, screen_y : float) -> tuple[float, float]:
+        """Get the world position under a screen position
+
+        Args:
+            screen_x (float): The x on the screen
+            screen_y (float): The y on the screen
+
+        Returns:
+            tuple[float, float]: The x and y in the world
+        """
+        return self.x + screen_x / self.zoom, self.y + screen_y / self.zoom
+
+    def to_screen(self, x : np.ndarray, y : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the screen positions of many world positions
+
+        Args:
+            x (np.ndarray): The x in the world
+            y (np.ndarray): The y in the world
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The x and y on the screen, rounded down to pixels
+        """
+        return np.floor((x - self.x) * self.zoom).astype(np.int64), np.floor((y - self.y) * self.zoom).astype(np.int64)
+
+    def scale(self, length : np.ndarray) -> np.ndarray:
+        """Get the screen size of many world lengths, at least one pixel
+
+        Args:
+            length (np.ndarray): The lengths in the world
+
+        Returns:
+            np.ndarray: The lengths on the screen
+        """
+        return np.maximum(1, np.round(length * self.zoom)).astype(np.int64)
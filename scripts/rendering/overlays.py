@@ -0,0 +1,101 @@
+import numpy as np
+import pygame as py
+
+from profiler import Profiler
+from world_stats import StatsHistory
+
+SPARKLINES = (("animals", (230, 230, 230)), ("mean_life", (220, 80, 80)), ("mean_food_storage", (230, 170, 60)),
+              ("food", (60, 170, 90)), ("water", (70, 130, 230)))
+
+
+class ProfilerOverlay:
+    def __init__(self, refresh_ticks : int = 15) -> None:
+        """Class used to show the percentiles of every phase on top of the game
+
+        Args:
+            refresh_ticks (int, optional): The number of frames between two computations of the percentiles. Defaults to 15.
+        """
+        self.visible = False
+        self.refresh_ticks = refresh_ticks
+        self.frame = 0
+        self.lines : list[str] = []
+        self.font : py.font.Font | None = None
+
+    def draw(self, screen : py.surface.Surface, profiler : Profiler, frame_profiler : Profiler | None = None) -> py.Rect | None:
+        """Draw the percentiles in the top left corner of the screen
+
+        Args:
+            screen (py.surface.Surface): The game screen
+            profiler (Profiler): The profiler to show
+            frame_profiler (Profiler | None, optional): A profiler of the frames whose phases are shown too. Defaults to None.
+
+        Returns:
+            py.Rect | None: The area of the screen that was drawn, None when hidden
+        """
+        if not self.visible:
+            return None
+        if self.font is None:
+            py.font.init()
+            self.font = py.font.SysFont("monospace", 12)
+
+        if self.frame % self.refresh_ticks == 0:
+            self.lines = [f"{'phase':<24}{'p50':>8}{'p95':>8}{'p99':>8}"]
+            percentiles = profiler.percentiles()
+            if frame_profiler is not None:
+                percentiles.update(frame_profiler.percentiles())
+            self.lines += [f"{name:<24}" + "".join(f"{value:>8.2f}" for value in values) for name, values in sorted(percentiles.items())]
+        self.frame += 1
+
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in self.lines]
+        background = py.Surface((max(text.get_width() for text in rendered) + 8, 14 * len(rendered) + 8))
+        background.set_alpha(180)
+        area = screen.blit(background, (0, 0))
+        for index, text in enumerate(rendered):
+            screen.blit(text, (4, 4 + 14 * index))
+        return area
+
+
+class StatsOverlay:
+    def __init__(self, width : int = 220, height : int = 34) -> None:
+        """Class used to draw one sparkline per statistic of `SPARKLINES` on top of the game
+
+        Args:
+            width (int, optional): The width of a sparkline. Defaults to 220.
+            height (int, optional): The height of a sparkline. Defaults to 34.
+        """
+        self.visible = False
+        self.width = width
+        self.height = height
+        self.font : py.font.Font | None = None
+
+    def draw(self, screen : py.surface.Surface, history : StatsHistory) -> py.Rect | None:
+        """Draw the sparklines in the top right corner of the screen
+
+        Args:
+            screen (py.surface.Surface): The game screen
+            history (StatsHistory): The history to show
+
+        Returns:
+            py.Rect | None: The area of the screen that was drawn, None when hidden
+        """
+        if not self.visible:
+            return None
+        if self.font is None:
+            py.font.init()
+            self.font = py.font.SysFont("monospace", 12)
+
+        background = py.Surface((self.width + 8, (self.height + 4) * len(SPARKLINES) + 4))
+        background.set_alpha(180)
+        area = screen.blit(background, (screen.get_width() - background.get_width(), 0))
+        for index, (name, color) in enumerate(SPARKLINES):
+            rect = py.Rect(area.x + 4, 4 + index * (self.height + 4), self.width, self.height)
+            values = history.series(name)
+            if len(values) > 1:
+                low, high = float(values.min()), float(values.max())
+                scale = (rect.height - 14) / (high - low) if high > low else 0
+                xs = rect.x + np.arange(len(values)) * (rect.width / (history.capacity - 1))
+                ys = rect.bottom - 1 - (values - low) * scale
+                py.draw.lines(screen, color, False, np.column_stack((xs, ys)).tolist())
+            if len(values):
+                screen.blit(self.font.render(f"{name} {values[-1]:.6g}", True, color), rect.topleft)
+        return area
@@ -0,0 +1,171 @@
+import numpy as np
+import pygame as py
+
+from typing import Callable
+
+from animals import Animals
+from animals.vision import VISION_COLOR
+from foods import Foods, FoodField
+from water import Water
+
+from .sprites import SpriteCache
+from .shapes import draw_water, draw_visible_foods_lines
+
+FULL_REDRAW_RATIO = 0.5
+
+
+class LayeredRenderer:
+    def __init__(self, screen : py.surface.Surface, background_color : tuple[int, int, int], animal_shape : str = "square") -> None:
+        """Class used to draw the game with cached layers and to only send the changed areas to the display.
+        The static layer holds the background and the water, the scene layer adds the foods on top of it,
+        the animals and their vision are drawn on the screen every frame and erased from the scene layer the next one.
+        Foods, animals and visions are drawn from cached sprites with one `blits` call per kind
+
+        Args:
+            screen (py.surface.Surface): The game screen
+            background_color (tuple[int, int, int]): The RGB color of the background
+            animal_shape (str, optional): "square" or "creature" (the `Assets/creature.png` image). Defaults to "square".
+        """
+        self.screen = screen
+        self.background_color = background_color
+        self.animal_shape = animal_shape
+        self.sprites = SpriteCache()
+        self.static = py.Surface(screen.get_size())
+        self.scene = py.Surface(screen.get_size())
+        self.water_key : tuple | None = None
+        self.water_rect = py.Rect(0, 0, 0, 0)
+        self.previous_rects : list[py.Rect] = []
+        self.full_redraw = True
+        self.field_surface : py.Surface | None = None
+
+    def invalidate(self) -> None:
+        """Redraw every layer and the whole display on the next frame
+        """
+        self.water_key = None
+
+    def prerender(self, animals : Animals, foods : Foods) -> None:
+        """Render the sprites of every current animal and of every size the current foods can shrink to
+
+        Args:
+            animals (Animals): All the animals in the game
+            foods (Foods): All the foods in the game
+        """
+        for animal in animals.animals:
+            self.sprites.get(self.animal_shape, animal.rect.size, animal.color)
+            self.sprites.get("outline", animal.vision.rect.size, VISION_COLOR)
+        if isinstance(foods, FoodField):
+            return
+        for size, color, quantity, size_limit in {(food.size, food.color, food.quantity, food.size_limit) for food in foods.foods}:
+            self.sprites.prerender_foods(size, color, quantity, size_limit)
+
+    def render_static(self, water : Water) -> None:
+        """Pre-render the background and the water, only when the water changed
+
+        Args:
+            water (Water): The water of the world
+        """
+        water_key = (tuple(water.rect), water.quantity)
+        if water_key == self.water_key:
+            return
+        self.water_key = water_key
+        self.water_rect = water.rect.copy()
+        self.static.fill(self.background_color)
+        draw_water(self.static, water)
+        self.full_redraw = True
+
+    def render_scene(self, foods : Foods) -> list[py.Rect]:
+        """Bring the scene layer up to date with the foods
+
+        Args:
+            foods (Foods): All the foods in the game
+
+        Returns:
+            list[py.Rect]: The areas of the scene that changed
+        """
+        if isinstance(foods, FoodField):
+            return self.render_field(foods)
+        
+        foods.track_changes = True
+        changed = foods.changed_rects
+        foods.changed_rects = []
+
+        food_sprite = self.sprites.food_sprite
+        if self.full_redraw:
+            self.scene.blit(self.static, (0, 0))
+            self.scene.blits([(food_sprite(food), food.rect) for food in foods.foods], doreturn=False)
+            return []
+
+        for rect in changed:
+            self.scene.set_clip(rect)
+            self.scene.blit(self.static, rect, rect)
+            self.scene.blits([(food_sprite(food), food.rect) for food in foods.overlapping(rect)], doreturn=False)
+        self.scene.set_clip(None)
+        return changed
+
+    def render_field(self, foods : FoodField) -> list[py.Rect]:
+        """Draw a food field on the scene layer, the quantities are copied in the alpha channel of a one pixel per cell surface
+        through `pygame.surfarray`, then the surface is scaled up to the world and the water is drawn back on top
+
+        Args:
+            foods (FoodField): The food field
+
+        Returns:
+            list[py.Rect]: The whole scene, the field changes every tick
+        """
+        if self.field_surface is None or self.field_surface.get_size() != foods.quantity.shape:
+            self.field_surface = py.Surface(foods.quantity.shape, py.SRCALPHA)
+            self.field_surface.fill((*foods.color, 0))
+        alpha = py.surfarray.pixels_alpha(self.field_surface)
+        np.multiply(foods.quantity, 255 / foods.capacity, out=alpha, casting="unsafe")
+        del alpha
+        
+        self.scene.blit(self.static, (0, 0))
+        self.scene.blit(py.transform.scale(self.field_surface, (foods.columns * foods.cell_size, foods.rows * foods.cell_size)), (0, 0))
+        self.scene.blit(self.static, self.water_rect, self.water_rect)
+        return [self.scene.get_rect()]
+
+    def render(self,
+               water : Water,
+               animals : Animals,
+               foods : Foods,
+               overlays : list[Callable[[py.surface.Surface], py.Rect | None]] | None = None) -> None:
+        """Draw a frame and update the display
+
+        Args:
+            water (Water): The water of the world
+            animals (Animals): All the animals in the game
+            foods (Foods): All the foods in the game
+            overlays (list[Callable[[py.surface.Surface], py.Rect | None]] | None, optional): Functions drawing on top of everything and returning the area they drew. Defaults to None.
+        """
+        self.render_static(water)
+        dirty = self.render_scene(foods)
+
+        if self.full_redraw:
+            self.screen.blit(self.scene, (0, 0))
+        else:
+            dirty += self.previous_rects
+            self.screen.blits([(self.scene, rect, rect) for rect in dirty], doreturn=False)
+
+        get_sprite = self.sprites.get
+        bodies : list[tuple[py.Surface, py.Rect]] = []
+        visions : list[tuple[py.Surface, py.Rect]] = []
+        for animal in animals.animals:
+            rect = animal.rect
+            bodies.append((get_sprite(self.animal_shape, rect.size, animal.color), rect))
+            visions.append((get_sprite("outline", animal.vision.rect.size, VISION_COLOR), animal.vision.rect))
+        rects : list[py.Rect] = self.screen.blits(bodies) + self.screen.blits(visions) # type: ignore
+        for animal in animals.animals:
+            rects += draw_visible_foods_lines(self.screen, animal.vision)
+        for overlay in overlays or []:
+            rect = overlay(self.screen)
+            if rect is not None:
+                rects.append(rect)
+        dirty += rects
+        self.previous_rects = rects
+
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        if self.full_redraw or sum(rect.width * rect.height for rect in dirty) > FULL_REDRAW_RATIO * screen_area:
+            py.display.flip()
+        else:
+            py.display.update(dirty)
+        self.full_redraw = False
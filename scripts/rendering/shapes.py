@@ -0,0 +1,80 @@
+import numpy as np
+import pygame as py
+
+from animals import Animal, Vision
+from foods import Food
+from geometry import Rect
+from water import Water
+
+
+def draw_animal(screen : py.surface.Surface, animal : Animal) -> py.Rect:
+    """Draw an animal as a square of its color
+
+    Args:
+        screen (py.surface.Surface): The surface to draw on
+        animal (Animal): The animal
+
+    Returns:
+        py.Rect: The area of the surface that was drawn
+    """
+    return py.draw.rect(screen, animal.color, animal.rect)
+
+
+def draw_visible_foods_lines(screen : py.surface.Surface, vision : Vision) -> list[py.Rect]:
+    """Draw a line from the center of a vision to every food it sees
+
+    Args:
+        screen (py.surface.Surface): The surface to draw on
+        vision (Vision): The vision
+
+    Returns:
+        list[py.Rect]: The areas of the surface that were drawn
+    """
+    return [py.draw.line(screen, (255, 255, 255), vision.rect.center, food.rect.center, 1) for food in vision.visible_foods]
+
+
+def draw_food(screen : py.surface.Surface, food : Food) -> py.Rect:
+    """Draw a food as a disc of its color
+
+    Args:
+        screen (py.surface.Surface): The surface to draw on
+        food (Food): The food
+
+    Returns:
+        py.Rect: The area of the surface that was drawn
+    """
+    return py.draw.rect(screen, food.color, food.rect, border_radius=90)
+
+
+def draw_field(screen : py.surface.Surface, quantity : np.ndarray, area : Rect, capacity : float, color : tuple[int, int, int]) -> py.Rect:
+    """Draw the cells of a food field, the more food in a cell the more opaque it is
+
+    Args:
+        screen (py.surface.Surface): The surface to draw on
+        quantity (np.ndarray): The quantity of every cell, indexed by column then row
+        area (Rect): The area of the surface covered by the cells
+        capacity (float): The quantity of a full cell
+        color (tuple[int, int, int]): The color of the food
+
+    Returns:
+        py.Rect: The area of the surface that was drawn
+    """
+    surface = py.Surface(quantity.shape, py.SRCALPHA)
+    surface.fill((*color, 0))
+    alpha = py.surfarray.pixels_alpha(surface)
+    np.multiply(quantity, 255 / capacity, out=alpha, casting="unsafe")
+    del alpha
+    return screen.blit(py.transform.scale(surface, area.size), area.topleft)
+
+
+def draw_water(screen : py.surface.Surface, water : Water) -> py.Rect:
+    """Draw a water as a disc
+
+    Args:
+        screen (py.surface.Surface): The surface to draw on
+        water (Water): The water
+
+    Returns:
+        py.Rect: The area of the surface that was drawn
+    """
+    return py.draw.rect(screen, water.COLOR, water.rect, border_radius=90)
@@ -0,0 +1,123 @@
+import os
+
+from collections import OrderedDict
+
+import pygame as py
+
+from foods import Food
+
+CREATURE_IMAGE = os.path.join(os.path.dirname(__file__), "..", "..", "Assets", "creature.png")
+SHAPES = ("square", "rounded", "outline", "creature")
+MAX_CACHED_PIXELS = 1 << 24
+
+
+class SpriteCache:
+    def __init__(self, max_pixels : int = MAX_CACHED_PIXELS) -> None:
+        """Class used to render every (shape, size, color) variant once, so whole populations can be drawn with `Surface.blits`.
+        The sprites draw exactly the pixels of the matching `py.draw.rect` call, the rest of the sprite is transparent.
+        Every zoom level gives new sizes, so the least recently used sprites are dropped once the sprites hold more than `max_pixels` pixels
+
+        Args:
+            max_pixels (int, optional): The number of pixels kept in the cache. Defaults to MAX_CACHED_PIXELS.
+        """
+        self.sprites : OrderedDict[tuple[str, tuple[int, int], tuple[int, int, int]], py.Surface] = OrderedDict()
+        self.max_pixels = max_pixels
+        self.pixels = 0
+        self.creature : py.Surface | None = None
+
+    def get(self, shape : str, size : tuple[int, int], color : tuple[int, int, int]) -> py.Surface:
+        """Get a sprite, it is rendered the first time it is asked or when it was dropped from the cache
+
+        Args:
+            shape (str): "square" (animal), "rounded" (food), "outline" (vision) or "creature" (tinted `Assets/creature.png`)
+            size (tuple[int, int]): The width and height of the sprite
+            color (tuple[int, int, int]): The RGB color of the sprite
+
+        Returns:
+            py.Surface: The sprite
+        """
+        key = (shape, size, color)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = self.sprites[key] = self.render(shape, size, color)
+        self.pixels += size[0] * size[1]
+        while self.pixels > self.max_pixels and len(self.sprites) > 1:
+            (_, (width, height), _), _ = self.sprites.popitem(last=False)
+            self.pixels -= width * height
+        return sprite
+
+    def render(self, shape : str, size : tuple[int, int], color : tuple[int, int, int]) -> py.Surface:
+        """Render a sprite
+
+        Args:
+            shape (str): The shape of the sprite, one of `SHAPES`
+            size (tuple[int, int]): The width and height of the sprite
+            color (tuple[int, int, int]): The RGB color of the sprite
+
+        Raises:
+            ValueError: If the shape is unknown
+
+        Returns:
+            py.Surface: The sprite
+        """
+        if shape == "creature":
+            return self.render_creature(size, color)
+
+        sprite = py.Surface(size)
+        if shape == "square":
+            sprite.fill(color)
+            return sprite
+
+        # the colorkey only has to differ from the sprite color
+        colorkey = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+        sprite.fill(colorkey)
+        sprite.set_colorkey(colorkey, py.RLEACCEL)
+        if shape == "rounded":
+            py.draw.rect(sprite, color, sprite.get_rect(), border_radius=90)
+        elif shape == "outline":
+            py.draw.rect(sprite, color, sprite.get_rect(), 1)
+        else:
+            raise ValueError(f"unknown sprite shape {shape}")
+        return sprite
+
+    def render_creature(self, size : tuple[int, int], color : tuple[int, int, int]) -> py.Surface:
+        """Scale the creature image to the size and tint it with the color
+
+        Args:
+            size (tuple[int, int]): The width and height of the sprite
+            color (tuple[int, int, int]): The RGB color of the sprite
+
+        Returns:
+            py.Surface: The sprite
+        """
+        if self.creature is None:
+            self.creature = py.image.load(CREATURE_IMAGE)
+        sprite = py.transform.scale(self.creature, size)
+        sprite.fill((*color, 255), special_flags=py.BLEND_RGBA_MULT)
+        return sprite
+
+    def prerender_foods(self, size : int, color : tuple[int, int, int], quantity : int, size_limit : int = 2) -> None:
+        """Render every size `Food.set_size` can give to a food while it is eaten
+
+        Args:
+            size (int): The size of the food
+            color (tuple[int, int, int]): The RGB color of the food
+            quantity (int): The starting quantity of the food
+            size_limit (int, optional): The smallest size of a food. Defaults to 2.
+        """
+        for food_size in {max(size_limit, size * (left // 10)) for left in range(quantity + 1)}:
+            self.get("rounded", (food_size, food_size), color)
+
+    def food_sprite(self, food : Food) -> py.Surface:
+        """Get the sprite of a food at its current size
+
+        Args:
+            food (Food): The food
+
+        Returns:
+            py.Surface: The sprite
+        """
+        return self.get("rounded", food.rect.size, food.color)
@@ -0,0 +1,227 @@
+import numpy as np
+import pygame as py
+
+from typing import Callable
+
+from animals import Animals
+from animals.vision import VISION_COLOR
+from foods import Foods, FoodField
+from geometry import PointGrid, Rect, overlaps
+from water import Water
+
+from .camera import Camera
+from .sprites import SpriteCache
+
+LOD_ZOOM = 0.25
+MAX_DETAILED_ANIMALS = 20000
+DENSITY_CELL_SIZE = 64
+ANIMAL_DENSITY_COLOR = (240, 240, 240)
+
+
+class ViewportRenderer:
+    def __init__(self, screen : py.surface.Surface, background_color : tuple[int, int, int], camera : Camera, animal_shape : str = "square") -> None:
+        """Class used to draw the part of a world larger than the screen seen by a `Camera`.
+        Only the entities found by a spatial query on the viewport are drawn. Below `LOD_ZOOM`, or when too many animals are visible,
+        the animals and the foods are drawn as density tiles computed from the counts of the grid cells instead of one sprite each
+
+        Args:
+            screen (py.surface.Surface): The game screen
+            background_color (tuple[int, int, int]): The RGB color of the background
+            camera (Camera): The camera choosing the area and the zoom
+            animal_shape (str, optional): "square" or "creature" (the `Assets/creature.png` image). Defaults to "square".
+        """
+        self.screen = screen
+        self.background_color = background_color
+        self.camera = camera
+        self.animal_shape = animal_shape
+        self.sprites = SpriteCache()
+        self.locator : PointGrid | None = None
+        self.locator_key : tuple[int, int] | None = None
+        self.locator_margin = 0
+        self.drawn_animals = 0
+        self.drawn_foods = 0
+
+    def invalidate(self) -> None:
+        """Everything is drawn again every frame, nothing is cached between frames except the animal locator of the current tick
+        """
+        self.locator_key = None
+
+    def prerender(self, animals : Animals, foods : Foods) -> None:
+        """The sprites depend on the zoom, they are rendered the first time they are drawn
+
+        Args:
+            animals (Animals): All the animals in the game
+            foods (Foods): All the foods in the game
+        """
+
+    def animal_locator(self, animals : Animals) -> PointGrid:
+        """Get the animals bucketed by grid cell, built once per simulation tick with `locator_margin`, the size of the biggest animal
+
+        Args:
+            animals (Animals): All the animals in the game
+
+        Returns:
+            PointGrid: The grid of the animal centers, its results are rows of the population
+        """
+        key = (animals.timers.tick, animals.population.count)
+        if self.locator is None or key != self.locator_key:
+            self.locator = animals.population.locator(DENSITY_CELL_SIZE)
+            self.locator_margin = int(animals.population.size[:animals.population.count].max())
+            self.locator_key = key
+        return self.locator
+
+    def render(self,
+               water : Water,
+               animals : Animals,
+               foods : Foods,
+               overlays : list[Callable[[py.surface.Surface], py.Rect | None]] | None = None) -> None:
+        """Draw a frame and update the display
+
+        Args:
+            water (Water): The water of the world
+            animals (Animals): All the animals in the game
+            foods (Foods): All the foods in the game
+            overlays (list[Callable[[py.surface.Surface], py.Rect | None]] | None, optional): Functions drawing on top of everything. Defaults to None.
+        """
+        self.screen.fill(self.background_color)
+        view = self.camera.viewport()
+        self.draw_water(water, view)
+        self.draw_foods(foods, view)
+        self.draw_animals(animals, view)
+        for overlay in overlays or []:
+            overlay(self.screen)
+        py.display.flip()
+
+    def draw_water(self, water : Water, view : Rect) -> None:
+        """Draw the water if it is in the viewport
+
+        Args:
+            water (Water): The water of the world
+            view (Rect): The viewport
+        """
+        if not water.rect.colliderect(view):
+            return
+        x, y = self.camera.to_screen(np.array(water.rect.x), np.array(water.rect.y))
+        size = int(self.camera.scale(np.array(water.rect.width)))
+        py.draw.rect(self.screen, water.COLOR, (int(x), int(y), size, size), border_radius=90)
+
+    def draw_foods(self, foods : Foods, view : Rect) -> None:
+        """Draw the foods of the viewport, as density tiles when zoomed out
+
+        Args:
+            foods (Foods): All the foods in the game
+            view (Rect): The viewport
+        """
+        if isinstance(foods, FoodField):
+            self.draw_field(foods, view)
+            return
+        if self.camera.zoom < LOD_ZOOM:
+            columns, rows, counts = foods.counts(view)
+            self.draw_density(columns, rows, counts, foods.cell_size, foods.foods[0].color if foods.foods else (0, 0, 0))
+            self.drawn_foods = 0
+            return
+
+        visible = foods.overlapping(view)
+        if not visible:
+            self.drawn_foods = 0
+            return
+        boxes = np.array([tuple(food.rect) for food in visible], dtype=np.int64)
+        x, y = self.camera.to_screen(boxes[:, 0], boxes[:, 1])
+        sizes = self.camera.scale(boxes[:, 2])
+        get_sprite = self.sprites.get
+        self.screen.blits([(get_sprite("rounded", (size, size), food.color), (left, top))
+                           for food, left, top, size in zip(visible, x.tolist(), y.tolist(), sizes.tolist())], doreturn=False)
+        self.drawn_foods = len(visible)
+
+    def draw_field(self, foods : FoodField, view : Rect) -> None:
+        """Draw the cells of a food field overlapping the viewport, scaled to the zoom
+
+        Args:
+            foods (FoodField): The food field
+            view (Rect): The viewport
+        """
+        first_column, first_row = foods.cell_of(view.left, view.top)
+        last_column, last_row = foods.cell_of(view.right - 1, view.bottom - 1)
+        quantity = foods.quantity[first_column:last_column + 1, first_row:last_row + 1]
+        surface = py.Surface(quantity.shape, py.SRCALPHA)
+        surface.fill((*foods.color, 0))
+        alpha = py.surfarray.pixels_alpha(surface)
+        np.multiply(quantity, 255 / foods.capacity, out=alpha, casting="unsafe")
+        del alpha
+        self.blit_cells(surface, first_column, first_row, foods.cell_size)
+        self.drawn_foods = 0
+
+    def draw_animals(self, animals : Animals, view : Rect) -> None:
+        """Draw the animals of the viewport and their vision, as density tiles when zoomed out or when too many are visible
+
+        Args:
+            animals (Animals): All the animals in the game
+            view (Rect): The viewport
+        """
+        self.drawn_animals = 0
+        population = animals.population
+        if population.count == 0:
+            return
+        locator = self.animal_locator(animals)
+        # an animal is found by its center, the ones overlapping the viewport have their center at most one animal size outside
+        margin = self.locator_margin
+        search = Rect(view.x - margin, view.y - margin, view.width + 2 * margin, view.height + 2 * margin)
+        cells = locator.cells_in(search.x, search.y, search.width, search.height)
+        if self.camera.zoom < LOD_ZOOM or locator.cell_counts[cells].sum() > MAX_DETAILED_ANIMALS:
+            self.draw_density(*locator.cell_coordinates(cells), locator.cell_counts[cells], locator.cell_size, ANIMAL_DENSITY_COLOR)
+            return
+
+        rows = locator.within(search.x, search.y, search.width, search.height)
+        x, y, size = population.x[rows], population.y[rows], population.size[rows]
+        rows = rows[overlaps(x, y, size, size, view.x, view.y, view.width, view.height)]
+        if len(rows) == 0:
+            return
+        screen_x, screen_y = self.camera.to_screen(population.x[rows], population.y[rows])
+        sizes = self.camera.scale(population.size[rows])
+        get_sprite = self.sprites.get
+        visible = [animals.animals[row] for row in rows.tolist()]
+        self.screen.blits([(get_sprite(self.animal_shape, (size, size), animal.color), (left, top))
+                           for animal, left, top, size in zip(visible, screen_x.tolist(), screen_y.tolist(), sizes.tolist())], doreturn=False)
+
+        boxes = np.array([tuple(animal.vision.rect) for animal in visible], dtype=np.int64)
+        vision_x, vision_y = self.camera.to_screen(boxes[:, 0], boxes[:, 1])
+        widths, heights = self.camera.scale(boxes[:, 2]), self.camera.scale(boxes[:, 3])
+        self.screen.blits([(get_sprite("outline", (width, height), VISION_COLOR), (left, top))
+                           for left, top, width, height in zip(vision_x.tolist(), vision_y.tolist(), widths.tolist(), heights.tolist())], doreturn=False)
+        self.drawn_animals = len(rows)
+
+    def draw_density(self, columns : np.ndarray, rows : np.ndarray, counts : np.ndarray, cell_size : int, color : tuple[int, int, int]) -> None:
+        """Draw one tile per grid cell whose opacity grows with the number of entities in it, on a logarithmic scale
+
+        Args:
+            columns (np.ndarray): The column of every non empty cell
+            rows (np.ndarray): The row of every non empty cell
+            counts (np.ndarray): The number of entities of every cell
+            cell_size (int): The width and height of a cell, in world units
+            color (tuple[int, int, int]): The RGB color of the tiles
+        """
+        if len(counts) == 0:
+            return
+        first_column, first_row = int(columns.min()), int(rows.min())
+        density = np.zeros((int(columns.max()) - first_column + 1, int(rows.max()) - first_row + 1), dtype=np.float64)
+        density[columns - first_column, rows - first_row] = np.log1p(counts)
+        surface = py.Surface(density.shape, py.SRCALPHA)
+        surface.fill((*color, 0))
+        alpha = py.surfarray.pixels_alpha(surface)
+        np.multiply(density, 255 / density.max(), out=alpha, casting="unsafe")
+        del alpha
+        self.blit_cells(surface, first_column, first_row, cell_size)
+
+    def blit_cells(self, surface : py.Surface, first_column : int, first_row : int, cell_size : int) -> None:
+        """Scale a surface holding one pixel per grid cell to the zoom and draw it at the place of its first cell
+
+        Args:
+            surface (py.Surface): The surface, one pixel per cell
+            first_column (int): The column of the first cell
+            first_row (int): The row of the first cell
+            cell_size (int): The width and height of a cell, in world units
+        """
+        columns, rows = surface.get_size()
+        x, y = self.camera.to_screen(np.array(first_column * cell_size), np.array(first_row * cell_size))
+        width, height = self.camera.scale(np.array([columns * cell_size, rows * cell_size])).tolist()
+        self.screen.blit(py.transform.scale(surface, (width, height)), (int(x), int(y)))
@@ -0,0 +1,149 @@
+import numpy as np
+import pygame as py
+
+from animals import Animal, Population
+from foods import Food
+from geometry import Rect, overlaps
+from water import Water
+
+from game import Screen, BACKGROUND_COLOR
+from rendering import Camera
+from rendering.shapes import draw_animal, draw_field, draw_food, draw_water
+from simulation.recorder import TrajectoryReader, unpack_color
+
+SEEK_TICKS = 60
+MAX_SPEED = 64
+
+
+class ReplayViewer:
+    def __init__(self, screen : Screen, reader : TrajectoryReader) -> None:
+        """Class used to replay a recording with the game drawing code, without running the simulation.
+        SPACE pauses, LEFT/RIGHT seek (one tick when paused), UP/DOWN change the speed, HOME/END go to the start/end.
+        A `Camera` shows the part of the world that fits on the screen, the mouse wheel zooms and the right button moves it like in the game
+
+        Args:
+            screen (Screen): The game screen
+            reader (TrajectoryReader): The recording to replay
+        """
+        self.screen = screen
+        self.reader = reader
+        self.clock = py.time.Clock()
+        self.running = True
+        self.paused = False
+        self.speed = 1
+        self.tick = reader.first_tick
+        self.camera = Camera(reader.width, reader.height, screen.screen_witdh, screen.screen_height)
+        
+    def seek(self, tick : int) -> None:
+        """Go to a tick, the tick is kept inside the recording
+
+        Args:
+            tick (int): The tick to go to
+        """
+        self.tick = min(max(tick, self.reader.first_tick), self.reader.last_tick)
+        
+    def to_screen(self, rect : Rect) -> Rect:
+        """Get the area of the screen showing an area of the world
+
+        Args:
+            rect (Rect): The area in the world
+
+        Returns:
+            Rect: The area on the screen
+        """
+        x, y = self.camera.to_screen(np.array(rect.x), np.array(rect.y))
+        width, height = self.camera.scale(np.array([rect.width, rect.height])).tolist()
+        return Rect(int(x), int(y), width, height)
+        
+    def draw_frame(self, frame : dict) -> None:
+        """Draw the part of a recorded tick seen by the camera
+
+        Args:
+            frame (dict): The columns of the tick
+        """
+        screen = self.screen.screen
+        self.screen.change_background_color(BACKGROUND_COLOR)
+        view = self.camera.viewport()
+        
+        water = Water(*(int(value) for value in frame["water"]))
+        water.rect = self.to_screen(water.rect)
+        draw_water(screen, water)
+        field = self.reader.field
+        if field is not None:
+            cell_size = field["cell_size"]
+            first_column, first_row = view.left // cell_size, view.top // cell_size
+            quantity = frame["field"][first_column:(view.right - 1) // cell_size + 1, first_row:(view.bottom - 1) // cell_size + 1]
+            area = self.to_screen(Rect(first_column * cell_size, first_row * cell_size, quantity.shape[0] * cell_size, quantity.shape[1] * cell_size))
+            draw_field(screen, quantity, area, field["capacity"], unpack_color(field["color"]))
+        
+        x, y, size = frame["animals.x"], frame["animals.y"], frame["animals.size"]
+        visible = np.flatnonzero(overlaps(x, y, size, size, view.x, view.y, view.width, view.height))
+        screen_x, screen_y = self.camera.to_screen(x[visible], y[visible])
+        population = Population(len(visible))
+        for left, top, width in zip(screen_x.tolist(), screen_y.tolist(), self.camera.scale(size[visible]).tolist()):
+            population.add(left, top, width, 0, 0)
+        for index, color in enumerate(frame["animals.color"][visible].tolist()):
+            draw_animal(screen, Animal.view(population, index, unpack_color(color)))
+            
+        for x, y, size, quantity, color in zip(*(frame[f"foods.{column}"].tolist() for column in ("x", "y", "size", "quantity", "color"))):
+            food = Food(size, unpack_color(color), x, y, quantity)
+            if food.rect.colliderect(view):
+                food.rect = self.to_screen(food.rect)
+                draw_food(screen, food)
+            
+    def handle_key(self, key : int) -> None:
+        """Handle the replay controls
+
+        Args:
+            key (int): The pressed key
+        """
+        step = 1 if self.paused else SEEK_TICKS * self.speed
+        if key == py.K_SPACE:
+            self.paused = not self.paused
+        elif key == py.K_RIGHT:
+            self.seek(self.tick + step)
+        elif key == py.K_LEFT:
+            self.seek(self.tick - step)
+        elif key == py.K_UP:
+            self.speed = min(self.speed * 2, MAX_SPEED)
+        elif key == py.K_DOWN:
+            self.speed = max(self.speed // 2, 1)
+        elif key == py.K_HOME:
+            self.seek(self.reader.first_tick)
+        elif key == py.K_END:
+            self.seek(self.reader.last_tick)
+            
+    def move_camera(self, event : py.event.Event) -> None:
+        """Zoom with the mouse wheel around the cursor and move the camera while the right button is held
+
+        Args:
+            event (py.event.Event): The event to check
+        """
+        if event.type == py.MOUSEWHEEL:
+            self.camera.zoom_at(event.y, *py.mouse.get_pos())
+        elif event.type == py.MOUSEMOTION and event.buttons[2]:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+        
+    def run(self) -> None:
+        """The main replay loop.
+        """
+        while self.running:
+            self.clock.tick(60)
+            
+            frame = self.reader.frame(self.tick)
+            if frame is not None:
+                self.draw_frame(frame)
+                py.display.set_caption(f"Replay - tick {self.tick} - x{self.speed}{' - paused' if self.paused else ''}")
+            py.display.flip()
+            
+            if not self.paused:
+                self.seek(self.tick + self.speed)
+            
+            for event in py.event.get():
+                if event.type == py.QUIT:
+                    self.running = False
+                elif event.type == py.KEYDOWN:
+                    self.handle_key(event.key)
+                else:
+                    self.move_camera(event)
+        py.quit()
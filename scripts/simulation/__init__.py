@@ -0,0 +1,2 @@
+from .simulation import Simulation
+from .settings import Settings
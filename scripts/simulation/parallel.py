@@ -0,0 +1,701 @@
+import multiprocessing as mp
+import traceback
+
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from animals import Population
+from animals.population import DIRECTION_CHANGE_TICKS
+from entity_pool import Handle
+from foods import Foods
+from foods.food_locator import FoodLocator
+from geometry import Rect
+from timing_wheel import TimingWheel
+
+from .simulation import Simulation
+
+# what a tile finds out about the target of one of its animals before the feeding:
+# no target, a removed food, a food eaten before this tick, a food it is not hungry for anymore, a food it walks to, a food it touches
+NO_TARGET, STALE, EATEN, SATED, REACHING, EATING = range(6)
+
+ANIMAL_COLUMNS = {"food_storage": np.int64, "max_food_storage": np.int64, "food_removing_quantity": np.int64, "food_removing_cooldown": np.int64,
+                  "hunger_threshold": np.int64, "hunger_due": np.int64, "target_slot": np.int64, "target_generation": np.int64,
+                  "stop_moving": np.bool_, "vision_x": np.int64, "vision_y": np.int64, "vision_width": np.int64, "vision_height": np.int64,
+                  "steering": np.bool_, "target_x": np.int64, "target_y": np.int64}
+FOOD_COLUMNS = {"food_x": np.int64, "food_y": np.int64, "food_width": np.int64, "food_quantity": np.int64, "food_center_x": np.int64,
+                "food_center_y": np.int64, "food_slot": np.int64}
+SLOT_COLUMNS = {"slot_generation": np.int64, "slot_index": np.int64}
+
+
+class SharedArrays:
+    def __init__(self) -> None:
+        """Class used to hold NumPy arrays living in `multiprocessing.shared_memory` blocks, another process can attach them
+        from their `layout`
+        """
+        self.blocks : dict[str, SharedMemory] = {}
+        self.arrays : dict[str, np.ndarray] = {}
+
+    def create(self, name : str, dtype : type, shape : tuple[int, ...]) -> np.ndarray:
+        """Create a zeroed shared array, replacing the array of the same name
+
+        Args:
+            name (str): The name of the array
+            dtype (type): The type of the values
+            shape (tuple[int, ...]): The shape of the array
+
+        Returns:
+            np.ndarray: The array
+        """
+        self.release(name)
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        block = SharedMemory(create=True, size=nbytes)
+        self.blocks[name] = block
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        self.arrays[name][...] = 0
+        return self.arrays[name]
+
+    def attach(self, layout : dict[str, tuple[str, str, tuple[int, ...]]]) -> None:
+        """Attach the arrays created by another process, replacing the arrays of the same names
+
+        Args:
+            layout (dict[str, tuple[str, str, tuple[int, ...]]]): The block name, type and shape of every array
+        """
+        for name, (block_name, dtype, shape) in layout.items():
+            self.release(name, unlink=False)
+            block = SharedMemory(name=block_name)
+            self.blocks[name] = block
+            self.arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    def layout(self) -> dict[str, tuple[str, str, tuple[int, ...]]]:
+        """Get what another process needs to attach every array
+
+        Returns:
+            dict[str, tuple[str, str, tuple[int, ...]]]: The block name, type and shape of every array
+        """
+        return {name: (self.blocks[name].name, array.dtype.str, array.shape) for name, array in self.arrays.items()}
+
+    def release(self, name : str, unlink : bool = True) -> None:
+        """Forget an array and close its block
+
+        Args:
+            name (str): The name of the array
+            unlink (bool, optional): Whether the block is destroyed, only the process that created it does it. Defaults to True.
+        """
+        block = self.blocks.pop(name, None)
+        self.arrays.pop(name, None)
+        if block is not None:
+            block.close()
+            if unlink:
+                block.unlink()
+
+    def release_all(self, unlink : bool = True) -> None:
+        """Forget every array and close their blocks
+
+        Args:
+            unlink (bool, optional): Whether the blocks are destroyed. Defaults to True.
+        """
+        for name in list(self.blocks):
+            self.release(name, unlink)
+
+
+def tile_of(population : Population, rows : np.ndarray | slice, tile_width : int, tile_height : int, tiles_x : int, tiles_y : int) -> np.ndarray:
+    """Get the tile containing the center of every given row, the centers outside the world go to the closest tile
+
+    Args:
+        population (Population): The population
+        rows (np.ndarray | slice): The rows
+        tile_width (int): The width of a tile
+        tile_height (int): The height of a tile
+        tiles_x (int): The number of tile columns
+        tiles_y (int): The number of tile rows
+
+    Returns:
+        np.ndarray: The index of the tile of every row
+    """
+    center_x, center_y = population.centers(rows)
+    return np.clip(center_x // tile_width, 0, tiles_x - 1) + tiles_x * np.clip(center_y // tile_height, 0, tiles_y - 1)
+
+
+def renumber(positions : np.ndarray, old : np.ndarray, new : np.ndarray) -> np.ndarray:
+    """Follow the removals of a tick: every position found in `old` becomes the matching position of `new`, -1 for the removed entities
+
+    Args:
+        positions (np.ndarray): The positions (rows of animals or indexes of foods) before the removals
+        old (np.ndarray): The positions that changed
+        new (np.ndarray): Where every position of `old` went, -1 when its entity was removed
+
+    Returns:
+        np.ndarray: The positions after the removals
+    """
+    if len(old) == 0 or len(positions) == 0:
+        return positions
+    order = np.argsort(old)
+    old, new = old[order], new[order]
+    found = np.minimum(np.searchsorted(old, positions), len(old) - 1)
+    return np.where(old[found] == positions, new[found], positions)
+
+
+class Removals:
+    def __init__(self) -> None:
+        """Class used to follow the swap removals of a dense list (the population rows, the foods) during one tick,
+        to tell the tiles where the entities they own went
+        """
+        self.origins : dict[int, int] = {}
+        self.removed : list[int] = []
+
+    def remove(self, index : int, last : int) -> None:
+        """An entity was removed, the last one took its position
+
+        Args:
+            index (int): The position of the removed entity
+            last (int): The position of the last entity before the removal
+        """
+        self.removed.append(self.origins.pop(index, index))
+        if index != last:
+            self.origins[index] = self.origins.pop(last, last)
+
+    def moves(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the positions before the removals that changed and where they went (see `renumber`)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The old and the new positions
+        """
+        old = np.array(self.removed + list(self.origins.values()), dtype=np.int64)
+        new = np.array([-1] * len(self.removed) + list(self.origins), dtype=np.int64)
+        return old, new
+
+
+class Tile:
+    def __init__(self, tile : int, shared : SharedArrays) -> None:
+        """The state of a worker process: the animals inside its tile, the foods they can see (the foods of the tile and of the halo around it)
+        and the classification of their targets during a tick
+
+        Args:
+            tile (int): The index of the tile
+            shared (SharedArrays): The attached arrays
+        """
+        self.tile = tile
+        self.shared = shared
+        self.population = Population(1)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.foods = np.empty(0, dtype=np.int64)
+        self.width = self.height = 1
+        self.tile_width = self.tile_height = 1
+        self.tiles_x = self.tiles_y = 1
+        self.kinds = np.empty(0, dtype=np.int64)
+        self.targets = np.empty(0, dtype=np.int64)
+        self.wandering = np.empty(0, dtype=bool)
+
+    def attach(self, layout : dict, world : tuple[int, int], tiles : tuple[int, int, int, int], count : int, food_count : int, halo : int) -> int:
+        """Attach the shared arrays, then take the animals inside the tile and the foods whose box reaches the tile or its halo
+
+        Args:
+            layout (dict): The layout of the shared arrays
+            world (tuple[int, int]): The world width and height
+            tiles (tuple[int, int, int, int]): The tile width and height, the number of tile columns and rows
+            count (int): The number of animals
+            food_count (int): The number of foods
+            halo (int): The width of the band around the tile whose foods the animals of the tile can see
+
+        Returns:
+            int: The number of animals of the tile
+        """
+        self.shared.attach(layout)
+        arrays = self.shared.arrays
+        self.width, self.height = world
+        self.tile_width, self.tile_height, self.tiles_x, self.tiles_y = tiles
+        self.population = Population.from_columns({column: arrays[column] for column in Population.COLUMNS}, count)
+
+        rows = np.arange(count)
+        self.rows = rows[tile_of(self.population, rows, *tiles) == self.tile]
+
+        left = (self.tile % self.tiles_x) * self.tile_width - halo
+        top = (self.tile // self.tiles_x) * self.tile_height - halo
+        right, bottom = left + self.tile_width + 2 * halo, top + self.tile_height + 2 * halo
+        food_x, food_y, food_width = arrays["food_x"][:food_count], arrays["food_y"][:food_count], arrays["food_width"][:food_count]
+        self.foods = np.flatnonzero((food_x + food_width >= left) & (food_x <= right) & (food_y + food_width >= top) & (food_y <= bottom))
+        return len(self.rows)
+
+    def feed(self,
+             tick : int,
+             animal_old : np.ndarray,
+             animal_new : np.ndarray,
+             immigrants : np.ndarray,
+             food_old : np.ndarray,
+             food_new : np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Start a tick: follow the removals of the last tick and take the immigrants, clamp the animals and classify their targets.
+        The animals touching their food are the ones that may eat it, the foods they touch are the contested foods of the tick
+
+        Args:
+            tick (int): The tick
+            animal_old (np.ndarray): The rows that changed at the end of the last tick
+            animal_new (np.ndarray): Where they went, -1 for the removed animals
+            immigrants (np.ndarray): The rows of the animals that moved into the tile
+            food_old (np.ndarray): The foods that changed at the end of the last tick
+            food_new (np.ndarray): Where they went, -1 for the removed foods
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The rows of the animals touching their food and their food,
+            the rows of the animals whose food was eaten before this tick and their food
+        """
+        arrays = self.shared.arrays
+        rows = renumber(self.rows, animal_old, animal_new)
+        self.rows = np.sort(np.concatenate((rows[rows >= 0], immigrants)))
+        foods = renumber(self.foods, food_old, food_new)
+        self.foods = np.sort(foods[foods >= 0])
+        rows = self.rows
+
+        self.population.clamp(rows, self.width, self.height)
+        x, y, size = self.population.x[rows], self.population.y[rows], self.population.size[rows]
+        center_x, center_y = x + size // 2, y + size // 2
+        arrays["vision_x"][rows] = center_x - arrays["vision_width"][rows] // 2
+        arrays["vision_y"][rows] = center_y - arrays["vision_height"][rows] // 2
+        arrays["steering"][rows] = False
+
+        slot = arrays["target_slot"][rows]
+        targeting = slot >= 0
+        safe_slot = np.maximum(slot, 0)
+        targets = np.where(targeting & (arrays["slot_generation"][safe_slot] == arrays["target_generation"][rows]), arrays["slot_index"][safe_slot], -1)
+        food = np.maximum(targets, 0)
+        quantity = arrays["food_quantity"][food]
+        food_x, food_y, food_width = arrays["food_x"][food], arrays["food_y"][food], arrays["food_width"][food]
+        hungry = arrays["food_storage"][rows] <= arrays["hunger_threshold"][rows]
+        touching = (food_width > 0) & (x < food_x + food_width) & (food_x < x + size) & (y < food_y + food_width) & (food_y < y + size)
+
+        kinds = np.full(len(rows), NO_TARGET, dtype=np.int64)
+        kinds[targeting] = STALE
+        kinds[(targets >= 0) & (quantity <= 0)] = EATEN
+        available = (targets >= 0) & (quantity > 0)
+        kinds[available & ~hungry] = SATED
+        kinds[available & hungry] = REACHING
+        kinds[available & hungry & touching] = EATING
+        self.kinds, self.targets = kinds, targets
+
+        eating, eaten = kinds == EATING, kinds == EATEN
+        return rows[eating], targets[eating], rows[eaten], targets[eaten]
+
+    def claims(self, contested : np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the animals of the tile going to a contested food, their turn in the order of the rows decides what they find there
+
+        Args:
+            contested (np.ndarray): The contested foods
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The rows, the kind of target and the food of every animal
+        """
+        claiming = (self.kinds >= SATED) & np.isin(self.targets, contested)
+        return self.rows[claiming], self.kinds[claiming], self.targets[claiming]
+
+    def locate(self, tick : int, contested : np.ndarray, pending : np.ndarray) -> np.ndarray:
+        """Finish the feeding of the animals whose food is not contested (the coordinator did the others), give the hungry animals without target
+        the closest food inside their vision, among the foods of the tile and of its halo, then pause or restart the direction timers
+
+        Args:
+            tick (int): The tick
+            contested (np.ndarray): The contested foods
+            pending (np.ndarray): The foods waiting to be removed, they can't be targeted
+
+        Returns:
+            np.ndarray: The rows whose direction timer is due this tick
+        """
+        arrays = self.shared.arrays
+        rows, kinds = self.rows, self.kinds
+        local = ~((kinds >= SATED) & np.isin(self.targets, contested))
+
+        dropping = rows[local & ((kinds == STALE) | (kinds == EATEN) | (kinds == SATED))]
+        arrays["target_slot"][dropping] = -1
+        arrays["stop_moving"][dropping] = False
+        reaching = local & (kinds == REACHING)
+        arrays["stop_moving"][rows[reaching]] = True
+        arrays["steering"][rows[reaching]] = True
+        arrays["target_x"][rows[reaching]] = arrays["food_center_x"][self.targets[reaching]]
+        arrays["target_y"][rows[reaching]] = arrays["food_center_y"][self.targets[reaching]]
+
+        seekers = rows[(arrays["target_slot"][rows] < 0) & (arrays["food_storage"][rows] <= arrays["hunger_threshold"][rows])]
+        foods = self.foods[~np.isin(self.foods, pending)]
+        if len(seekers) and len(foods):
+            left, top = arrays["vision_x"][seekers], arrays["vision_y"][seekers]
+            center_x, center_y = self.population.centers(seekers)
+            locator = FoodLocator(arrays["food_center_x"][foods], arrays["food_center_y"][foods])
+            closest = locator.closest(center_x, center_y, left, top, arrays["vision_width"][seekers], arrays["vision_height"][seekers])
+            found = closest >= 0
+            slots = arrays["food_slot"][foods[closest[found]]]
+            arrays["target_slot"][seekers[found]] = slots
+            arrays["target_generation"][seekers[found]] = arrays["slot_generation"][slots]
+
+        # like `Animals.pause_direction_timers`, the direction only counts the ticks an animal wanders
+        self.wandering = ~arrays["stop_moving"][rows]
+        direction_due, direction_count = self.population.direction_due, self.population.direction_count
+        timed = direction_due[rows] >= 0
+        paused = rows[timed & ~self.wandering]
+        direction_count[paused] = DIRECTION_CHANGE_TICKS - 1 - (direction_due[paused] - tick)
+        direction_due[paused] = -1
+        restarted = rows[~timed & self.wandering]
+        self.population.schedule_directions(restarted, tick)
+        return rows[direction_due[rows] == tick]
+
+    def move(self, tick : int) -> tuple[int, int, np.ndarray, np.ndarray, np.ndarray]:
+        """Move the animals (their new directions are drawn by the coordinator), consume their food storage when their hunger timer is due
+        and remove life from the starving ones. The animals that left the tile are given to the coordinator
+
+        Args:
+            tick (int): The tick
+
+        Returns:
+            tuple[int, int, np.ndarray, np.ndarray, np.ndarray]: The food digested, the life lost, the rows of the dead animals,
+            the rows of the animals that left the tile and the tile they went to
+        """
+        arrays = self.shared.arrays
+        population, rows = self.population, self.rows
+        steering = rows[arrays["steering"][rows]]
+        population.steer(steering, arrays["target_x"][steering], arrays["target_y"][steering])
+        population.move_along(rows[self.wandering])
+
+        hungry = rows[arrays["hunger_due"][rows] == tick]
+        storage = arrays["food_storage"][hungry]
+        digested = np.maximum(0, storage - arrays["food_removing_quantity"][hungry])
+        arrays["food_storage"][hungry] = digested
+        arrays["hunger_due"][hungry] = np.maximum(tick + arrays["food_removing_cooldown"][hungry], tick + 1)
+
+        starving = rows[arrays["food_storage"][rows] <= 0]
+        population.life[starving] -= 1
+        dead = starving[population.life[starving] <= 0]
+
+        tiles = tile_of(population, rows, self.tile_width, self.tile_height, self.tiles_x, self.tiles_y)
+        leaving = tiles != self.tile
+        self.rows = rows[~leaving]
+        return int((storage - digested).sum()), len(starving), dead, rows[leaving], tiles[leaving]
+
+
+def _tile_worker(connection : Connection, tile_index : int) -> None:
+    """Run the commands received on the connection for one tile until the stop sentinel (None) is received
+
+    Args:
+        connection (Connection): The worker end of the pipe shared with the coordinator
+        tile_index (int): The index of the tile
+    """
+    shared = SharedArrays()
+    tile = Tile(tile_index, shared)
+    while True:
+        message = connection.recv()
+        if message is None:
+            shared.release_all(unlink=False)
+            return
+        command, params = message
+        try:
+            connection.send(("ok", getattr(tile, command)(*params)))
+        except Exception:
+            connection.send(("failed", traceback.format_exc(limit=3)))
+
+
+class TiledEngine:
+    def __init__(self, simulation : Simulation, tiles_x : int = 2, tiles_y : int = 2) -> None:
+        """Class used to advance a world over a grid of tiles, one worker process per tile, with the same results as `Simulation.step` for the same seed.
+        The population, the state the ticks change in the animals (storages, targets, timers) and the foods live in shared memory.
+        A tile owns the animals whose center is inside it, an animal leaving it migrates to the next tile at the end of the tick.
+        It also owns the foods of its area and reads the foods of a halo around it, as wide as the biggest vision, so the vision of an animal near a border
+        still sees the foods of its neighbours; the foods eaten during a tick are written back to the shared arrays before the tiles look for food.
+        The tiles clamp, feed, find the foods and move their animals; the coordinator only walks the animals going to a food touched by an animal
+        this tick and the animals whose direction changes, in the order of the rows, so every random number is drawn in the order of a single process.
+        The objects of the simulation are only brought up to date by `close`.
+        Only the world of foods items without drinking, interactions, events nor observers is supported
+
+        Args:
+            simulation (Simulation): The world to advance
+            tiles_x (int, optional): The number of tile columns. Defaults to 2.
+            tiles_y (int, optional): The number of tile rows. Defaults to 2.
+
+        Raises:
+            ValueError: If the world uses something the tiles do not support
+        """
+        settings = simulation.settings
+        if not isinstance(simulation.foods, Foods) or settings.drinking or settings.interactions:
+            raise ValueError("the tiles only support the items food model, without drinking nor interactions")
+        if any(simulation.events.on.values()) or simulation.observers:
+            raise ValueError("the tiles do not support events nor observers")
+        if tiles_x < 1 or tiles_y < 1:
+            raise ValueError(f"invalid tile grid {tiles_x}x{tiles_y}")
+
+        self.simulation = simulation
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.tile_width = -(-simulation.width // tiles_x)
+        self.tile_height = -(-simulation.height // tiles_y)
+        self.shared = SharedArrays()
+        self.animal_moves = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.food_moves = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.immigrants = [np.empty(0, dtype=np.int64) for _ in range(tiles_x * tiles_y)]
+        self.emigrants = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.share()
+
+        # the workers have to share the resource tracker of this process, else each of them destroys the blocks it attached when it stops
+        resource_tracker.ensure_running()
+        self.connections : list[Connection] = []
+        self.processes : list[mp.Process] = []
+        for tile in range(tiles_x * tiles_y):
+            connection, worker_connection = mp.Pipe()
+            process = mp.Process(target=_tile_worker, args=(worker_connection, tile), daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        arrays = self.shared.arrays
+        vision = max(int(arrays["vision_width"].max(initial=0)), int(arrays["vision_height"].max(initial=0)))
+        population = simulation.animals.population
+        halo = vision + max(1, int(population.speed[:population.count].max(initial=0)))
+        self.call("attach", [(self.shared.layout(), (simulation.width, simulation.height), (self.tile_width, self.tile_height, tiles_x, tiles_y),
+                              population.count, len(simulation.foods), halo)] * len(self.connections))
+
+    def share(self) -> None:
+        """Move the population into shared memory and copy the state of the animals and of the foods next to it
+        """
+        animals, foods = self.simulation.animals, self.simulation.foods
+        animals.schedule_restored()
+        population = animals.population
+        for column in Population.COLUMNS:
+            values = getattr(population, column)
+            setattr(population, column, self.shared.create(column, np.int64, (population.capacity,)))
+            getattr(population, column)[:population.count] = values[:population.count]
+
+        columns = {name: self.shared.create(name, dtype, (population.capacity,)) for name, dtype in ANIMAL_COLUMNS.items()}
+        for index, animal in enumerate(animals.animals):
+            handler = animal.food_handler
+            columns["food_storage"][index] = handler.food_storage
+            columns["max_food_storage"][index] = handler.max_food_storage
+            columns["food_removing_quantity"][index] = handler.food_removing_quantity
+            columns["food_removing_cooldown"][index] = handler.food_removing_cooldown
+            columns["hunger_threshold"][index] = handler.hunger_threshold
+            columns["hunger_due"][index] = animal.hunger_timer.tick
+            columns["target_slot"][index], columns["target_generation"][index] = animal.targeted_food if animal.targeted_food is not None else (-1, 0)
+            columns["stop_moving"][index] = animal.stop_moving
+            columns["vision_x"][index], columns["vision_y"][index] = animal.vision.rect.x, animal.vision.rect.y
+            columns["vision_width"][index], columns["vision_height"][index] = animal.vision.width, animal.vision.height
+
+        count = len(foods)
+        columns = {name: self.shared.create(name, dtype, (max(1, count),)) for name, dtype in FOOD_COLUMNS.items()}
+        for index, food in enumerate(foods.foods):
+            columns["food_x"][index], columns["food_y"][index] = food.x, food.y
+            columns["food_width"][index] = food.rect.width
+            columns["food_quantity"][index] = food.quantity
+        columns["food_center_x"][:count], columns["food_center_y"][:count] = foods.centers[:count, 0], foods.centers[:count, 1]
+        columns["food_slot"][:count] = foods.pool.item_slots
+        slots = len(foods.pool.generations)
+        self.shared.create("slot_generation", np.int64, (max(1, slots),))[:slots] = foods.pool.generations
+        self.shared.create("slot_index", np.int64, (max(1, slots),))[:slots] = foods.pool.slot_indexes
+
+    def call(self, command : str, params : list[tuple]) -> list:
+        """Run a command on every worker and wait for all of them
+
+        Args:
+            command (str): The name of the command
+            params (list[tuple]): The parameters of every worker
+
+        Raises:
+            RuntimeError: If a worker failed
+
+        Returns:
+            list: The result of every worker
+        """
+        for connection, values in zip(self.connections, params):
+            connection.send((command, values))
+        results = [connection.recv() for connection in self.connections]
+        for status, payload in results:
+            if status != "ok":
+                raise RuntimeError(f"tile worker failed: {payload}")
+        return [payload for _, payload in results]
+
+    def run(self, ticks : int) -> None:
+        """Advance the world by several ticks, stop early if every animal is dead, like `Simulation.run`
+
+        Args:
+            ticks (int): The number of ticks to run
+        """
+        simulation = self.simulation
+        for _ in range(ticks):
+            if simulation.is_extinct():
+                break
+            self.step()
+            simulation.profiler.end_tick(simulation.tick)
+
+    def step(self) -> None:
+        """Advance the world by one tick, like `Simulation.step`
+        """
+        simulation = self.simulation
+        profiler = simulation.profiler
+        simulation.events.tick = simulation.tick
+        with profiler.phase("simulation.step"):
+            if simulation.animals.population.count > 0:
+                self.step_animals(simulation.tick)
+        with profiler.phase("simulation.despawn"):
+            self.apply_despawns()
+        with profiler.phase("foods.step"):
+            simulation.foods.step()
+        simulation.tick += 1
+        if simulation.tick % simulation.history.every == 0:
+            simulation.history.record(simulation.statistics())
+
+    def step_animals(self, tick : int) -> None:
+        """Advance the animals by one tick, like `Animals.step`
+
+        Args:
+            tick (int): The tick
+        """
+        simulation = self.simulation
+        animals, profiler = simulation.animals, simulation.profiler
+        population = animals.population
+        workers = len(self.connections)
+
+        with profiler.phase("animals.feeding"):
+            fed = self.call("feed", [(tick, *self.animal_moves, immigrants, *self.food_moves) for immigrants in self.immigrants])
+            contested = np.unique(np.concatenate([eating for _, eating, _, _ in fed]))
+            rows = [eaten_rows for _, _, eaten_rows, _ in fed]
+            kinds = [np.full(len(eaten_rows), EATEN, dtype=np.int64) for eaten_rows in rows]
+            foods = [eaten for _, _, _, eaten in fed]
+            if len(contested):
+                for claiming, claim_kinds, claimed in self.call("claims", [(contested,)] * workers):
+                    rows.append(claiming)
+                    kinds.append(claim_kinds)
+                    foods.append(claimed)
+            self.feed(np.concatenate(rows), np.concatenate(kinds), np.concatenate(foods), contested)
+
+        with profiler.phase("animals.vision"):
+            pool = simulation.foods.pool
+            pending = np.array([index for index in (pool.index(handle) for handle in pool.pending) if index >= 0], dtype=np.int64)
+            due = np.sort(np.concatenate(self.call("locate", [(tick, contested, pending)] * workers)))
+
+        with profiler.phase("animals.movement"):
+            # like `Animals.change_directions`, one number is drawn per row in the order of the rows
+            if len(due):
+                population.redirect(due, animals.directions)
+                population.direction_count[due] = 0
+                population.schedule_directions(due, tick + 1)
+            moved = self.call("move", [(tick,)] * workers)
+
+        with profiler.phase("animals.starvation"):
+            animals.stats.digest(sum(digested for digested, _, _, _, _ in moved))
+            animals.stats.starve(sum(starving for _, starving, _, _, _ in moved))
+            for index in np.sort(np.concatenate([dead for _, _, dead, _, _ in moved])).tolist():
+                animals.despawn_animal(animals.pool.handle(index))
+            self.emigrants = (np.concatenate([rows for _, _, _, rows, _ in moved]), np.concatenate([tiles for _, _, _, _, tiles in moved]))
+
+    def feed(self, rows : np.ndarray, kinds : np.ndarray, targets : np.ndarray, contested : np.ndarray) -> None:
+        """Feed the animals whose food was eaten before the tick or is contested, in the order of the rows, like the loop of `Animals.step`:
+        an animal touching its food eats a random part of it, the animals coming after it may find it completely eaten and queue it to be removed
+
+        Args:
+            rows (np.ndarray): The rows of the animals
+            kinds (np.ndarray): The kind of target of every animal
+            targets (np.ndarray): The food of every animal
+            contested (np.ndarray): The contested foods
+        """
+        simulation = self.simulation
+        animals, foods = simulation.animals, simulation.foods
+        population, arrays = animals.population, self.shared.arrays
+        order = np.argsort(rows, kind="stable")
+        for index, kind, target in zip(rows[order].tolist(), kinds[order].tolist(), targets[order].tolist()):
+            food = foods.foods[target]
+            if kind == EATEN or kind == SATED or food.is_completely_eaten():
+                if kind == EATEN or food.is_completely_eaten():
+                    foods.despawn_food(Handle(int(arrays["target_slot"][index]), int(arrays["target_generation"][index])))
+                arrays["target_slot"][index] = -1
+                arrays["stop_moving"][index] = False
+                continue
+
+            arrays["stop_moving"][index] = True
+            size = int(population.size[index])
+            if kind == EATING and Rect(int(population.x[index]), int(population.y[index]), size, size).colliderect(food.rect):
+                handler = animals.animals[index].food_handler
+                foods.mark_changed(food.rect)
+                storage = handler.food_storage = int(arrays["food_storage"][index])
+                eaten = handler.eat_food(food, animals.eating)
+                foods.count_eaten(eaten, food)
+                animals.stats.eat(eaten, handler.food_storage - storage)
+                arrays["food_storage"][index] = handler.food_storage
+            arrays["steering"][index] = True
+            arrays["target_x"][index], arrays["target_y"][index] = food.rect.center
+
+        for target in contested.tolist():
+            food = foods.foods[target]
+            arrays["food_quantity"][target] = food.quantity
+            arrays["food_width"][target] = food.rect.width
+            arrays["food_center_x"][target], arrays["food_center_y"][target] = foods.centers[target]
+
+    def apply_despawns(self) -> None:
+        """Remove the dead animals and the eaten foods like `Simulation.step`, mirror the removals in the shared arrays
+        and tell every tile where its animals, its foods and the animals migrating to it went
+        """
+        simulation = self.simulation
+        animals, foods = simulation.animals, simulation.foods
+        arrays = self.shared.arrays
+
+        removals = Removals()
+        for handle in animals.pool.take_despawns():
+            animal = animals.pool.get(handle)
+            if animal is None:
+                continue
+            index, last = animal.index, animals.population.count - 1
+            animal.food_handler.food_storage = int(arrays["food_storage"][index])
+            animals.remove_animal(animal)
+            for name in ANIMAL_COLUMNS:
+                arrays[name][index] = arrays[name][last]
+            removals.remove(index, last)
+        self.animal_moves = removals.moves()
+
+        removals = Removals()
+        for handle in foods.pool.take_despawns():
+            food = foods.pool.get(handle)
+            if food is None:
+                continue
+            index, last = foods.pool.index(handle), len(foods) - 1
+            foods.remove_food(food)
+            for name in FOOD_COLUMNS:
+                arrays[name][index] = arrays[name][last]
+            for slot in (handle.slot, int(arrays["food_slot"][index])):
+                arrays["slot_generation"][slot] = foods.pool.generations[slot]
+                arrays["slot_index"][slot] = foods.pool.slot_indexes[slot]
+            removals.remove(index, last)
+        self.food_moves = removals.moves()
+
+        rows, tiles = self.emigrants
+        rows = renumber(rows, *self.animal_moves)
+        self.immigrants = [rows[(tiles == tile) & (rows >= 0)] for tile in range(len(self.connections))]
+        self.emigrants = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    def sync(self) -> None:
+        """Write the state of the shared arrays back in the animals, their timers are scheduled again before the next tick (see `Animals.restore`)
+        """
+        simulation = self.simulation
+        animals, arrays, tick = simulation.animals, self.shared.arrays, simulation.tick
+        for index, animal in enumerate(animals.animals):
+            handler = animal.food_handler
+            handler.food_storage = int(arrays["food_storage"][index])
+            handler.food_removing_count = handler.food_removing_cooldown - 1 - (int(arrays["hunger_due"][index]) - tick)
+            slot = int(arrays["target_slot"][index])
+            animal.targeted_food = Handle(slot, int(arrays["target_generation"][index])) if slot >= 0 else None
+            animal.stop_moving = bool(arrays["stop_moving"][index])
+            animal.vision.rect.x, animal.vision.rect.y = int(arrays["vision_x"][index]), int(arrays["vision_y"][index])
+        animals.timers = TimingWheel(tick)
+        animals.starving.clear()
+        animals.unscheduled = True
+
+    def close(self) -> None:
+        """Stop the workers, bring the objects of the simulation up to date and give the population private arrays back
+        before the shared memory is destroyed
+        """
+        for connection in self.connections:
+            connection.send(None)
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.processes = [], []
+
+        self.sync()
+        population = self.simulation.animals.population
+        for column in Population.COLUMNS:
+            setattr(population, column, getattr(population, column).copy())
+        self.shared.release_all()
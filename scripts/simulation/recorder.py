@@ -0,0 +1,276 @@
+import itertools
+import json
+import os
+import queue
+import threading
+import weakref
+
+from collections import OrderedDict
+
+import numpy as np
+
+from foods import FoodField
+from .simulation import Simulation
+
+ANIMAL_COLUMNS = ("id", "x", "y", "size", "color", "life", "food_storage", "target")
+FOOD_COLUMNS = ("id", "x", "y", "size", "quantity", "color")
+WATER_COLUMNS = ("x", "y", "size", "quantity")
+INDEX_FILE = "index.json"
+
+
+def pack_color(color : tuple[int, int, int]) -> int:
+    """Pack a RGB color in one integer
+
+    Args:
+        color (tuple[int, int, int]): The color
+
+    Returns:
+        int: The packed color
+    """
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def unpack_color(color : int) -> tuple[int, int, int]:
+    """Unpack a color packed with `pack_color`
+
+    Args:
+        color (int): The packed color
+
+    Returns:
+        tuple[int, int, int]: The RGB color
+    """
+    return (color >> 16) & 255, (color >> 8) & 255, color & 255
+
+
+class EntityIds:
+    def __init__(self) -> None:
+        """Class used to give a stable id to every recorded entity, the entities are not kept alive by it
+        """
+        self.ids : weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.counter = itertools.count()
+
+    def get(self, entity : object) -> int:
+        """Get the id of an entity, a new one is given the first time
+
+        Args:
+            entity (object): The entity
+
+        Returns:
+            int: The id
+        """
+        entity_id = self.ids.get(entity)
+        if entity_id is None:
+            entity_id = self.ids[entity] = next(self.counter)
+        return entity_id
+
+
+class Recorder:
+    def __init__(self, directory : str, chunk_ticks : int = 256, max_pending_chunks : int = 4) -> None:
+        """Class used to record the state of every entity on every tick in compressed columnar chunks.
+        A `FoodField` is recorded as its grid of quantities ("field"), the targets of the animals are then the indexes of the cells.
+        The chunks are written by a background thread, at most `max_pending_chunks` chunks wait in memory,
+        the simulation waits for the writer when they are all taken. If a chunk can't be written, the next `flush` (or `close`) raises the error
+
+        Args:
+            directory (str): The folder the chunks are written to
+            chunk_ticks (int, optional): The number of ticks in a chunk. Defaults to 256.
+            max_pending_chunks (int, optional): The number of chunks that can wait for the writer. Defaults to 4.
+        """
+        self.directory = directory
+        self.chunk_ticks = chunk_ticks
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.ids = EntityIds()
+        self.frames : list[dict[str, np.ndarray]] = []
+        self.chunks : list[dict] = []
+        self.meta : dict = {}
+
+        self.pending : queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+        self.error : Exception | None = None
+        self.writer = threading.Thread(target=self.write_chunks, daemon=True)
+        self.writer.start()
+
+    def __call__(self, simulation : Simulation) -> None:
+        self.record(simulation)
+
+    def record(self, simulation : Simulation) -> None:
+        """Record the current tick of a simulation, can be used as a `Simulation` observer
+
+        Args:
+            simulation (Simulation): The simulation to record
+        """
+        field = simulation.foods if isinstance(simulation.foods, FoodField) else None
+        if not self.meta:
+            self.meta = {"width": simulation.width, "height": simulation.height, "seed": simulation.seed}
+            if field is not None:
+                self.meta["field"] = {"cell_size": field.cell_size, "capacity": field.capacity, "color": pack_color(field.color)}
+
+        animals = simulation.animals.animals
+        if field is not None:
+            targets = [-1 if animal.targeted_food is None else animal.targeted_food.slot for animal in animals]
+        else:
+            targets = [-1 if food is None else self.ids.get(food)
+                       for food in (simulation.foods.get(animal.targeted_food) if animal.targeted_food is not None else None for animal in animals)]
+        population = simulation.animals.population
+        rows = np.array([animal.index for animal in animals], dtype=np.int64)
+        frame = {
+            "tick": np.array([simulation.tick], dtype=np.int64),
+            "animals.id": np.array([self.ids.get(animal) for animal in animals], dtype=np.int64),
+            "animals.x": population.x[rows],
+            "animals.y": population.y[rows],
+            "animals.size": population.size[rows],
+            "animals.color": np.array([pack_color(animal.color) for animal in animals], dtype=np.int64),
+            "animals.life": population.life[rows],
+            "animals.food_storage": np.array([animal.food_handler.food_storage for animal in animals], dtype=np.int64),
+            "animals.target": np.array(targets, dtype=np.int64),
+        }
+        foods = simulation.foods.foods if field is None else []
+        food_values = np.array([(self.ids.get(food), food.x, food.y, food.size, food.quantity, pack_color(food.color)) for food in foods],
+                               dtype=np.int64).reshape(-1, len(FOOD_COLUMNS))
+        for index, column in enumerate(FOOD_COLUMNS):
+            frame[f"foods.{column}"] = food_values[:, index]
+        water = simulation.water
+        frame["water"] = np.array([water.x, water.y, water.size, water.quantity], dtype=np.int64)
+        if field is not None:
+            frame["field"] = field.quantity.copy()
+
+        self.frames.append(frame)
+        if len(self.frames) >= self.chunk_ticks:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the recorded ticks to the writer as one chunk
+
+        Raises:
+            Exception: The error of the writer if it failed to write a chunk, nothing more is recorded
+        """
+        if self.error is not None:
+            raise self.error
+        if not self.frames:
+            return
+        chunk : dict[str, np.ndarray] = {"tick": np.concatenate([frame["tick"] for frame in self.frames]),
+                                         "water": np.stack([frame["water"] for frame in self.frames])}
+        if "field" in self.frames[0]:
+            chunk["field"] = np.stack([frame["field"] for frame in self.frames])
+        for kind, columns in (("animals", ANIMAL_COLUMNS), ("foods", FOOD_COLUMNS)):
+            counts = [len(frame[f"{kind}.id"]) for frame in self.frames]
+            chunk[f"{kind}.offsets"] = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+            for column in columns:
+                chunk[f"{kind}.{column}"] = np.concatenate([frame[f"{kind}.{column}"] for frame in self.frames])
+        self.frames = []
+        self.pending.put(chunk)
+
+    def write_chunks(self) -> None:
+        """Body of the writer thread, write the chunks until the stop sentinel (None) is received.
+        After an error the chunks are only taken from the queue, so the simulation never waits for a writer that stopped writing
+        """
+        while True:
+            chunk = self.pending.get()
+            if chunk is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                name = f"chunk_{len(self.chunks):06d}.npz"
+                np.savez_compressed(os.path.join(self.directory, name), **chunk)
+                self.chunks.append({"file": name, "first_tick": int(chunk["tick"][0]), "last_tick": int(chunk["tick"][-1])})
+                self.write_index()
+            except Exception as error:
+                self.error = error
+
+    def write_index(self) -> None:
+        """Write the list of the chunks, the index is replaced atomically so a reader never sees half of it
+        """
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as file:
+            json.dump({**self.meta, "chunks": self.chunks}, file)
+        os.replace(path + ".tmp", path)
+
+    def close(self) -> None:
+        """Write the last ticks and wait for the writer to finish
+
+        Raises:
+            Exception: The error of the writer if it failed to write a chunk
+        """
+        if self.writer.is_alive():
+            try:
+                self.flush()
+            finally:
+                self.pending.put(None)
+                self.writer.join()
+        if self.error is not None:
+            raise self.error
+
+
+class TrajectoryReader:
+    def __init__(self, directory : str, cached_chunks : int = 2) -> None:
+        """Class used to read a recording, the chunks are only loaded when a tick inside them is asked
+
+        Args:
+            directory (str): The folder of the recording
+            cached_chunks (int, optional): The number of chunks kept in memory. Defaults to 2.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as file:
+            index = json.load(file)
+        self.width = index["width"]
+        self.height = index["height"]
+        self.field : dict | None = index.get("field")
+        self.chunks = index["chunks"]
+        self.first_ticks = [chunk["first_tick"] for chunk in self.chunks]
+        self.cached_chunks = cached_chunks
+        self.cache : OrderedDict[int, dict[str, np.ndarray]] = OrderedDict()
+
+    @property
+    def first_tick(self) -> int:
+        return self.chunks[0]["first_tick"] if self.chunks else 0
+
+    @property
+    def last_tick(self) -> int:
+        return self.chunks[-1]["last_tick"] if self.chunks else 0
+
+    def load_chunk(self, chunk_index : int) -> dict[str, np.ndarray]:
+        """Load a chunk, or get it from the cache
+
+        Args:
+            chunk_index (int): The index of the chunk
+
+        Returns:
+            dict[str, np.ndarray]: The columns of the chunk
+        """
+        if chunk_index in self.cache:
+            self.cache.move_to_end(chunk_index)
+            return self.cache[chunk_index]
+        with np.load(os.path.join(self.directory, self.chunks[chunk_index]["file"])) as data:
+            chunk = {name: data[name] for name in data.files}
+        self.cache[chunk_index] = chunk
+        if len(self.cache) > self.cached_chunks:
+            self.cache.popitem(last=False)
+        return chunk
+
+    def frame(self, tick : int) -> dict[str, np.ndarray] | None:
+        """Get the recorded state of a tick
+
+        Args:
+            tick (int): The tick
+
+        Returns:
+            dict[str, np.ndarray] | None: The columns of the tick ("animals.x", "foods.quantity", "water", "field" for a food field...), None if it was not recorded
+        """
+        chunk_index = int(np.searchsorted(self.first_ticks, tick, side="right")) - 1
+        if chunk_index < 0:
+            return None
+        chunk = self.load_chunk(chunk_index)
+        positions = np.flatnonzero(chunk["tick"] == tick)
+        if len(positions) == 0:
+            return None
+        position = positions[0]
+
+        frame = {"tick": chunk["tick"][position], "water": chunk["water"][position]}
+        if "field" in chunk:
+            frame["field"] = chunk["field"][position]
+        for kind, columns in (("animals", ANIMAL_COLUMNS), ("foods", FOOD_COLUMNS)):
+            start, end = chunk[f"{kind}.offsets"][position], chunk[f"{kind}.offsets"][position + 1]
+            for column in columns:
+                frame[f"{kind}.{column}"] = chunk[f"{kind}.{column}"][start:end]
+        return frame
@@ -0,0 +1,56 @@
+class Settings:
+    def __init__(self,
+                 animal_count : int = 3,
+                 animal_size : tuple[int, int] = (15, 30),
+                 animal_speed : tuple[int, int] = (1, 3),
+                 animal_life : tuple[int, int] = (100, 200),
+                 food_count : int = 30,
+                 food_size : int = 6,
+                 food_quantity : int = 30,
+                 food_model : str = "items",
+                 food_cell_size : int = 8,
+                 food_regrowth : float = 0.02,
+                 food_diffusion : float = 0.05,
+                 drinking : bool = False,
+                 interactions : bool = False) -> None:
+        """Class used to hold the starting conditions of a world, the ranges are inclusive (like `random.randint`)
+
+        Args:
+            animal_count (int, optional): The number of animals. Defaults to 3.
+            animal_size (tuple[int, int], optional): The range of the animal sizes. Defaults to (15, 30).
+            animal_speed (tuple[int, int], optional): The range of the animal speeds. Defaults to (1, 3).
+            animal_life (tuple[int, int], optional): The range of the animal lives. Defaults to (100, 200).
+            food_count (int, optional): The number of foods. Defaults to 30.
+            food_size (int, optional): The size of the foods. Defaults to 6.
+            food_quantity (int, optional): The quantity of every food, and the capacity of a cell of the field model. Defaults to 30.
+            food_model (str, optional): "items" for one `Food` per food, "field" for a `FoodField` raster that grows back. Defaults to "items".
+            food_cell_size (int, optional): The cell size of the field model. Defaults to 8.
+            food_regrowth (float, optional): The growth rate per tick of the field model. Defaults to 0.02.
+            food_diffusion (float, optional): The diffusion rate per tick of the field model. Defaults to 0.05.
+            drinking (bool, optional): Whether the animals get thirsty and walk to the water through the `WaterField`. Defaults to False.
+            interactions (bool, optional): Whether the overlapping animals hunt, compete for their food and leave the crowds (see `Animals.interact`). Defaults to False.
+        """
+        self.animal_count = animal_count
+        self.animal_size = tuple(animal_size)
+        self.animal_speed = tuple(animal_speed)
+        self.animal_life = tuple(animal_life)
+        self.food_count = food_count
+        self.food_size = food_size
+        self.food_quantity = food_quantity
+        self.food_model = food_model
+        self.food_cell_size = food_cell_size
+        self.food_regrowth = food_regrowth
+        self.food_diffusion = food_diffusion
+        self.drinking = drinking
+        self.interactions = interactions
+        
+    def __repr__(self) -> str:
+        return f"Settings({', '.join(f'{key}={value!r}' for key, value in self.to_dict().items())})"
+        
+    def to_dict(self) -> dict:
+        """Get the settings as a dictionary, usable as keyword arguments of `Settings`
+
+        Returns:
+            dict: The settings
+        """
+        return dict(vars(self))
@@ -0,0 +1,143 @@
+import hashlib
+
+from typing import Callable
+
+import numpy as np
+
+from animals import Animals, Animal
+from foods import Foods, FoodField
+from water import Water, WaterField
+from profiler import Profiler
+from random_streams import RandomService
+from world_stats import WorldStats, StatsHistory
+from event_log import EventLog
+
+from .settings import Settings
+
+FOOD_COLOR = (7, 97, 34)
+
+
+class Simulation:
+    def __init__(self, width : int, height : int, seed : int | None = None, settings : Settings | None = None) -> None:
+        """Class used to advance the world one fixed tick at a time, without any drawing
+
+        Args:
+            width (int): The world width
+            height (int): The world height
+            seed (int | None, optional): The seed of the random streams, None for a random world. Defaults to None.
+            settings (Settings | None, optional): The starting conditions, None for the default ones. Defaults to None.
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.settings = settings if settings is not None else Settings()
+        self.tick = 0
+        self.observers : list[Callable[["Simulation"], None]] = []
+        self.profiler = Profiler()
+        self.stats = WorldStats()
+        self.history = StatsHistory()
+        self.events = EventLog()
+        
+        self.rng = RandomService(self.seed)
+        
+        self.animals = Animals([], rng=self.rng, stats=self.stats, events=self.events)
+        
+        world = self.rng.stream("world")
+        count = self.settings.animal_count
+        sizes = world.integers(self.settings.animal_size[0], self.settings.animal_size[1] + 1, count)
+        colors = world.integers(0, 256, count * 3).reshape(count, 3)
+        speeds = world.integers(self.settings.animal_speed[0], self.settings.animal_speed[1] + 1, count)
+        lives = world.integers(self.settings.animal_life[0], self.settings.animal_life[1] + 1, count)
+        xs = world.integers(0, self.width - sizes + 1, count)
+        ys = world.integers(0, self.height - sizes + 1, count)
+        for size, color, speed, life, x, y in zip(sizes.tolist(), colors.tolist(), speeds.tolist(), lives.tolist(), xs.tolist(), ys.tolist()):
+            self.animals.add_animal(Animal(size, tuple(color), x, y, speed, life, self.rng.stream("animals")))
+        
+        if self.settings.food_model == "field":
+            self.foods = FoodField(self.width, self.height, FOOD_COLOR, self.settings.food_cell_size, self.settings.food_quantity,
+                                   self.settings.food_regrowth, self.settings.food_diffusion)
+        else:
+            self.foods = Foods()
+        self.foods.scatter_foods(self.width, self.height, self.settings.food_count, self.settings.food_size, FOOD_COLOR, self.settings.food_quantity,
+                                 self.rng.stream("foods"))
+        self.water = Water(100, 100, 100, 100)
+        self.water_field = WaterField(self.width, self.height)
+        self.water_field.add_source(self.water)
+        
+    def step(self) -> None:
+        """Advance the world by one tick
+        """
+        self.events.tick = self.tick
+        with self.profiler.phase("simulation.step"):
+            self.animals.step(self.foods, self.width, self.height, self.profiler, self.water_field if self.settings.drinking else None,
+                              self.settings.interactions)
+        with self.profiler.phase("simulation.despawn"):
+            self.animals.apply_despawns()
+            self.foods.apply_despawns()
+        with self.profiler.phase("foods.step"):
+            self.foods.step()
+        self.tick += 1
+        if self.tick % self.history.every == 0:
+            self.history.record(self.statistics())
+        
+        with self.profiler.phase("simulation.observers"):
+            for observer in self.observers:
+                observer(self)
+        
+    def run(self, ticks : int) -> None:
+        """Advance the world by several ticks, stop early if every animal is dead
+
+        Args:
+            ticks (int): The number of ticks to run
+        """
+        for _ in range(ticks):
+            if self.is_extinct():
+                break
+            self.step()
+            self.profiler.end_tick(self.tick)
+            
+    def statistics(self) -> dict[str, float]:
+        """Get the statistics of the world, they are kept up to date by the events of the tick so nothing is walked here
+
+        Returns:
+            dict[str, float]: The value of every series of `world_stats.SERIES`
+        """
+        stats = self.stats
+        return {
+            "tick": self.tick,
+            "animals": stats.animals,
+            "mean_life": stats.mean_life,
+            "mean_food_storage": stats.mean_food_storage,
+            "mean_water_storage": stats.mean_water_storage,
+            "food": self.foods.total_quantity(),
+            "water": sum(max(0, water.quantity) for water in self.water_field.sources),
+            "eaten": stats.eaten,
+            "drunk": stats.drunk,
+            "deaths": stats.deaths,
+        }
+            
+    def digest(self) -> str:
+        """Get a hash of the state of the world: the population columns, the storages of the animals and the foods,
+        e.g. to check that runs with the same seed end in the same world, in this process or in another one
+
+        Returns:
+            str: The hexadecimal SHA-256 of the state
+        """
+        self.animals.sync_timers()
+        population = self.animals.population
+        animals = sorted(self.animals.animals, key=lambda animal: animal.index)
+        arrays = [getattr(population, column)[:population.count] for column in population.COLUMNS]
+        arrays.append(np.array([(animal.food_handler.food_storage, animal.water_handler.water_storage) for animal in animals], dtype=np.int64))
+        if isinstance(self.foods, FoodField):
+            arrays.append(self.foods.quantity)
+        else:
+            arrays.append(np.array([(food.x, food.y, food.size, food.quantity) for food in self.foods.foods], dtype=np.int64))
+        return hashlib.sha256(b"".join(np.ascontiguousarray(array).tobytes() for array in arrays)).hexdigest()
+        
+    def is_extinct(self) -> bool:
+        """Check if every animal is dead
+
+        Returns:
+            bool: Whether every animal is dead or not
+        """
+        return len(self.animals.animals) == 0
@@ -0,0 +1,259 @@
+import json
+import struct
+
+from typing import Callable
+
+import numpy as np
+
+from animals import Animal, Animals, Population
+from animals.food_handler import AnimalFoodHandler
+from animals.water_handler import AnimalWaterHandler
+from animals.vision import Vision
+from entity_pool import Handle
+from foods import Food, Foods, FoodField
+from geometry import Rect
+from world_stats import StatsHistory
+
+from .settings import Settings
+from .simulation import Simulation
+
+MAGIC = b"LIFESNAP"
+VERSION = 6
+ALIGNMENT = 64
+PREAMBLE = struct.Struct("<8sIQ")
+
+ANIMAL_COLUMNS = ("color_r", "color_g", "color_b", "vision_scale", "vision_x", "vision_y",
+                  "targeted_food", "stop_moving", "max_food_storage", "food_storage", "food_removing_quantity",
+                  "food_removing_cooldown", "food_removing_count", "hunger_threshold", "max_water_storage", "water_storage",
+                  "water_removing_quantity", "water_removing_cooldown", "water_removing_count", "thirst_threshold", "drinking_quantity")
+FOOD_COLUMNS = ("x", "y", "size", "quantity", "size_limit", "color_r", "color_g", "color_b")
+
+
+def write_arrays(path : str, meta : dict, arrays : dict[str, np.ndarray]) -> None:
+    """Write a snapshot file: a small JSON header followed by the raw arrays, every array aligned so it can be memory-mapped
+
+    Args:
+        path (str): The path of the file
+        meta (dict): The values that are not arrays, must be serializable to JSON
+        arrays (dict[str, np.ndarray]): The arrays to write
+    """
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    header = json.dumps({"meta": meta, "arrays": layout}).encode()
+    data_start = -(-(PREAMBLE.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+
+
+def read_arrays(path : str) -> tuple[dict, dict[str, np.ndarray]]:
+    """Memory-map a snapshot file, the arrays are read-only views on the file and are only read from disk when used
+
+    Args:
+        path (str): The path of the file
+
+    Raises:
+        ValueError: If the file is not a snapshot or has another version
+
+    Returns:
+        tuple[dict, dict[str, np.ndarray]]: The values that are not arrays and the arrays
+    """
+    with open(path, "rb") as file:
+        magic, version, header_length = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} snapshot")
+        header = json.loads(file.read(header_length))
+    data_start = -(-(PREAMBLE.size + header_length) // ALIGNMENT) * ALIGNMENT
+
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {name: np.ndarray(tuple(layout["shape"]), dtype=np.dtype(layout["dtype"]), buffer=mapped, offset=data_start + layout["offset"])
+              for name, layout in header["arrays"].items()}
+    return header["meta"], arrays
+
+
+def save_snapshot(simulation : Simulation, path : str) -> None:
+    """Save the full state of a simulation (animals, foods, water and random streams) to a binary file
+
+    Args:
+        simulation (Simulation): The simulation to save
+        path (str): The path of the file
+    """
+    simulation.animals.sync_timers()
+    animals = sorted(simulation.animals.animals, key=lambda animal: animal.index)
+    population = simulation.animals.population
+
+    # the targets are stored as indexes in the list of foods (cells of a field), the handles of removed foods are stale and stored as -1.
+    # An animal with a stale target drops it and wanders again on its next tick (`remove_eaten_targeted_food`), so it is saved as not stopped
+    arrays : dict[str, np.ndarray] = {}
+    if isinstance(simulation.foods, FoodField):
+        foods = []
+        targets = [animal.targeted_food.slot if animal.targeted_food is not None else -1 for animal in animals]
+        arrays["field.quantity"] = simulation.foods.quantity
+    else:
+        foods = simulation.foods.foods
+        targets = [simulation.foods.pool.index(animal.targeted_food) if animal.targeted_food is not None else -1 for animal in animals]
+
+    for column in Population.COLUMNS:
+        arrays[f"animals.{column}"] = getattr(population, column)[:population.count]
+
+    animal_values = np.array([(*animal.color, animal.vision_scale, animal.vision.rect.x, animal.vision.rect.y,
+                               target, animal.stop_moving and not (animal.targeted_food is not None and target < 0),
+                               animal.food_handler.max_food_storage, animal.food_handler.food_storage, animal.food_handler.food_removing_quantity,
+                               animal.food_handler.food_removing_cooldown, animal.food_handler.food_removing_count, animal.food_handler.hunger_threshold,
+                               animal.water_handler.max_water_storage, animal.water_handler.water_storage, animal.water_handler.water_removing_quantity,
+                               animal.water_handler.water_removing_cooldown, animal.water_handler.water_removing_count, animal.water_handler.thirst_threshold,
+                               animal.water_handler.drinking_quantity)
+                              for animal, target in zip(animals, targets)], dtype=np.int64).reshape(-1, len(ANIMAL_COLUMNS))
+    for index, column in enumerate(ANIMAL_COLUMNS):
+        arrays[f"animals.{column}"] = animal_values[:, index]
+
+    food_values = np.array([(food.x, food.y, food.size, food.quantity, food.size_limit, *food.color) for food in foods],
+                           dtype=np.int64).reshape(-1, len(FOOD_COLUMNS))
+    for index, column in enumerate(FOOD_COLUMNS):
+        arrays[f"foods.{column}"] = food_values[:, index]
+    centers = simulation.foods.centers[:len(foods)] if foods else np.zeros((0, 2), dtype=np.int64)
+    arrays["foods.center_x"], arrays["foods.center_y"] = centers[:, 0], centers[:, 1]
+    arrays["history.values"] = simulation.history.values
+
+    streams = {}
+    for name, (generator_state, block) in simulation.rng.get_state().items():
+        streams[name] = generator_state
+        arrays[f"random.{name}"] = block
+
+    water = simulation.water
+    meta = {
+        "width": simulation.width,
+        "height": simulation.height,
+        "seed": simulation.seed,
+        "tick": simulation.tick,
+        "settings": simulation.settings.to_dict(),
+        "world_food_count": len(foods),
+        "food_total": simulation.foods.total_quantity(),
+        "stats": vars(simulation.stats),
+        "history": {"capacity": simulation.history.capacity, "every": simulation.history.every,
+                    "position": simulation.history.position, "count": simulation.history.count},
+        "water": [water.x, water.y, water.size, water.quantity],
+        "random": {"seed": simulation.rng.seed, "streams": streams},
+    }
+    write_arrays(path, meta, arrays)
+
+
+def load_snapshot(path : str) -> Simulation:
+    """Restore a simulation saved with `save_snapshot`, every column is read from the file in one go.
+    The animals and the foods are not created here: each one is created from its saved row the first time it is read,
+    and the timers of the animals are scheduled before the first tick (see `Animals.restore` and `Foods.restore`)
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        Simulation: The restored simulation, with the state of its random streams and its statistics
+    """
+    meta, arrays = read_arrays(path)
+
+    settings = Settings(**meta["settings"])
+    simulation = Simulation(meta["width"], meta["height"], meta["random"]["seed"], Settings(**{**settings.to_dict(), "animal_count": 0, "food_count": 0}))
+    simulation.seed = meta["seed"]
+    simulation.settings = settings
+    simulation.tick = meta["tick"]
+    simulation.animals = Animals(tick=simulation.tick, rng=simulation.rng, stats=simulation.stats, events=simulation.events)
+
+    if isinstance(simulation.foods, FoodField):
+        simulation.foods.quantity[:] = arrays["field.quantity"]
+        simulation.foods.recount()
+    else:
+        # the center of a food of width w is at x + w // 2, so the width is at most 2 * (center - x) + 1
+        max_food_size = int(np.max(2 * (arrays["foods.center_x"] - arrays["foods.x"]) + 1, initial=0))
+        simulation.foods.restore(meta["world_food_count"], food_creator(simulation.foods, [arrays[f"foods.{column}"] for column in FOOD_COLUMNS]),
+                                 arrays["foods.center_x"], arrays["foods.center_y"], meta["food_total"], max_food_size)
+
+    population = simulation.animals.population
+    count = len(arrays["animals.x"])
+    population.grow(count)
+    for column in Population.COLUMNS:
+        getattr(population, column)[:count] = arrays[f"animals.{column}"]
+    population.count = count
+    simulation.animals.restore(count, animal_creator(simulation.animals, [arrays[f"animals.{column}"] for column in ANIMAL_COLUMNS]))
+
+    # the simulation was created with the default water, its field is only computed again if the saved water is another one
+    water = simulation.water
+    if [water.x, water.y, water.size, water.quantity] != meta["water"]:
+        water.x, water.y, water.size, water.quantity = meta["water"]
+        water.rect = Rect(water.x, water.y, water.set_size(), water.set_size())
+        simulation.water_field.recompute(np.ones((simulation.water_field.columns, simulation.water_field.rows), dtype=bool))
+
+    for name, value in meta["stats"].items():
+        setattr(simulation.stats, name, value)
+    simulation.history = StatsHistory(meta["history"]["capacity"], meta["history"]["every"])
+    simulation.history.values[:] = arrays["history.values"]
+    simulation.history.position, simulation.history.count = meta["history"]["position"], meta["history"]["count"]
+
+    simulation.rng.set_state({name: (generator_state, arrays[f"random.{name}"]) for name, generator_state in meta["random"]["streams"].items()})
+    return simulation
+
+
+def food_creator(foods : Foods, columns : list[np.ndarray]) -> Callable[[int, int], Food]:
+    """Get the function creating a restored food from its saved row without running `Food.__init__`
+
+    Args:
+        foods (Foods): The foods the food is restored in
+        columns (list[np.ndarray]): The saved food columns in the order of `FOOD_COLUMNS`, only the row of a food is read when it is created
+
+    Returns:
+        Callable[[int, int], Food]: The function creating the food of a saved row at a position of `foods`
+    """
+    def create(row : int, position : int) -> Food:
+        x, y, size, quantity, size_limit, r, g, b = (int(column[row]) for column in columns)
+        food = Food.__new__(Food)
+        food.__dict__.update(size=size, color=(r, g, b), x=x, y=y, quantity=quantity, size_limit=size_limit, handle=foods.pool.handle(position))
+        food.rect = Rect(x, y, food.set_size(), food.set_size())
+        return food
+    return create
+
+
+def animal_creator(animals : Animals, columns : list[np.ndarray]) -> Callable[[int, int], Animal]:
+    """Get the function creating a restored animal as a view on its row of the population, without running `Animal.__init__`.
+    The targets are saved as indexes in the list of foods (cells of a field) which are restored in the same order, so the target of index i is `Handle(i, 0)`
+
+    Args:
+        animals (Animals): The animals the animal is restored in, their population already holds the saved rows
+        columns (list[np.ndarray]): The saved animal columns in the order of `ANIMAL_COLUMNS`, only the row of an animal is read when it is created
+
+    Returns:
+        Callable[[int, int], Animal]: The function creating the animal of a saved row at a position of the population
+    """
+    population = animals.population
+
+    def create(row : int, position : int) -> Animal:
+        (r, g, b, vision_scale, vision_x, vision_y, targeted_food, stop_moving, max_food_storage,
+         food_storage, food_removing_quantity, food_removing_cooldown, food_removing_count, hunger_threshold, max_water_storage,
+         water_storage, water_removing_quantity, water_removing_cooldown, water_removing_count, thirst_threshold, drinking_quantity) = (int(column[row]) for column in columns)
+
+        food_handler = AnimalFoodHandler.__new__(AnimalFoodHandler)
+        food_handler.__dict__.update(max_food_storage=max_food_storage, food_storage=food_storage, food_removing_quantity=food_removing_quantity,
+                                     food_removing_cooldown=food_removing_cooldown, food_removing_count=food_removing_count,
+                                     hunger_threshold=hunger_threshold)
+        
+        water_handler = AnimalWaterHandler.__new__(AnimalWaterHandler)
+        water_handler.__dict__.update(max_water_storage=max_water_storage, water_storage=water_storage, water_removing_quantity=water_removing_quantity,
+                                      water_removing_cooldown=water_removing_cooldown, water_removing_count=water_removing_count,
+                                      thirst_threshold=thirst_threshold, drinking_quantity=drinking_quantity)
+
+        size = int(population.size[position])
+        vision = Vision(vision_x, vision_y, size * vision_scale, size * vision_scale)
+
+        animal = Animal.__new__(Animal)
+        animal.__dict__.update(color=(r, g, b), population=population, index=position, food_handler=food_handler, water_handler=water_handler,
+                               vision_scale=vision_scale, vision=vision, targeted_food=Handle(targeted_food, 0) if targeted_food >= 0 else None,
+                               stop_moving=bool(stop_moving), handle=animals.pool.handle(position),
+                               direction_timer=None, hunger_timer=None, thirst_timer=None)
+        return animal
+    return create
@@ -0,0 +1,204 @@
+import csv
+import itertools
+import multiprocessing as mp
+import os
+import traceback
+
+from collections import deque
+from multiprocessing.connection import Connection, wait
+
+from .settings import Settings
+from .simulation import Simulation
+
+RESULT_COLUMNS = ["run", "seed", "status", "ticks", "ticks_to_extinction", "final_population", "food_consumed", "survival_curve", "world_digest", "error"]
+
+
+class SweepJob:
+    def __init__(self, run : int, seed : int, params : dict, ticks : int, width : int, height : int, sample_every : int) -> None:
+        """Class used to describe one headless run of a sweep
+
+        Args:
+            run (int): The number of the run in the sweep
+            seed (int): The seed of the world
+            params (dict): The keyword arguments given to `Settings`
+            ticks (int): The maximum number of ticks to run
+            width (int): The world width
+            height (int): The world height
+            sample_every (int): The number of ticks between two points of the survival curve
+        """
+        self.run = run
+        self.seed = seed
+        self.params = params
+        self.ticks = ticks
+        self.width = width
+        self.height = height
+        self.sample_every = sample_every
+
+
+def expand_grid(grid : dict[str, list]) -> list[dict]:
+    """Get every combination of a parameter grid
+
+    Args:
+        grid (dict[str, list]): The values to try for every `Settings` parameter
+
+    Returns:
+        list[dict]: One dictionary of parameters per combination
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_job(job : SweepJob) -> dict:
+    """Run one headless simulation and summarize it, `world_digest` is the `Simulation.digest` of the world it ended in.
+    `food_consumed` is the quantity eaten by the animals, the food that grows back (e.g. a `FoodField`) does not change it
+
+    Args:
+        job (SweepJob): The run to do
+
+    Returns:
+        dict: The summary metrics of the run
+    """
+    simulation = Simulation(job.width, job.height, job.seed, Settings(**job.params))
+    initial_eaten = simulation.stats.eaten
+    survival_curve = [len(simulation.animals.animals)]
+    ticks_to_extinction = None
+
+    while simulation.tick < job.ticks:
+        simulation.step()
+        if simulation.tick % job.sample_every == 0:
+            survival_curve.append(len(simulation.animals.animals))
+        if simulation.is_extinct():
+            ticks_to_extinction = simulation.tick
+            if simulation.tick % job.sample_every != 0:
+                survival_curve.append(len(simulation.animals.animals))
+            break
+
+    return {
+        "ticks": simulation.tick,
+        "ticks_to_extinction": ticks_to_extinction,
+        "final_population": len(simulation.animals.animals),
+        "food_consumed": simulation.stats.eaten - initial_eaten,
+        "survival_curve": " ".join(str(count) for count in survival_curve),
+        "world_digest": simulation.digest(),
+    }
+
+
+def _worker(connection : Connection) -> None:
+    """Run the jobs received on the connection until the stop sentinel (None) is received
+
+    Args:
+        connection (Connection): The worker end of the pipe shared with the sweep
+    """
+    while True:
+        job = connection.recv()
+        if job is None:
+            return
+        try:
+            connection.send(("ok", run_job(job)))
+        except Exception:
+            connection.send(("failed", traceback.format_exc(limit=3)))
+
+
+class SweepWorker:
+    def __init__(self) -> None:
+        """Class used to handle one worker process and the pipe used to talk to it.
+        Every worker has its own pipe, so a worker dying can't block the others and its run is always known
+        """
+        self.connection, worker_connection = mp.Pipe()
+        self.process = mp.Process(target=_worker, args=(worker_connection,), daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.job : SweepJob | None = None
+        
+    def assign(self, job : SweepJob | None) -> None:
+        """Send a job to the worker, None stops it
+
+        Args:
+            job (SweepJob | None): The job to run
+        """
+        self.job = job
+        self.connection.send(job)
+        
+    def stop(self) -> None:
+        """Wait for the worker process to end and close the pipe
+        """
+        self.process.join()
+        self.connection.close()
+
+
+class Sweep:
+    def __init__(self,
+                 grid : dict[str, list],
+                 seeds : list[int],
+                 ticks : int,
+                 width : int = 800,
+                 height : int = 600,
+                 sample_every : int = 100,
+                 workers : int | None = None) -> None:
+        """Class used to run every combination of a parameter grid for every seed, spread over a pool of processes
+
+        Args:
+            grid (dict[str, list]): The values to try for every `Settings` parameter
+            seeds (list[int]): The seeds to run every combination with
+            ticks (int): The maximum number of ticks of every run
+            width (int, optional): The world width. Defaults to 800.
+            height (int, optional): The world height. Defaults to 600.
+            sample_every (int, optional): The number of ticks between two points of the survival curves. Defaults to 100.
+            workers (int | None, optional): The number of processes, None to use every core. Defaults to None.
+        """
+        self.grid = grid
+        self.parameter_names = list(grid)
+        self.seeds = seeds
+        self.ticks = ticks
+        self.width = width
+        self.height = height
+        self.sample_every = sample_every
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+    def jobs(self) -> list[SweepJob]:
+        """Get every run of the sweep
+
+        Returns:
+            list[SweepJob]: The runs
+        """
+        combinations = expand_grid(self.grid)
+        return [SweepJob(run, seed, params, self.ticks, self.width, self.height, self.sample_every)
+                for run, (params, seed) in enumerate(itertools.product(combinations, self.seeds))]
+
+    def run(self, output_path : str) -> None:
+        """Run the sweep and append one row per finished run to a CSV file as soon as it is known.
+        A run raising an exception or killing its process is written with a failed or crashed status and the other runs go on
+
+        Args:
+            output_path (str): The path of the CSV results table
+        """
+        pending = deque(self.jobs())
+        workers = [SweepWorker() for _ in range(min(self.workers, len(pending)))]
+        for worker in workers:
+            worker.assign(pending.popleft())
+        
+        with open(output_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.parameter_names + RESULT_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            
+            while any(worker.job is not None for worker in workers):
+                busy = {worker.connection: worker for worker in workers if worker.job is not None}
+                for connection in wait(list(busy)):
+                    worker = busy[connection] # type: ignore
+                    job : SweepJob = worker.job # type: ignore
+                    try:
+                        status, payload = connection.recv() # type: ignore
+                    except (EOFError, OSError):
+                        worker.process.join()
+                        status, payload = "crashed", f"worker exited with code {worker.process.exitcode}"
+                        worker.connection.close()
+                        workers[workers.index(worker)] = worker = SweepWorker()
+                        
+                    metrics = payload if status == "ok" else {"error": payload}
+                    writer.writerow({**job.params, "run": job.run, "seed": job.seed, "status": status, **metrics})
+                    file.flush()
+                    
+                    worker.assign(pending.popleft() if pending else None)
+                    
+        for worker in workers:
+            worker.stop()
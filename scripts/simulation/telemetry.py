@@ -0,0 +1,242 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+
+from collections import deque
+
+from .simulation import Simulation
+
+
+class Subscriber:
+    def __init__(self, writer : asyncio.StreamWriter, max_frames : int) -> None:
+        """Class used to hold the frames waiting to be sent to one client, the oldest frames are dropped when the client is too slow
+
+        Args:
+            writer (asyncio.StreamWriter): The connection to the client
+            max_frames (int): The number of frames that can wait to be sent
+        """
+        self.writer = writer
+        self.handler = asyncio.current_task()
+        self.frames : deque[bytes] = deque(maxlen=max_frames)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.reported_dropped = 0
+
+    def push(self, frame : bytes) -> None:
+        """Queue a frame, never waits
+
+        Args:
+            frame (bytes): The encoded frame
+        """
+        if len(self.frames) == self.frames.maxlen:
+            self.dropped += 1
+        self.frames.append(frame)
+        self.ready.set()
+
+
+class TelemetryServer:
+    def __init__(self, host : str = "127.0.0.1", port : int = 8765, every : int = 10, max_frames : int = 64) -> None:
+        """Class used to stream the state of a simulation to TCP clients, one JSON object per line.
+        It is a simulation observer: every `every` ticks it sends the aggregates of the world (population, mean life, food, ticks/s),
+        and a client sending {"command": "entities"} gets the position and life of every animal on the next tick.
+        The server runs an asyncio loop on a background thread, the simulation only queues the frames and never waits for a client
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 for any free port. Defaults to 8765.
+            every (int, optional): The number of ticks between two aggregate frames. Defaults to 10.
+            max_frames (int, optional): The number of frames that can wait for a slow client before the oldest are dropped. Defaults to 64.
+        """
+        self.host = host
+        self.port = port
+        self.every = every
+        self.max_frames = max_frames
+
+        self.subscribers : set[Subscriber] = set()
+        self.requests : queue.SimpleQueue[Subscriber] = queue.SimpleQueue()
+        self.last_tick : int | None = None
+        self.last_time = 0.0
+
+        self.loop = asyncio.new_event_loop()
+        self.server : asyncio.base_events.Server | None = None
+        self.started = threading.Event()
+        self.error : OSError | None = None
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+
+    def start(self) -> None:
+        """Start listening, returns once the server accepts connections (`port` then holds the real port)
+
+        Raises:
+            OSError: If the server can't listen, e.g. when the port is already used
+        """
+        self.thread.start()
+        self.started.wait()
+        if self.error is not None:
+            self.thread.join()
+            raise self.error
+
+    def serve(self) -> None:
+        """Body of the background thread, runs the asyncio loop until `close`
+        """
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle_client, self.host, self.port))
+        except OSError as error:
+            self.error = error
+            self.loop.close()
+            self.started.set()
+            return
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    def close(self) -> None:
+        """Stop the server and disconnect every client
+        """
+        if not self.thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def shutdown(self) -> None:
+        """Stop accepting clients, close every connection and wait for their tasks, runs on the server loop
+        """
+        self.server.close() # type: ignore
+        handlers = [subscriber.handler for subscriber in self.subscribers]
+        for subscriber in self.subscribers:
+            subscriber.writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def handle_client(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+        """Serve one client: its frames are written by a separate task while its commands are read here
+
+        Args:
+            reader (asyncio.StreamReader): The incoming side of the connection
+            writer (asyncio.StreamWriter): The outgoing side of the connection
+        """
+        subscriber = Subscriber(writer, self.max_frames)
+        self.subscribers.add(subscriber)
+        sender = asyncio.create_task(self.send_frames(subscriber))
+        try:
+            while line := await reader.readline():
+                try:
+                    command = json.loads(line).get("command")
+                except (ValueError, AttributeError):
+                    command = None
+                if command == "entities":
+                    self.requests.put(subscriber)
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            sender.cancel()
+            writer.close()
+
+    async def send_frames(self, subscriber : Subscriber) -> None:
+        """Write the queued frames of a client, waiting for the client to read them (backpressure)
+
+        Args:
+            subscriber (Subscriber): The client
+        """
+        try:
+            while True:
+                await subscriber.ready.wait()
+                subscriber.ready.clear()
+                while subscriber.frames:
+                    if subscriber.dropped != subscriber.reported_dropped:
+                        subscriber.reported_dropped = subscriber.dropped
+                        subscriber.writer.write(encode({"type": "dropped", "count": subscriber.dropped}))
+                    subscriber.writer.write(subscriber.frames.popleft())
+                    await subscriber.writer.drain()
+        except ConnectionError:
+            subscriber.writer.close()
+
+    def __call__(self, simulation : Simulation) -> None:
+        """Observer of the simulation, called at the end of every tick
+
+        Args:
+            simulation (Simulation): The simulation
+        """
+        if not self.requests.empty():
+            frame = encode(entities_frame(simulation))
+            requested = set()
+            while not self.requests.empty():
+                requested.add(self.requests.get())
+            for subscriber in requested:
+                self.loop.call_soon_threadsafe(subscriber.push, frame)
+
+        if simulation.tick % self.every != 0 or not self.subscribers:
+            return
+        now = time.perf_counter()
+        ticks_per_second = (simulation.tick - self.last_tick) / max(now - self.last_time, 1e-9) if self.last_tick is not None else 0.0
+        self.last_tick, self.last_time = simulation.tick, now
+        self.loop.call_soon_threadsafe(self.publish, encode(aggregates_frame(simulation, ticks_per_second)))
+
+    def publish(self, frame : bytes) -> None:
+        """Queue a frame for every client, runs on the server loop
+
+        Args:
+            frame (bytes): The encoded frame
+        """
+        for subscriber in self.subscribers:
+            subscriber.push(frame)
+
+
+def encode(frame : dict) -> bytes:
+    """Encode a frame as one line of JSON
+
+    Args:
+        frame (dict): The frame
+
+    Returns:
+        bytes: The line
+    """
+    return json.dumps(frame, separators=(",", ":")).encode() + b"\n"
+
+
+def aggregates_frame(simulation : Simulation, ticks_per_second : float) -> dict:
+    """Get the aggregates of the world
+
+    Args:
+        simulation (Simulation): The simulation
+        ticks_per_second (float): The speed of the simulation since the last frame
+
+    Returns:
+        dict: The frame
+    """
+    statistics = simulation.statistics()
+    return {
+        "type": "tick",
+        "tick": simulation.tick,
+        "population": statistics["animals"],
+        "mean_life": statistics["mean_life"],
+        "food": statistics["food"],
+        "ticks_per_second": round(ticks_per_second, 1),
+    }
+
+
+def entities_frame(simulation : Simulation) -> dict:
+    """Get the position, size and life of every animal
+
+    Args:
+        simulation (Simulation): The simulation
+
+    Returns:
+        dict: The frame, one list per column
+    """
+    population = simulation.animals.population
+    rows = slice(0, population.count)
+    return {
+        "type": "entities",
+        "tick": simulation.tick,
+        "width": simulation.width,
+        "height": simulation.height,
+        "x": population.x[rows].tolist(),
+        "y": population.y[rows].tolist(),
+        "size": population.size[rows].tolist(),
+        "life": population.life[rows].tolist(),
+    }
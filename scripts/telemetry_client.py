@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+
+from collections import deque
+
+import pygame as py
+
+PLOTS = (("population", (230, 230, 230)), ("mean_life", (220, 80, 80)), ("food", (60, 170, 90)), ("ticks_per_second", (90, 140, 230)))
+BACKGROUND_COLOR = (20, 20, 24)
+FRAME_RATE = 30
+
+
+class TelemetryClient:
+    def __init__(self, host : str = "127.0.0.1", port : int = 8765, history : int = 600, echo : bool = False) -> None:
+        """Class used to receive the frames of a `TelemetryServer` and keep the last aggregates of every plotted value
+
+        Args:
+            host (str, optional): The address of the server. Defaults to "127.0.0.1".
+            port (int, optional): The port of the server. Defaults to 8765.
+            history (int, optional): The number of aggregate frames kept. Defaults to 600.
+            echo (bool, optional): Whether every received frame is also printed (e.g. on machines without display). Defaults to False.
+        """
+        self.host = host
+        self.port = port
+        self.echo = echo
+        self.history : dict[str, deque[float]] = {name: deque(maxlen=history) for name, _ in PLOTS}
+        self.last_frame : dict = {}
+        self.entities : dict | None = None
+        self.dropped = 0
+        self.connected = False
+        self.writer : asyncio.StreamWriter | None = None
+
+    async def receive(self) -> None:
+        """Read the frames until the server closes the connection
+        """
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.connected = True
+        while line := await reader.readline():
+            self.handle_frame(json.loads(line))
+        self.connected = False
+
+    def handle_frame(self, frame : dict) -> None:
+        """Store a received frame
+
+        Args:
+            frame (dict): The frame
+        """
+        if self.echo:
+            print(json.dumps(frame))
+        if frame["type"] == "tick":
+            self.last_frame = frame
+            for name, _ in PLOTS:
+                self.history[name].append(frame[name])
+        elif frame["type"] == "entities":
+            self.entities = frame
+        elif frame["type"] == "dropped":
+            self.dropped = frame["count"]
+
+    def request_entities(self) -> None:
+        """Ask the server for the animals of the next tick
+        """
+        if self.writer is not None:
+            self.writer.write(b'{"command": "entities"}\n')
+
+
+class TelemetryPlot:
+    def __init__(self, client : TelemetryClient, width : int = 900, height : int = 600) -> None:
+        """Class used to plot the received aggregates in a pygame window, one line chart per value.
+        E asks for the animals of the current tick and draws them on a small map
+
+        Args:
+            client (TelemetryClient): The client receiving the frames
+            width (int, optional): The window width. Defaults to 900.
+            height (int, optional): The window height. Defaults to 600.
+        """
+        self.client = client
+        self.screen = py.display.set_mode((width, height))
+        py.display.set_caption(f"Life simulation telemetry - {client.host}:{client.port}")
+        self.font = py.font.SysFont("monospace", 14)
+        self.running = True
+
+    async def run(self) -> None:
+        """Draw the window until it is closed or the server disconnects
+        """
+        receiver = asyncio.create_task(self.client.receive())
+        while self.running and not receiver.done():
+            for event in py.event.get():
+                if event.type == py.QUIT:
+                    self.running = False
+                elif event.type == py.KEYDOWN and event.key == py.K_e:
+                    self.client.request_entities()
+            self.draw()
+            await asyncio.sleep(1 / FRAME_RATE)
+        receiver.cancel()
+
+    def draw(self) -> None:
+        """Draw every chart and the last entity snapshot
+        """
+        self.screen.fill(BACKGROUND_COLOR)
+        width, height = self.screen.get_size()
+        chart_width = width - 260 if self.client.entities is not None else width
+        chart_height = height // len(PLOTS)
+        for index, (name, color) in enumerate(PLOTS):
+            self.draw_chart(py.Rect(0, index * chart_height, chart_width, chart_height), name, color)
+        if self.client.entities is not None:
+            self.draw_entities(py.Rect(chart_width + 10, 10, 240, 180))
+        status = f"tick {self.client.last_frame.get('tick', '-')}  dropped {self.client.dropped}" + ("" if self.client.connected else "  (connecting)")
+        self.screen.blit(self.font.render(status, True, (160, 160, 160)), (8, height - 20))
+        py.display.flip()
+
+    def draw_chart(self, rect : py.Rect, name : str, color : tuple[int, int, int]) -> None:
+        """Draw the history of one value, scaled to its own range
+
+        Args:
+            rect (py.Rect): The area of the chart
+            name (str): The name of the value
+            color (tuple[int, int, int]): The color of the line
+        """
+        values = self.client.history[name]
+        py.draw.line(self.screen, (50, 50, 56), rect.bottomleft, rect.bottomright)
+        if values:
+            self.screen.blit(self.font.render(f"{name} {values[-1]:g}", True, color), (rect.x + 8, rect.y + 4))
+        if len(values) < 2:
+            return
+        low, high = min(values), max(values)
+        scale = (rect.height - 30) / (high - low) if high > low else 0
+        step = rect.width / (values.maxlen - 1) # type: ignore
+        points = [(rect.x + index * step, rect.bottom - 5 - (value - low) * scale) for index, value in enumerate(values)]
+        py.draw.lines(self.screen, color, False, points)
+
+    def draw_entities(self, rect : py.Rect) -> None:
+        """Draw the animals of the last entity snapshot on a small map
+
+        Args:
+            rect (py.Rect): The area of the map
+        """
+        entities = self.client.entities
+        py.draw.rect(self.screen, (50, 50, 56), rect, 1)
+        if not entities:
+            return
+        width, height = entities["width"], entities["height"]
+        for x, y in zip(entities["x"], entities["y"]):
+            py.draw.circle(self.screen, (230, 230, 230), (rect.x + x * rect.width // width, rect.y + y * rect.height // height), 2)
+        self.screen.blit(self.font.render(f"tick {entities['tick']}", True, (160, 160, 160)), (rect.x, rect.bottom + 4))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plot the telemetry of a running life simulation")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the simulation")
+    parser.add_argument("--port", type=int, default=8765, help="telemetry port of the simulation")
+    parser.add_argument("--print", action="store_true", help="print the frames instead of plotting them")
+    args = parser.parse_args()
+
+    client = TelemetryClient(args.host, args.port, echo=args.print)
+    if args.print:
+        asyncio.run(client.receive())
+    else:
+        py.init()
+        asyncio.run(TelemetryPlot(client).run())
@@ -0,0 +1,90 @@
+class Timer:
+    def __init__(self, tick : int, payload : object) -> None:
+        """Event scheduled on a `TimingWheel`
+
+        Args:
+            tick (int): The tick the event is due
+            payload (object): The value given back when the event is due
+        """
+        self.tick = tick
+        self.payload = payload
+        self.cancelled = False
+
+
+class TimingWheel:
+    def __init__(self, tick : int = 0, slots : int = 64, levels : int = 4) -> None:
+        """Class used to schedule events on simulation ticks, advancing it only touches the events that are due.
+        Level 0 has one slot per tick, every next level has one slot per full turn of the previous one,
+        an event is moved down a level each time the lower level wraps around, events further than every level wait in an overflow list
+
+        Args:
+            tick (int, optional): The next tick to advance. Defaults to 0.
+            slots (int, optional): The number of slots of every level, a power of 2. Defaults to 64.
+            levels (int, optional): The number of levels. Defaults to 4.
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.wheels : list[list[list[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow : list[Timer] = []
+
+    def schedule(self, tick : int, payload : object) -> Timer:
+        """Schedule an event, an event in the past is due on the next tick
+
+        Args:
+            tick (int): The tick the event is due
+            payload (object): The value given back when the event is due
+
+        Returns:
+            Timer: The timer, used to cancel the event
+        """
+        timer = Timer(max(tick, self.tick), payload)
+        self.insert(timer)
+        return timer
+
+    def cancel(self, timer : Timer) -> None:
+        """Cancel an event, it is dropped when its slot is reached
+
+        Args:
+            timer (Timer): The timer of the event
+        """
+        timer.cancelled = True
+
+    def insert(self, timer : Timer) -> None:
+        """Put a timer in the lowest level whose current turn contains its tick
+
+        Args:
+            timer (Timer): The timer
+        """
+        for level in range(self.levels):
+            shift = self.bits * (level + 1)
+            if timer.tick >> shift == self.tick >> shift:
+                self.wheels[level][(timer.tick >> (self.bits * level)) & self.mask].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def advance(self) -> list[object]:
+        """Move to the next tick
+
+        Returns:
+            list[object]: The payloads of the events due on the tick that ended, in a deterministic order
+        """
+        tick = self.tick
+        if tick & ((1 << (self.bits * self.levels)) - 1) == 0:
+            overflow, self.overflow = self.overflow, []
+            for timer in overflow:
+                self.insert(timer)
+        for level in range(self.levels - 1, 0, -1):
+            if tick & ((1 << (self.bits * level)) - 1) == 0:
+                slot = (tick >> (self.bits * level)) & self.mask
+                timers, self.wheels[level][slot] = self.wheels[level][slot], []
+                for timer in timers:
+                    if not timer.cancelled:
+                        self.insert(timer)
+
+        slot = tick & self.mask
+        timers, self.wheels[0][slot] = self.wheels[0][slot], []
+        self.tick += 1
+        return [timer.payload for timer in timers if not timer.cancelled]
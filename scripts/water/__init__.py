@@ -1 +1,2 @@
-from .water import Water
\ No newline at end of file
+from .water import Water
+from .water_field import WaterField
\ No newline at end of file
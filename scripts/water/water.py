@@ -1,4 +1,6 @@
-import pygame as py
+from typing import Callable
+
+from geometry import Rect
 
 
 class Water:
@@ -10,16 +12,29 @@ class Water:
         
         self.COLOR = (16, 27, 194)
         
-        self.rect = py.Rect(self.x, self.y, self.size * (self.quantity // 100), self.size * (self.quantity // 100))
-        
-    def update(self, screen : py.surface.Surface) -> None:
-        self.create(screen)
+        self.rect = Rect(self.x, self.y, self.set_size(), self.set_size())
+        self.listeners : list[Callable[["Water", Rect], None]] = []
         
-    def create(self, screen : py.surface.Surface) -> None:
-        py.draw.rect(screen, self.COLOR, self.rect, border_radius=90)
+    def set_size(self) -> int:
+        """Return the size of the water based on its quantity, `size` for every 100 quantity
+
+        Returns:
+            int: The size of the water
+        """
+        return max(0, self.size * self.quantity // 100)
         
     def decrease_quantity(self, quantity : int) -> None:
+        """Remove quantity from the water, the water shrinks with it and the listeners are told when its rect changed
+
+        Args:
+            quantity (int): The amount of quantity to remove
+        """
+        previous_rect = self.rect.copy()
         self.quantity -= quantity
+        self.rect.size = (self.set_size(), self.set_size())
+        if self.rect != previous_rect:
+            for listener in self.listeners:
+                listener(self, previous_rect)
         
     def is_empty(self) -> bool:
-        return self.quantity <= 0
\ No newline at end of file
+        return self.quantity <= 0
@@ -0,0 +1,148 @@
+import numpy as np
+
+from .water import Water
+from geometry import Rect
+
+
+class WaterField:
+    def __init__(self, width : int, height : int, cell_size : int = 8) -> None:
+        """Grid layer holding, for every cell, the closest water and the step leading to it,
+        so an animal finds its way to the water with one array lookup. The distances are only computed for the cells asked to `steps`.
+        The field is only recomputed when a source shrinks, and then only for the cells whose closest water or step can change (see `source_changed`)
+
+        Args:
+            width (int): The world width
+            height (int): The world height
+            cell_size (int, optional): The width and height of a cell. Defaults to 8.
+        """
+        self.cell_size = cell_size
+        self.columns = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+
+        half = cell_size // 2
+        self.center_x = (np.arange(self.columns) * cell_size + half)[:, np.newaxis]
+        self.center_y = (np.arange(self.rows) * cell_size + half)[np.newaxis, :]
+
+        # indexed (column, row), the steps are -1, 0 or 1 on each axis
+        self.sources : list[Water] = []
+        self.nearest = np.full((self.columns, self.rows), -1, dtype=np.int32)
+        self.step_x = np.zeros((self.columns, self.rows), dtype=np.int8)
+        self.step_y = np.zeros((self.columns, self.rows), dtype=np.int8)
+        self.recomputed_cells = 0
+
+    def add_source(self, water : Water) -> None:
+        """Add a water source, the field listens to it to follow its changes
+
+        Args:
+            water (Water): The water to add
+        """
+        self.sources.append(water)
+        water.listeners.append(self.source_changed)
+        self.recompute(np.ones((self.columns, self.rows), dtype=bool))
+
+    def source_distance(self, water : Water, columns : np.ndarray, rows : np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the distance from some cell centers to the closest point of a water, and the step toward it
+
+        Args:
+            water (Water): The water
+            columns (np.ndarray): The columns of the cells
+            rows (np.ndarray): The rows of the cells
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The distances (inf for an empty water) and the x and y steps
+        """
+        center_x, center_y = self.center_x[columns, 0], self.center_y[0, rows]
+        rect = water.rect
+        if water.is_empty() or rect.width <= 0 or rect.height <= 0:
+            return np.full(len(columns), np.inf, dtype=np.float32), np.zeros(len(columns), dtype=np.int8), np.zeros(len(columns), dtype=np.int8)
+        dx = np.clip(center_x, rect.left, rect.right - 1) - center_x
+        dy = np.clip(center_y, rect.top, rect.bottom - 1) - center_y
+        return np.hypot(dx, dy).astype(np.float32), np.sign(dx).astype(np.int8), np.sign(dy).astype(np.int8)
+
+    def recompute(self, cells : np.ndarray) -> None:
+        """Recompute the closest water of some cells against every source
+
+        Args:
+            cells (np.ndarray): One boolean per cell, True for the cells to recompute
+        """
+        columns, rows = np.nonzero(cells)
+        distance = np.full(len(columns), np.inf, dtype=np.float32)
+        nearest = np.full(len(columns), -1, dtype=np.int32)
+        step_x = np.zeros(len(columns), dtype=np.int8)
+        step_y = np.zeros(len(columns), dtype=np.int8)
+        for index, water in enumerate(self.sources):
+            source_distance, source_x, source_y = self.source_distance(water, columns, rows)
+            closer = source_distance < distance
+            distance[closer] = source_distance[closer]
+            nearest[closer] = index
+            step_x[closer] = source_x[closer]
+            step_y[closer] = source_y[closer]
+
+        self.nearest[columns, rows] = nearest
+        self.step_x[columns, rows] = step_x
+        self.step_y[columns, rows] = step_y
+        self.recomputed_cells += len(columns)
+
+    def source_changed(self, water : Water, previous_rect : Rect) -> None:
+        """Listener of the sources, a source can only shrink so only the cells it was the closest water of can change.
+        When no other source holds water, those cells keep it as their closest water while it is not empty,
+        and only the step of the cells between the previous and the new right (or bottom) border changes
+
+        Args:
+            water (Water): The source that changed
+            previous_rect (Rect): The rect of the source before the change
+        """
+        index = self.sources.index(water)
+        cells = self.nearest == index
+        rect = water.rect
+        alone = all(source.is_empty() for other, source in enumerate(self.sources) if other != index)
+        if alone and not water.is_empty() and rect.width > 0 and rect.height > 0 and rect.topleft == previous_rect.topleft:
+            band_x = (self.center_x > rect.right - 1) & (self.center_x <= previous_rect.right - 1)
+            band_y = (self.center_y > rect.bottom - 1) & (self.center_y <= previous_rect.bottom - 1)
+            cells &= band_x | band_y
+        self.recompute(cells)
+
+    def cells(self, x : np.ndarray, y : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the cells containing some positions, positions outside the world are moved to the closest cell
+
+        Args:
+            x (np.ndarray): The x positions
+            y (np.ndarray): The y positions
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The columns and rows
+        """
+        return np.clip(x // self.cell_size, 0, self.columns - 1), np.clip(y // self.cell_size, 0, self.rows - 1)
+
+    def steps(self, x : np.ndarray, y : np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the step toward the closest water of many positions at once
+
+        Args:
+            x (np.ndarray): The x positions
+            y (np.ndarray): The y positions
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The x and y steps (-1, 0 or 1) and the distances to the water (inf when there is no water)
+        """
+        columns, rows = self.cells(x, y)
+        nearest = self.nearest[columns, rows]
+        distance = np.full(len(columns), np.inf, dtype=np.float32)
+        for index, water in enumerate(self.sources):
+            cells = nearest == index
+            if cells.any():
+                distance[cells] = self.source_distance(water, columns[cells], rows[cells])[0]
+        return self.step_x[columns, rows].astype(np.int64), self.step_y[columns, rows].astype(np.int64), distance
+
+    def source_at(self, x : int, y : int) -> Water | None:
+        """Get the closest water of a position
+
+        Args:
+            x (int): The x position
+            y (int): The y position
+
+        Returns:
+            Water | None: The closest water, None when every source is empty
+        """
+        column, row = min(max(x // self.cell_size, 0), self.columns - 1), min(max(y // self.cell_size, 0), self.rows - 1)
+        nearest = self.nearest[column, row]
+        return self.sources[nearest] if nearest >= 0 else None
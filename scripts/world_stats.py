@@ -0,0 +1,173 @@
+import csv
+import json
+
+import numpy as np
+
+SERIES = ("tick", "animals", "mean_life", "mean_food_storage", "mean_water_storage", "food", "water", "eaten", "drunk", "deaths")
+
+
+class WorldStats:
+    def __init__(self) -> None:
+        """Class used to keep the totals of the animals up to date from the events of `Animals` (spawn, despawn, eat, starve, drink...),
+        so reading them never walks the population. The totals only follow the changes made through these events
+        """
+        self.animals = 0
+        self.life = 0
+        self.food_storage = 0
+        self.water_storage = 0
+
+        self.spawned = 0
+        self.deaths = 0
+        self.eaten = 0
+        self.drunk = 0
+        self.life_lost = 0
+        self.hunted = 0
+
+    def spawn(self, life : int, food_storage : int, water_storage : int) -> None:
+        """An animal was added
+
+        Args:
+            life (int): The life of the animal
+            food_storage (int): The food storage of the animal
+            water_storage (int): The water storage of the animal
+        """
+        self.animals += 1
+        self.spawned += 1
+        self.life += life
+        self.food_storage += food_storage
+        self.water_storage += water_storage
+
+    def despawn(self, life : int, food_storage : int, water_storage : int) -> None:
+        """An animal was removed
+
+        Args:
+            life (int): The life of the animal
+            food_storage (int): The food storage of the animal
+            water_storage (int): The water storage of the animal
+        """
+        self.animals -= 1
+        self.deaths += 1
+        self.life -= life
+        self.food_storage -= food_storage
+        self.water_storage -= water_storage
+
+    def eat(self, eaten : int, stored : int) -> None:
+        """An animal ate a food
+
+        Args:
+            eaten (int): The quantity taken from the food
+            stored (int): The quantity added to the food storage of the animal, less than `eaten` when the storage is full
+        """
+        self.eaten += eaten
+        self.food_storage += stored
+
+    def drink(self, drunk : int) -> None:
+        """An animal drank
+
+        Args:
+            drunk (int): The quantity taken from the water and added to the water storage of the animal
+        """
+        self.drunk += drunk
+        self.water_storage += drunk
+
+    def hunt(self, stored : int) -> None:
+        """An animal ate another one, the prey is reported by `despawn`
+
+        Args:
+            stored (int): The quantity added to the food storage of the predator
+        """
+        self.hunted += 1
+        self.food_storage += stored
+
+    def digest(self, food : int, water : int = 0) -> None:
+        """Food (and water) was removed from the storages by the hunger (and thirst) timers
+
+        Args:
+            food (int): The quantity of food removed
+            water (int, optional): The quantity of water removed. Defaults to 0.
+        """
+        self.food_storage -= food
+        self.water_storage -= water
+
+    def starve(self, life : int) -> None:
+        """Life was removed from starving or dehydrated animals
+
+        Args:
+            life (int): The total life removed
+        """
+        self.life -= life
+        self.life_lost += life
+
+    def mean(self, total : int) -> float:
+        return total / self.animals if self.animals else 0.0
+
+    @property
+    def mean_life(self) -> float:
+        return self.mean(self.life)
+
+    @property
+    def mean_food_storage(self) -> float:
+        return self.mean(self.food_storage)
+
+    @property
+    def mean_water_storage(self) -> float:
+        return self.mean(self.water_storage)
+
+
+class StatsHistory:
+    def __init__(self, capacity : int = 600, every : int = 10) -> None:
+        """Class used to keep the last values of every statistic in fixed-size ring buffers, one row per series of `SERIES`
+
+        Args:
+            capacity (int, optional): The number of samples kept, the oldest are overwritten. Defaults to 600.
+            every (int, optional): The number of ticks between two samples. Defaults to 10.
+        """
+        self.capacity = capacity
+        self.every = every
+        self.values = np.zeros((len(SERIES), capacity), dtype=np.float64)
+        self.rows = {name: index for index, name in enumerate(SERIES)}
+        self.position = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, sample : dict[str, float]) -> None:
+        """Store a sample, overwriting the oldest one when the buffers are full
+
+        Args:
+            sample (dict[str, float]): The value of every series
+        """
+        self.values[:, self.position] = [sample[name] for name in SERIES]
+        self.position = (self.position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def series(self, name : str) -> np.ndarray:
+        """Get the stored values of a series, from the oldest to the newest
+
+        Args:
+            name (str): The name of the series
+
+        Returns:
+            np.ndarray: The values
+        """
+        values = self.values[self.rows[name]]
+        if self.count < self.capacity:
+            return values[:self.count].copy()
+        return np.concatenate((values[self.position:], values[:self.position]))
+
+    def export(self, path : str) -> None:
+        """Write the stored samples to a file, as CSV rows if the path ends with .csv, else as JSON lines
+
+        Args:
+            path (str): The path of the file
+        """
+        columns = [self.series(name).tolist() for name in SERIES]
+        with open(path, "w", newline="") as file:
+            if path.endswith(".csv"):
+                writer = csv.writer(file)
+                writer.writerow(SERIES)
+                writer.writerows(zip(*columns))
+            else:
+                for values in zip(*columns):
+                    file.write(json.dumps(dict(zip(SERIES, values))) + "\n")
@@ -0,0 +1,43 @@
+import numpy as np
+
+from animals import Animal, Animals
+
+
+def chain(*sizes):
+    animals = Animals([Animal(size, (0, 0, 0), 100, 100) for size in sizes])
+    for animal in animals.animals:
+        animal.food_handler.food_storage = 10
+    return animals
+
+
+def test_a_predator_eats_one_prey_per_tick():
+    animals = chain(40, 20, 10)
+    prey = animals.hunt(np.array([0, 0]), np.array([1, 2]))
+    assert prey.tolist() == [1]
+    assert animals.animals[0].food_handler.food_storage == 30
+
+
+def test_a_prey_can_not_hunt():
+    animals = chain(40, 20, 10)
+    prey = animals.hunt(np.array([0, 1]), np.array([1, 2]))
+    assert prey.tolist() == [1]
+
+    animals = chain(40, 20, 10)
+    prey = animals.hunt(np.array([1, 0]), np.array([2, 1]))
+    assert prey.tolist() == [2]
+
+
+def test_only_hungry_and_big_enough_animals_hunt():
+    animals = chain(40, 30, 21)
+    animals.animals[0].food_handler.food_storage = 100
+    prey = animals.hunt(np.array([0, 0, 1]), np.array([1, 2, 2]))
+    assert prey.tolist() == []
+
+
+def test_interact_removes_the_prey_at_the_end_of_the_tick():
+    animals = chain(40, 20, 10)
+    animals.interact()
+    assert len(animals.animals) == 3
+    animals.apply_despawns()
+    assert len(animals.animals) == 2
+    assert sum(animal.food_handler.food_storage > 10 for animal in animals.animals) == 1
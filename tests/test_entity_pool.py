@@ -0,0 +1,38 @@
+from entity_pool import EntityPool, Handle
+
+
+def test_removing_restored_entities_does_not_create_them():
+    created = []
+
+    def create(key, position):
+        created.append((key, position))
+        return f"entity {key} at {position}"
+
+    pool = EntityPool()
+    pool.extend(5, create)
+    assert pool.remove(Handle(1, 0)) == 1
+    assert pool.remove(Handle(1, 0)) == -1
+    assert pool.remove(Handle(3, 0)) == 3
+    assert "entity 0 at 0" not in pool.items
+    assert pool.created(0) is None
+    assert created == []
+
+    assert pool.get(Handle(4, 0)) == "entity 4 at 1"
+    assert created == [(4, 1)]
+    assert list(pool) == ["entity 0 at 0", "entity 4 at 1", "entity 2 at 2"]
+    assert pool.items.missing == 0
+    assert "entity 0 at 0" in pool.items
+    assert [pool.index(Handle(slot, 0)) for slot in range(5)] == [0, -1, 2, -1, 1]
+
+
+def test_removing_a_created_entity_moves_the_key_of_the_last_one():
+    created = []
+    pool = EntityPool()
+    pool.extend(3, lambda key, position: created.append(key) or [key, position])
+    first = pool.get(Handle(0, 0))
+    assert pool.remove(Handle(0, 0)) == 0
+    assert created == [0]
+    assert pool.items.missing == 2
+    assert pool.created(0) is None
+    assert first not in pool.items
+    assert list(pool) == [[2, 0], [1, 1]]
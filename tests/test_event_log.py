@@ -0,0 +1,78 @@
+import pytest
+
+from event_log import EventLog, read_events, to_dict
+from simulation import Simulation, Settings
+
+
+def test_sampling_keeps_an_event_when_the_count_times_the_rate_reaches_a_new_integer():
+    events = EventLog()
+    events.enable("eat", 0.25)
+    events.enable("death", 0.3)
+    for index in range(20):
+        events.tick = index
+        events.emit("eat", index, 100 + index, 5)
+        events.emit("death", index, 0)
+        events.emit("hunt", index, index + 1, 10)
+    assert [event["animal"] for event in events.recent("eat")] == [3, 7, 11, 15, 19]
+    assert [event["animal"] for event in events.recent("death")] == [3, 6, 9, 13, 16, 19]
+    assert events.recent("hunt") == []
+    assert events.recent("eat")[0] == {"tick": 3, "event": "eat", "animal": 3, "food": 103, "eaten": 5}
+
+
+@pytest.mark.parametrize("rate", [0.4, 0.7, 0.01, 1 / 3])
+def test_sampling_keeps_the_rate_asked_for(rate):
+    events = EventLog(capacity=100000)
+    events.enable("eat", rate)
+    for index in range(50000):
+        events.emit("eat", index, 0, 1)
+    assert abs(len(events) - 50000 * rate) <= 1
+
+
+def test_invalid_categories_and_rates_are_refused():
+    events = EventLog()
+    with pytest.raises(ValueError):
+        events.enable("sleep")
+    with pytest.raises(ValueError):
+        events.enable("eat", 0)
+    with pytest.raises(ValueError):
+        events.enable("eat", 1.5)
+
+
+def test_a_full_buffer_drops_the_oldest_events_and_counts_them():
+    events = EventLog(capacity=3)
+    events.enable("starve")
+    for index in range(5):
+        events.emit("starve", index, 10 - index)
+    assert len(events) == 3 and events.dropped == 2
+    assert [event["animal"] for event in events.recent()] == [2, 3, 4]
+
+
+@pytest.mark.parametrize("name", ["events.bin", "events.jsonl"])
+def test_written_events_are_read_back(tmp_path, name):
+    path = str(tmp_path / name)
+    events = EventLog(batch=4, interval=0.01)
+    for category in ("eat", "target", "death", "food_depleted", "hunt"):
+        events.enable(category)
+    events.open(path)
+    expected = []
+    for tick in range(30):
+        events.tick = tick
+        for category, values in (("eat", (tick, tick * 2, 7)), ("target", (tick, -1)), ("food_depleted", (tick, 40 + tick, 50)), ("hunt", (1, 2, tick))):
+            if tick % 3 == 0 or category != "hunt":
+                events.emit(category, *values)
+                expected.append(to_dict((tick, category, *values)))
+    events.close()
+    assert events.written == len(expected) == len(read_events(path))
+    assert read_events(path) == expected
+
+
+def test_logging_does_not_change_a_seeded_world(tmp_path):
+    logged, silent = (Simulation(800, 600, 4, Settings(animal_count=40, food_count=30, interactions=True)) for _ in range(2))
+    logged.events.enable("eat", 0.5)
+    logged.events.enable("hunt")
+    logged.events.open(str(tmp_path / "events.bin"))
+    logged.run(5000)
+    silent.run(5000)
+    logged.events.close()
+    assert {event["event"] for event in read_events(str(tmp_path / "events.bin"))} == {"eat", "hunt"}
+    assert logged.digest() == silent.digest()
@@ -0,0 +1,81 @@
+import numpy as np
+
+from animals import Animal
+from foods import Food, Foods
+from foods.food_locator import FoodLocator
+
+
+def world(seed):
+    rng = np.random.default_rng(seed)
+    foods = Foods()
+    # foods on a coarse lattice so many of them are at the same distance of an animal
+    for x, y, quantity in zip((rng.integers(-2, 42, 400) * 10).tolist(), (rng.integers(-2, 32, 400) * 10).tolist(), rng.integers(1, 40, 400).tolist()):
+        foods.add_food(Food(6, (0, 0, 0), x, y, quantity))
+    animals = [Animal(size, (0, 0, 0), x, y) for x, y, size in zip((rng.integers(-3, 42, 300) * 10).tolist(), (rng.integers(-3, 32, 300) * 10).tolist(),
+                                                                    rng.integers(1, 4, 300).tolist() * 10)]
+    for animal in animals:
+        animal.vision.update_rect(animal.rect)
+    return foods, animals
+
+
+def located(foods, animals):
+    boxes = np.array([tuple(animal.vision.rect) for animal in animals], dtype=np.int64)
+    x = np.array([animal.rect.centerx for animal in animals], dtype=np.int64)
+    y = np.array([animal.rect.centery for animal in animals], dtype=np.int64)
+    return foods.locator().closest(x, y, boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]).tolist()
+
+
+def rebuilt(foods, animals):
+    centers = foods.centers[:len(foods)]
+    pending = [foods.pool.index(handle) for handle in foods.pool.pending]
+    locator = FoodLocator(centers[:, 0].copy(), centers[:, 1].copy(), 64, pending)
+    boxes = np.array([tuple(animal.vision.rect) for animal in animals], dtype=np.int64)
+    x = np.array([animal.rect.centerx for animal in animals], dtype=np.int64)
+    y = np.array([animal.rect.centery for animal in animals], dtype=np.int64)
+    return locator.closest(x, y, boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]).tolist()
+
+
+def test_closest_matches_the_per_animal_search():
+    for seed in range(5):
+        foods, animals = world(seed)
+        for animal, index in zip(animals, located(foods, animals)):
+            visible = animal.vision.query_visible_foods(foods)
+            expected = animal.get_closest_food(visible)
+            if expected is None:
+                assert index == -1
+                continue
+            assert index >= 0
+            found = foods.foods[index]
+            assert animal.vision.is_food_visible(found)
+            assert animal.get_distance_from_food(found) == animal.get_distance_from_food(expected)
+            # ties are won by the first food of the list
+            assert found is animal.get_closest_food(animal.vision.check_visible_foods(foods.foods))
+
+
+def test_closest_leaves_out_the_despawning_foods():
+    foods, animals = world(0)
+    for index in range(0, len(foods), 2):
+        foods.despawn_food(foods.handle(index))
+    kept = [food for index, food in enumerate(foods.foods) if index % 2]
+    for animal, index in zip(animals, located(foods, animals)):
+        expected = animal.get_closest_food(animal.vision.check_visible_foods(kept))
+        assert (index == -1) if expected is None else (foods.foods[index] is expected)
+
+
+def test_the_kept_locator_matches_a_new_one_after_the_foods_change():
+    rng = np.random.default_rng(3)
+    foods, animals = world(1)
+    foods.locator()
+    for _ in range(30):
+        for food in [foods.foods[index] for index in rng.choice(len(foods), 20, replace=False).tolist()]:
+            eaten = min(food.quantity, int(rng.integers(1, 15)))
+            food.remove_quantity(eaten)
+            foods.count_eaten(eaten, food)
+        for index in rng.choice(len(foods), 5, replace=False).tolist():
+            foods.despawn_food(foods.handle(index))
+        x, y = rng.integers(-20, 420, 2).tolist()
+        foods.add_food(Food(6, (0, 0, 0), x, y, int(rng.integers(1, 40))))
+        assert located(foods, animals) == rebuilt(foods, animals)
+        foods.apply_despawns()
+        assert located(foods, animals) == rebuilt(foods, animals)
+    assert sorted(foods.locator().order.tolist()) == list(range(len(foods)))
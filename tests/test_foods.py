@@ -0,0 +1,57 @@
+import numpy as np
+
+from foods import Food, Foods, FoodField
+from geometry import Rect
+
+
+def test_overlapping_finds_foods_stored_left_and_above():
+    foods = Foods()
+    food = Food(6, (0, 0, 0), 56, 10, 30)
+    foods.add_food(food)
+    assert food.rect.colliderect(Rect(73, 10, 20, 20))
+    assert foods.overlapping(Rect(73, 10, 20, 20)) == [food]
+    assert foods.overlapping(Rect(60, 27, 20, 20)) == [food]
+    assert foods.overlapping(Rect(74, 10, 20, 20)) == []
+
+
+def test_overlapping_matches_brute_force():
+    rng = np.random.default_rng(0)
+    foods = Foods()
+    for x, y, quantity in zip(rng.integers(0, 400, 300).tolist(), rng.integers(0, 300, 300).tolist(), rng.integers(1, 60, 300).tolist()):
+        foods.add_food(Food(6, (0, 0, 0), x, y, quantity))
+    for left, top, width, height in zip(rng.integers(-20, 400, 100).tolist(), rng.integers(-20, 300, 100).tolist(),
+                                        rng.integers(1, 80, 100).tolist(), rng.integers(1, 80, 100).tolist()):
+        rect = Rect(left, top, width, height)
+        assert {id(food) for food in foods.overlapping(rect)} == {id(food) for food in foods.foods if food.rect.colliderect(rect)}
+
+
+def test_centers_follow_added_eaten_and_removed_foods():
+    foods = Foods()
+    added = [Food(6, (0, 0, 0), 10 * index, 5 * index, 30 + index) for index in range(200)]
+    for food in added:
+        foods.add_food(food)
+    for food in added[::3]:
+        food.remove_quantity(20)
+        foods.count_eaten(20, food)
+    for food in added[::5]:
+        foods.remove_food(food)
+    assert np.array_equal(foods.centers[:len(foods)], np.array([food.rect.center for food in foods.foods]))
+    locator = foods.locator()
+    assert np.array_equal(locator.x, foods.centers[:len(foods), 0])
+
+
+def test_field_keeps_the_cells_holding_food_without_scanning():
+    rng = np.random.default_rng(0)
+    field = FoodField(200, 160, (0, 0, 0), cell_size=8)
+    for x, y in zip(rng.integers(0, 200, 40).tolist(), rng.integers(0, 160, 40).tolist()):
+        field.deposit(x, y, 5)
+    for step in range(20):
+        for cell in rng.choice(field.occupied_cells(), min(5, len(field)), replace=False).tolist():
+            field.consume(*divmod(cell, field.rows), 4)
+        field.deposit(*rng.integers(0, 160, 2).tolist(), 0.6)
+        if step % 3 == 0 and len(field):
+            field.remove_food(field.foods[0])
+        expected = np.flatnonzero(field.quantity >= 1)
+        assert len(field) == len(expected)
+        assert np.array_equal(field.locator().x, expected // field.rows * field.cell_size + field.cell_size // 2)
+        field.step()
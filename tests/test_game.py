@@ -0,0 +1,45 @@
+import time
+
+import pygame as py
+import pytest
+
+from game import Game, Screen, FRAME_RATE, MAX_SPEED
+from simulation import Simulation, Settings
+
+
+@pytest.fixture
+def game():
+    py.display.init()
+    game = Game(Screen(400, 300), simulation=Simulation(400, 300, 6, Settings(animal_count=20)))
+    yield game
+    py.quit()
+
+
+def test_the_ticks_follow_the_elapsed_time_and_not_the_frame_rate(game):
+    game.ticks_per_frame = 10
+    game.frame_budget = 10.0
+    assert [game.simulate(1 / FRAME_RATE) for _ in range(6)] == [10] * 6
+    # at half the frame rate every frame runs twice the ticks, a frame of a quarter of the frame time runs them over several frames
+    assert [game.simulate(2 / FRAME_RATE) for _ in range(3)] == [20] * 3
+    assert sum(game.simulate(1 / (4 * FRAME_RATE)) for _ in range(8)) == 20
+    assert game.simulation.tick == 140
+
+
+def test_the_ticks_that_do_not_fit_in_the_frame_are_dropped(game):
+    game.ticks_per_frame = 100
+    game.frame_budget = 1e-9
+    assert game.simulate(1 / FRAME_RATE) == 1
+    assert game.accumulator == 0.0
+    assert game.simulate(1 / FRAME_RATE) == 1
+
+
+def test_max_speed_simulates_for_the_frame_budget_left_after_the_render(game):
+    event = py.event.Event(py.KEYDOWN, key=py.K_4)
+    game.change_speed(event)
+    assert game.ticks_per_frame == MAX_SPEED
+    game.frame_budget, game.render_time = 0.2, 0.1
+    start = time.perf_counter()
+    done = game.simulate(0.0)
+    elapsed = time.perf_counter() - start
+    assert done > 1
+    assert 0.1 <= elapsed < 0.2
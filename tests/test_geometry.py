@@ -0,0 +1,22 @@
+import numpy as np
+
+from geometry import PointGrid, contains_points
+
+
+def test_point_grid_finds_the_points_of_a_box_across_the_borders():
+    rng = np.random.default_rng(2)
+    x = rng.integers(-300, 700, 500)
+    y = rng.integers(-300, 700, 500)
+    grid = PointGrid(x, y, 64)
+    for _ in range(200):
+        left, top = rng.integers(-400, 700, 2).tolist()
+        width, height = rng.integers(1, 300, 2).tolist()
+        expected = np.flatnonzero(contains_points(left, top, width, height, x, y))
+        assert sorted(grid.within(left, top, width, height).tolist()) == expected.tolist()
+
+
+def test_point_grid_cells_of_negative_rows_keep_their_coordinates():
+    grid = PointGrid(np.array([-10, 5, 70]), np.array([-70, -1, 130]), 64)
+    cells = grid.cells_in(-64, -128, 192, 320)
+    columns, rows = grid.cell_coordinates(cells)
+    assert sorted(zip(columns.tolist(), rows.tolist(), grid.cell_counts[cells].tolist())) == [(-1, -2, 1), (0, -1, 1), (1, 2, 1)]
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+from simulation import Simulation, Settings
+from simulation.snapshot import load_snapshot
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def run_main(*args : str) -> str:
+    return subprocess.run([sys.executable, "main.py", *args], cwd=SCRIPTS, capture_output=True, text=True, check=True, timeout=300).stdout
+
+
+def test_a_headless_run_advances_the_ticks_asked_for_and_the_same_seed_ends_in_the_same_world(tmp_path):
+    worlds = []
+    for name in ("first", "second"):
+        output = run_main("--headless", "--seed", "4", "--ticks", "300", "--animals", "20", "--foods", "40",
+                          "--save-snapshot", str(tmp_path / f"{name}.snap"))
+        assert output.startswith("ticks=300 ")
+        worlds.append(load_snapshot(str(tmp_path / f"{name}.snap")))
+    assert worlds[0].tick == 300
+    assert worlds[0].digest() == worlds[1].digest()
+
+    simulation = Simulation(800, 600, 4, Settings(animal_count=20, food_count=40))
+    simulation.run(300)
+    assert simulation.digest() == worlds[0].digest()
+
+
+def test_the_simulation_runs_without_pygame():
+    code = "import sys\nfrom simulation import Simulation, Settings\nSimulation(400, 300, 1, Settings(animal_count=10)).run(50)\nassert 'pygame' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS, check=True, timeout=300)
+
+
+def test_run_stops_at_the_extinction():
+    simulation = Simulation(400, 300, 2, Settings(animal_count=0))
+    simulation.run(100)
+    assert simulation.tick == 0
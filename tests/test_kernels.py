@@ -0,0 +1,47 @@
+import argparse
+
+import pytest
+
+from animals import jit_kernels
+from animals.jit_kernels import JitKernels, check_kernels
+from animals.kernels import LocalKernels
+from main import setup_kernels
+from simulation import Simulation, Settings
+
+
+class ShiftedKernels(LocalKernels):
+    def move(self, population, steering, target_x, target_y, wandering):
+        super().move(population, steering, target_x, target_y, wandering)
+        population.x[:population.count] += 1
+
+
+def test_check_kernels_accepts_the_numpy_kernels_and_rejects_different_moves():
+    assert check_kernels(LocalKernels())
+    assert not check_kernels(ShiftedKernels())
+
+
+def test_the_jit_kernels_move_like_the_numpy_kernels():
+    pytest.importorskip("numba")
+    assert jit_kernels.NUMBA_AVAILABLE
+    for seed in range(3):
+        assert check_kernels(JitKernels(), seed=seed)
+
+
+def kernels_after_setup(choice):
+    simulation = Simulation(400, 300, 0, Settings(animal_count=5, food_count=5))
+    setup_kernels(argparse.Namespace(kernels=choice), simulation)
+    return simulation.animals.kernels
+
+
+def test_setup_kernels_falls_back_to_numpy(monkeypatch):
+    assert type(kernels_after_setup("numpy")) is LocalKernels
+
+    monkeypatch.setattr(jit_kernels, "NUMBA_AVAILABLE", False)
+    assert type(kernels_after_setup("jit")) is LocalKernels
+
+    monkeypatch.setattr(jit_kernels, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(jit_kernels, "check_kernels", lambda kernels: False)
+    assert type(kernels_after_setup("jit")) is LocalKernels
+
+    monkeypatch.setattr(jit_kernels, "check_kernels", lambda kernels: True)
+    assert type(kernels_after_setup("jit")) is JitKernels
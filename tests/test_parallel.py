@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from simulation import Simulation, Settings
+from simulation.parallel import TiledEngine
+
+
+def hungry_world() -> Simulation:
+    simulation = Simulation(800, 600, 3, Settings(animal_count=120, food_count=60))
+    # low storages so animals starve, die and empty the foods within a few hundred ticks
+    for index, animal in enumerate(simulation.animals.animals):
+        animal.food_handler.food_storage = 3 + index % 60
+    return simulation
+
+
+@pytest.mark.parametrize("tiles", [(1, 1), (2, 2), (4, 3)])
+def test_tiles_give_the_same_world_as_a_single_process(tiles):
+    local, tiled = hungry_world(), hungry_world()
+    local.run(900)
+    engine = TiledEngine(tiled, *tiles)
+    try:
+        engine.run(900)
+    finally:
+        engine.close()
+
+    assert local.stats.deaths > 0 and len(local.foods) < 60 and len(local.animals.animals) > 0
+    assert tiled.tick == local.tick
+    assert tiled.digest() == local.digest()
+    assert vars(tiled.stats) == vars(local.stats)
+    assert np.array_equal(tiled.history.values, local.history.values)
+    assert [(animal.targeted_food, animal.stop_moving) for animal in tiled.animals.animals] == \
+           [(animal.targeted_food, animal.stop_moving) for animal in local.animals.animals]
+
+    # the timers and targets written back by `close` let the world go on in a single process
+    local.run(300)
+    tiled.run(300)
+    assert tiled.digest() == local.digest()
+
+
+def test_tiles_reject_the_worlds_they_do_not_support():
+    with pytest.raises(ValueError):
+        TiledEngine(Simulation(800, 600, 1, Settings(drinking=True)))
+    with pytest.raises(ValueError):
+        TiledEngine(Simulation(800, 600, 1, Settings(food_model="field")))
@@ -0,0 +1,59 @@
+import csv
+import json
+import time
+
+from profiler import Profiler
+from simulation import Simulation, Settings
+
+
+def test_the_time_of_a_nested_phase_is_taken_out_of_its_parent():
+    profiler = Profiler()
+    profiler.enable()
+    start = time.perf_counter()
+    with profiler.phase("outer"):
+        time.sleep(0.01)
+        with profiler.phase("inner"):
+            time.sleep(0.02)
+    elapsed = time.perf_counter() - start
+    totals = profiler.tick_totals
+    assert 0.02 <= totals["inner"]
+    assert 0.01 <= totals["outer"] <= elapsed - totals["inner"]
+
+
+def test_the_trace_has_one_row_per_phase_and_the_phases_add_up_to_the_tick(tmp_path):
+    simulation = Simulation(1000, 1000, seed=3, settings=Settings(animal_count=50, food_count=200))
+    simulation.profiler.enable()
+    simulation.profiler.open_trace(str(tmp_path / "trace.csv"))
+    durations = []
+    for _ in range(5):
+        start = time.perf_counter()
+        simulation.step()
+        durations.append(time.perf_counter() - start)
+        simulation.profiler.end_tick(simulation.tick)
+    simulation.profiler.close_trace()
+
+    with open(tmp_path / "trace.csv", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert {int(row["tick"]) for row in rows} == {1, 2, 3, 4, 5}
+    phases = {row["phase"] for row in rows}
+    assert {"simulation.step", "animals.movement", "animals.starvation", "foods.step"} <= phases
+    for tick, duration in enumerate(durations, 1):
+        total = sum(float(row["ms"]) for row in rows if int(row["tick"]) == tick)
+        assert 0 <= total <= duration * 1000 + 0.01
+    assert all(float(row["ms"]) >= 0 for row in rows)
+    assert set(simulation.profiler.percentiles()) == phases
+
+
+def test_the_json_trace_has_one_line_per_tick(tmp_path):
+    profiler = Profiler()
+    profiler.enable()
+    profiler.open_trace(str(tmp_path / "trace.jsonl"))
+    for tick in range(3):
+        with profiler.phase("work"):
+            pass
+        profiler.end_tick(tick)
+    profiler.close_trace()
+    with open(tmp_path / "trace.jsonl") as file:
+        lines = [json.loads(line) for line in file]
+    assert [line["tick"] for line in lines] == [0, 1, 2]
+    assert all(set(line) == {"tick", "work"} for line in lines)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from random_streams import RandomService
+from simulation import Simulation, Settings
+from simulation.sweep import SweepJob, SweepWorker
+
+
+def test_negative_seeds_are_used_as_their_two_complement():
+    first, second = RandomService(-1).stream("animals"), RandomService(2**64 - 1).stream("animals")
+    assert np.array_equal(first.uniform(10), second.uniform(10))
+    assert not np.array_equal(RandomService(-2).stream("animals").uniform(10), RandomService(-1).stream("animals").uniform(10))
+
+
+def test_same_seed_gives_the_same_world_in_this_process_and_in_a_sweep_worker():
+    settings = {"animal_count": 50, "food_count": 40, "drinking": True}
+    worlds = [Simulation(800, 600, 9, Settings(**settings)) for _ in range(2)]
+    for world in worlds:
+        world.run(1500)
+    first, second = (world.animals.population for world in worlds)
+    assert first.count == second.count > 0
+    assert all(np.array_equal(getattr(first, column)[:first.count], getattr(second, column)[:second.count]) for column in first.COLUMNS)
+    assert [(food.x, food.y, food.quantity) for food in worlds[0].foods.foods] == [(food.x, food.y, food.quantity) for food in worlds[1].foods.foods]
+    assert worlds[0].foods.total_quantity() == worlds[1].foods.total_quantity()
+
+    worker = SweepWorker()
+    worker.assign(SweepJob(0, 9, settings, 1500, 800, 600, 100))
+    status, result = worker.connection.recv()
+    worker.assign(None)
+    worker.stop()
+    assert status == "ok"
+    assert result["world_digest"] == worlds[0].digest() == worlds[1].digest()
@@ -0,0 +1,53 @@
+import shutil
+
+import pytest
+
+from simulation import Simulation, Settings
+from simulation.recorder import Recorder, TrajectoryReader
+
+
+def test_record_and_read(tmp_path):
+    simulation = Simulation(800, 600, 2, Settings(animal_count=5, food_count=10))
+    recorder = Recorder(str(tmp_path / "run"), chunk_ticks=8)
+    simulation.observers.append(recorder)
+    simulation.run(30)
+    recorder.close()
+
+    reader = TrajectoryReader(str(tmp_path / "run"))
+    assert (reader.first_tick, reader.last_tick) == (1, 30)
+    frame = reader.frame(30)
+    assert frame["animals.x"].tolist() == simulation.animals.population.x[:simulation.animals.population.count].tolist()
+    assert len(frame["foods.id"]) == len(simulation.foods)
+
+
+def test_write_errors_are_raised_instead_of_blocking(tmp_path):
+    simulation = Simulation(800, 600, 2, Settings(animal_count=5, food_count=10))
+    recorder = Recorder(str(tmp_path / "run"), chunk_ticks=1, max_pending_chunks=1)
+    shutil.rmtree(tmp_path / "run")
+    with pytest.raises(OSError):
+        for _ in range(20):
+            simulation.step()
+            recorder.record(simulation)
+        recorder.close()
+    with pytest.raises(OSError):
+        recorder.close()
+    assert not recorder.writer.is_alive()
+    with pytest.raises(OSError):
+        recorder.close()
+
+
+def test_record_field(tmp_path):
+    simulation = Simulation(800, 600, 4, Settings(animal_count=20, food_model="field"))
+    recorder = Recorder(str(tmp_path / "run"), chunk_ticks=64)
+    simulation.run(3000)
+    simulation.observers.append(recorder)
+    simulation.run(200)
+    recorder.close()
+
+    reader = TrajectoryReader(str(tmp_path / "run"))
+    assert reader.field["cell_size"] == simulation.foods.cell_size
+    first, last = reader.frame(reader.first_tick), reader.frame(reader.last_tick)
+    assert len(first["foods.id"]) == len(last["foods.id"]) == 0
+    assert (last["field"] == simulation.foods.quantity).all()
+    assert any((reader.frame(tick)["animals.target"] >= 0).any() for tick in range(reader.first_tick, reader.last_tick + 1))
+    assert last["animals.target"].tolist() == [-1 if animal.targeted_food is None else animal.targeted_food.slot for animal in simulation.animals.animals]
@@ -0,0 +1,50 @@
+import numpy as np
+
+from simulation import Simulation, Settings
+from simulation.snapshot import save_snapshot, load_snapshot
+
+
+def same_population(first : Simulation, second : Simulation) -> bool:
+    population, other = first.animals.population, second.animals.population
+    return population.count == other.count and all(np.array_equal(getattr(population, column)[:population.count], getattr(other, column)[:other.count])
+                                                   for column in population.COLUMNS)
+
+
+def test_resume_equals_uninterrupted_with_stale_targets(tmp_path):
+    simulation = Simulation(800, 600, 11, Settings(animal_count=80, food_count=15))
+    simulation.run(3002)
+    assert any(animal.targeted_food is not None and simulation.foods.get(animal.targeted_food) is None for animal in simulation.animals.animals)
+
+    save_snapshot(simulation, str(tmp_path / "world.snap"))
+    restored = load_snapshot(str(tmp_path / "world.snap"))
+    simulation.run(200)
+    restored.run(200)
+    assert same_population(simulation, restored)
+    assert len(simulation.foods) == len(restored.foods)
+
+
+def test_resume_equals_uninterrupted_field(tmp_path):
+    simulation = Simulation(800, 600, 5, Settings(animal_count=40, food_model="field"))
+    simulation.run(3100)
+    save_snapshot(simulation, str(tmp_path / "world.snap"))
+    restored = load_snapshot(str(tmp_path / "world.snap"))
+    simulation.run(300)
+    restored.run(300)
+    assert same_population(simulation, restored)
+    assert np.array_equal(simulation.foods.quantity, restored.foods.quantity)
+
+
+def test_resume_keeps_the_statistics(tmp_path):
+    simulation = Simulation(800, 600, 3, Settings(animal_count=60, food_count=40, drinking=True))
+    simulation.run(4000)
+    assert simulation.stats.eaten > 0 and simulation.stats.drunk > 0
+    save_snapshot(simulation, str(tmp_path / "world.snap"))
+    restored = load_snapshot(str(tmp_path / "world.snap"))
+    assert vars(restored.stats) == vars(simulation.stats)
+    assert restored.history.count == simulation.history.count and np.array_equal(restored.history.values, simulation.history.values)
+
+    simulation.run(3000)
+    restored.run(3000)
+    assert simulation.stats.deaths > 0
+    assert vars(restored.stats) == vars(simulation.stats)
+    assert np.array_equal(restored.history.values, simulation.history.values)
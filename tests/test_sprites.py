@@ -0,0 +1,30 @@
+import pygame as py
+
+from rendering.sprites import SpriteCache
+
+
+def test_the_least_recently_used_sprites_are_dropped_past_the_pixel_budget():
+    cache = SpriteCache(max_pixels=300)
+    red = cache.get("square", (10, 10), (255, 0, 0))
+    cache.get("rounded", (10, 10), (0, 0, 255))
+    cache.get("outline", (10, 10), (0, 255, 0))
+    assert cache.get("square", (10, 10), (255, 0, 0)) is red
+    cache.get("square", (10, 10), (255, 255, 255))
+    assert list(cache.sprites) == [("outline", (10, 10), (0, 255, 0)), ("square", (10, 10), (255, 0, 0)), ("square", (10, 10), (255, 255, 255))]
+    assert cache.pixels == 300
+
+    # a sprite bigger than the budget is still kept, alone
+    cache.get("square", (20, 20), (255, 0, 0))
+    assert list(cache.sprites) == [("square", (20, 20), (255, 0, 0))]
+    assert cache.pixels == 400
+    assert cache.get("square", (10, 10), (255, 0, 0)) is not red
+
+
+def test_a_sprite_draws_the_pixels_of_the_matching_rect():
+    cache = SpriteCache()
+    for shape, width in (("rounded", 0), ("outline", 1)):
+        expected = py.Surface((12, 12))
+        py.draw.rect(expected, (200, 30, 40), expected.get_rect(), width, border_radius=90 if shape == "rounded" else -1)
+        drawn = py.Surface((12, 12))
+        drawn.blit(cache.get(shape, (12, 12), (200, 30, 40)), (0, 0))
+        assert py.image.tobytes(drawn, "RGB") == py.image.tobytes(expected, "RGB")
@@ -0,0 +1,56 @@
+import csv
+import multiprocessing as mp
+import os
+import signal
+
+import pytest
+
+from simulation import sweep
+from simulation.sweep import Sweep, SweepJob
+
+run_job = sweep.run_job
+
+
+def dying_job(job):
+    # the worker process is killed in the middle of its run, the sweep only sees its pipe closing
+    if job.seed == 1:
+        os.kill(os.getpid(), signal.SIGKILL)
+    return run_job(job)
+
+
+def results(path):
+    with open(path, newline="") as file:
+        return sorted(csv.DictReader(file), key=lambda row: int(row["run"]))
+
+
+def test_a_failing_config_is_reported_and_the_other_runs_come_back(tmp_path):
+    path = tmp_path / "sweep.csv"
+    Sweep({"animal_count": [3, "three", 4]}, [0, 1], ticks=50, workers=2).run(str(path))
+    rows = results(path)
+    assert len(rows) == 6
+    assert [row["status"] for row in rows] == ["ok", "ok", "failed", "failed", "ok", "ok"]
+    assert all("TypeError" in row["error"] for row in rows if row["status"] == "failed")
+    assert all(row["world_digest"] and not row["error"] for row in rows if row["status"] == "ok")
+
+
+@pytest.mark.skipif(mp.get_start_method() != "fork", reason="the workers only run the patched job when they are forked")
+def test_a_killed_worker_is_reported_and_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "run_job", dying_job)
+    path = tmp_path / "sweep.csv"
+    Sweep({"animal_count": [3, 4]}, [0, 1, 2], ticks=50, workers=2).run(str(path))
+    rows = results(path)
+    assert len(rows) == 6
+    assert [row["status"] for row in rows] == ["ok", "crashed", "ok", "ok", "crashed", "ok"]
+    assert all(row["error"] == f"worker exited with code {-signal.SIGKILL}" for row in rows if row["status"] == "crashed")
+    assert all(row["world_digest"] for row in rows if row["status"] == "ok")
+
+
+def test_food_consumed_is_what_the_animals_ate_even_when_the_field_grows_back():
+    result = run_job(SweepJob(0, 1, {"food_model": "field", "animal_count": 10}, 4000, 400, 300, 1000))
+    assert result["food_consumed"] > 0
+
+
+def test_the_survival_curve_ends_with_the_extinction():
+    result = run_job(SweepJob(0, 1, {"animal_count": 3, "food_count": 0}, 100000, 800, 600, 1000))
+    assert result["ticks_to_extinction"] % 1000 != 0
+    assert result["survival_curve"].split()[-1] == "0"
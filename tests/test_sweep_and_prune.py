@@ -0,0 +1,42 @@
+import numpy as np
+
+from animals.sweep_and_prune import SweepAndPrune
+
+
+def brute_force(x, y, width, height):
+    return {(a, b) for a in range(len(x)) for b in range(a + 1, len(x))
+            if x[a] < x[b] + width[b] and x[b] < x[a] + width[a] and y[a] < y[b] + height[b] and y[b] < y[a] + height[a]}
+
+
+def found(broad_phase, x, y, width, height):
+    first, second = broad_phase.pairs(x, y, width, height)
+    pairs = [(min(a, b), max(a, b)) for a, b in zip(first.tolist(), second.tolist())]
+    assert len(pairs) == len(set(pairs))
+    return set(pairs)
+
+
+def test_pairs_match_brute_force_while_moving_and_removing():
+    rng = np.random.default_rng(0)
+    count = 300
+    x = rng.integers(-200, 400, count)
+    y = rng.integers(-200, 400, count)
+    size = rng.integers(5, 40, count)
+    broad_phase = SweepAndPrune()
+    for tick in range(30):
+        assert found(broad_phase, x, y, size, size) == brute_force(x, y, size, size)
+        x = x + rng.integers(-3, 4, len(x))
+        y = y + rng.integers(-3, 4, len(y))
+        if tick % 3 == 0:
+            for _ in range(10):
+                index = int(rng.integers(0, len(x)))
+                x[index], y[index], size[index] = x[-1], y[-1], size[-1]
+                x, y, size = x[:-1], y[:-1], size[:-1]
+        if tick % 5 == 0:
+            x = np.concatenate((x, rng.integers(-200, 400, 5)))
+            y = np.concatenate((y, rng.integers(-200, 400, 5)))
+            size = np.concatenate((size, rng.integers(5, 40, 5)))
+
+
+def test_boxes_touching_by_a_side_do_not_overlap():
+    x, y, size = np.array([0, 10, -10, 0]), np.array([0, 0, 0, -10]), np.array([10, 10, 10, 10])
+    assert found(SweepAndPrune(), x, y, size, size) == set()
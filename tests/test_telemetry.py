@@ -0,0 +1,62 @@
+import json
+import socket
+import time
+
+import pytest
+
+from simulation import Simulation, Settings
+from simulation.telemetry import TelemetryServer
+
+
+def wait_for(condition, timeout : float = 5.0) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.001)
+
+
+def test_start_raises_when_the_port_is_used():
+    with socket.socket() as used:
+        used.bind(("127.0.0.1", 0))
+        used.listen()
+        server = TelemetryServer(port=used.getsockname()[1])
+        with pytest.raises(OSError):
+            server.start()
+        server.close()
+
+
+def test_entities_and_dropped_frames():
+    simulation = Simulation(800, 600, 3, Settings(animal_count=5000, food_count=0))
+    server = TelemetryServer(port=0, every=10 ** 9, max_frames=2)
+    server.start()
+    simulation.observers.append(server)
+    client = socket.socket()
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    try:
+        client.connect(("127.0.0.1", server.port))
+        wait_for(lambda: len(server.subscribers) == 1)
+
+        # the client does not read while 100 large frames are produced, the server has to drop some of them
+        for _ in range(100):
+            client.sendall(b'{"command": "entities"}\n')
+            wait_for(lambda: not server.requests.empty())
+            simulation.step()
+
+        frames = []
+        with client.makefile("rb") as reader:
+            client.settimeout(1.0)
+            try:
+                for line in reader:
+                    frames.append(json.loads(line))
+            except TimeoutError:
+                pass
+    finally:
+        client.close()
+        server.close()
+
+    entities = [frame for frame in frames if frame["type"] == "entities"]
+    dropped = [frame["count"] for frame in frames if frame["type"] == "dropped"]
+    assert entities and dropped
+    assert entities[-1]["tick"] == simulation.tick
+    assert len(entities[-1]["x"]) == simulation.animals.population.count
+    assert dropped == sorted(dropped) and len(entities) + dropped[-1] == 100
@@ -0,0 +1,79 @@
+import hashlib
+
+import numpy as np
+
+from simulation import Simulation, Settings
+from timing_wheel import TimingWheel
+
+
+def fired_ticks(wheel : TimingWheel, until : int) -> dict[object, int]:
+    fired = {}
+    while wheel.tick <= until:
+        tick = wheel.tick
+        for payload in wheel.advance():
+            assert payload not in fired
+            fired[payload] = tick
+    return fired
+
+
+def test_timers_cascade_down_the_levels_on_their_tick():
+    wheel = TimingWheel(slots=4, levels=3)
+    rng = np.random.default_rng(1)
+    due = {index: int(tick) for index, tick in enumerate(rng.integers(0, 64, 300))}
+    for index, tick in due.items():
+        wheel.schedule(tick, index)
+    assert fired_ticks(wheel, 63) == due
+
+
+def test_overflow_timers_are_inserted_again_when_the_top_level_wraps():
+    wheel = TimingWheel(tick=5, slots=4, levels=2)
+    due = {"level 0": 6, "level 1": 14, "overflow": 40, "far overflow": 300, "past": 1}
+    for payload, tick in due.items():
+        wheel.schedule(tick, payload)
+    assert [timer.payload for timer in wheel.overflow] == ["overflow", "far overflow"]
+    assert fired_ticks(wheel, 300) == {**due, "past": 5}
+
+
+def test_timers_scheduled_while_advancing_fire_on_their_tick():
+    wheel = TimingWheel(slots=4, levels=2)
+    fired = {}
+    for tick in range(200):
+        for payload in wheel.advance():
+            fired[payload] = tick
+        if tick % 7 == 0:
+            wheel.schedule(tick + tick % 45, tick)
+    expected = {tick: max(tick + tick % 45, tick + 1) for tick in range(0, 200, 7)}
+    assert fired == {payload: tick for payload, tick in expected.items() if tick < 200}
+
+
+def test_cancelled_timers_never_fire_whatever_their_level():
+    wheel = TimingWheel(slots=4, levels=2)
+    timers = {tick: wheel.schedule(tick, tick) for tick in (0, 3, 9, 15, 33, 100)}
+    for tick in (3, 15, 100):
+        wheel.cancel(timers[tick])
+    wheel.advance()
+    wheel.cancel(timers[33])
+    assert fired_ticks(wheel, 120) == {9: 9}
+
+
+def world_fingerprint(simulation : Simulation) -> tuple[int, int, str]:
+    simulation.animals.sync_timers()
+    population = simulation.animals.population
+    animals = sorted(simulation.animals.animals, key=lambda animal: animal.index)
+    columns = [getattr(population, column)[:population.count].astype(np.int64) for column in ("x", "y", "size", "direction", "direction_count", "life")]
+    columns.append(np.array([(animal.food_handler.food_storage, animal.water_handler.water_storage) for animal in animals], dtype=np.int64).ravel())
+    return population.count, simulation.foods.total_quantity(), hashlib.sha256(b"".join(column.tobytes() for column in columns)).hexdigest()[:16]
+
+
+def test_seeded_worlds_match_the_worlds_counting_every_tick():
+    # fingerprints of the tree before the timing wheel, where every animal counted its direction, hunger and thirst ticks down every tick,
+    # with the seeded random streams applied to it, pinned again once the animals stopped drawing a death age they never reached
+    expected = {
+        (3, 3000, (("animal_count", 60), ("food_count", 40))): (60, 1200, "bee63968b7cfd34a"),
+        (5, 6000, (("animal_count", 40), ("food_count", 30), ("drinking", True))): (40, 0, "09b960221c39da95"),
+        (7, 2500, (("animal_count", 40), ("food_model", "field"))): (40, 224999, "8f50df0767e50db2"),
+    }
+    for (seed, ticks, settings), fingerprint in expected.items():
+        simulation = Simulation(800, 600, seed, Settings(**dict(settings)))
+        simulation.run(ticks)
+        assert world_fingerprint(simulation) == fingerprint
@@ -0,0 +1,46 @@
+import numpy as np
+
+from water import Water, WaterField
+
+
+def rebuilt(field : WaterField, width : int, height : int) -> WaterField:
+    fresh = WaterField(width, height)
+    for water in field.sources:
+        fresh.sources.append(water)
+    fresh.recompute(np.ones((fresh.columns, fresh.rows), dtype=bool))
+    return fresh
+
+
+def same_field(field : WaterField, other : WaterField) -> bool:
+    x, y = np.meshgrid(np.arange(0, 800, 8), np.arange(0, 600, 8), indexing="ij")
+    steps, other_steps = field.steps(x.ravel(), y.ravel()), other.steps(x.ravel(), y.ravel())
+    return np.array_equal(field.nearest, other.nearest) and all(np.array_equal(a, b) for a, b in zip(steps, other_steps))
+
+
+def test_a_lone_shrinking_water_only_recomputes_the_band_it_left():
+    field = WaterField(800, 600)
+    water = Water(100, 100, 100, 100)
+    field.add_source(water)
+    for _ in range(30):
+        field.recomputed_cells = 0
+        water.decrease_quantity(3)
+        assert field.recomputed_cells <= field.columns + field.rows
+        assert same_field(field, rebuilt(field, 800, 600))
+
+    field.recomputed_cells = 0
+    water.decrease_quantity(water.quantity)
+    assert field.recomputed_cells == field.columns * field.rows
+    assert np.all(np.isinf(field.steps(np.array([0, 400]), np.array([0, 300]))[2]))
+
+
+def test_shrinking_waters_match_a_rebuilt_field():
+    field = WaterField(800, 600)
+    waters = [Water(100, 100, 100, 100), Water(500, 300, 150, 100), Water(600, 50, 40, 100)]
+    for water in waters:
+        field.add_source(water)
+    rng = np.random.default_rng(4)
+    for _ in range(60):
+        water = waters[rng.integers(len(waters))]
+        if not water.is_empty():
+            water.decrease_quantity(int(rng.integers(1, 10)))
+        assert same_field(field, rebuilt(field, 800, 600))
@@ -0,0 +1,16 @@
+from simulation import Simulation, Settings
+
+
+def test_the_kept_totals_match_the_sums_over_the_animals():
+    simulation = Simulation(300, 300, 11, Settings(animal_count=60, food_count=80, drinking=True, interactions=True))
+    stats = simulation.stats
+    while not simulation.is_extinct():
+        simulation.run(250)
+        animals = simulation.animals.animals
+        assert stats.animals == len(animals)
+        assert stats.life == sum(animal.life for animal in animals)
+        assert stats.food_storage == sum(animal.food_handler.food_storage for animal in animals)
+        assert stats.water_storage == sum(animal.water_handler.water_storage for animal in animals)
+    # the world went through every event the totals follow
+    assert stats.eaten > 0 and stats.drunk > 0 and stats.hunted > 0 and stats.life_lost > 0
+    assert stats.deaths == stats.spawned == 60